@@ -0,0 +1,93 @@
+import argparse
+import fnmatch
+import json
+import os
+import sys
+
+from benchmarks import suite
+
+
+# Benchmark runner
+# python -m benchmarks.runner                 run and compare with the stored baseline
+# python -m benchmarks.runner --save          run and store results as the new baseline
+# python -m benchmarks.runner -k 'strategy.*' --depths 10,100000
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def run_benchmark(func, repeat: int) -> float:
+    # Best of repeat runs, ns per operation
+    best = None
+    for _ in range(repeat):
+        elapsed_ns, operations = func()
+        per_op = elapsed_ns / max(operations, 1)
+        if best is None or per_op < best:
+            best = per_op
+    return best
+
+
+def load_baseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: dict):
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, 'w') as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write('\n')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulator host-time benchmarks")
+    parser.add_argument('-k', '--filter', default='*', help="glob over benchmark names")
+    parser.add_argument('--depths', default=','.join(str(d) for d in suite.QUEUE_DEPTHS),
+                        help="strategy queue depths, comma separated (up to 100000)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help="store results as baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown against baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    depths = [int(d) for d in args.depths.split(',')]
+    benchmarks = {name: func for name, func in suite.collect(depths).items()
+                  if fnmatch.fnmatch(name, args.filter)}
+    baseline = load_baseline(args.baseline)
+
+    results = {}
+    regressions = []
+
+    print(f"{'Benchmark':<28} {'ns/op':>14} {'ops/s':>14} {'baseline':>14} {'change':>8}")
+    print("-" * 82)
+
+    for name, func in benchmarks.items():
+        per_op = run_benchmark(func, args.repeat)
+        results[name] = round(per_op, 1)
+
+        line = f"{name:<28} {per_op:>14.1f} {1e9 / per_op:>14.0f}"
+        if name in baseline:
+            change = per_op / baseline[name] - 1
+            line += f" {baseline[name]:>14.1f} {change:>+8.1%}"
+            if change > args.tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
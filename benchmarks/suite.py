@@ -0,0 +1,140 @@
+import random
+from time import perf_counter_ns
+
+from config import SystemConfig
+from models.buffer import Buffer
+from models.disk import HardDisk
+from cache.lfu_cache import LFUCache
+from simulation.simulator import Simulator
+from strategies.fifo import FIFOStrategy
+from strategies.look import LOOKStrategy
+from strategies.clook import CLOOKStrategy
+from strategies.nlook import NLOOKStrategy
+from workload.generators import UniformPattern, generate_processes
+
+
+# Benchmarks of the simulator itself (host time, not simulated time)
+# Every benchmark returns (elapsed_ns, operations), the runner reports ns per operation
+
+STRATEGIES = {
+    'FIFO': FIFOStrategy,
+    'LOOK': LOOKStrategy,
+    'CLOOK': CLOOKStrategy,
+    'NLOOK': NLOOKStrategy,
+}
+
+CACHE_SIZES = (10, 1000)
+QUEUE_DEPTHS = (10, 100, 1000, 10000)
+CACHE_OPERATIONS = 100000
+SEED = 12345
+
+
+def random_sectors(config, count: int, seed: int = SEED) -> list:
+    # Uniformly distributed sectors over the whole disk
+    return UniformPattern(config).sample(random.Random(seed), count)
+
+
+def random_processes(config, processes_num: int, operations_num: int, seed: int = SEED) -> list:
+    # Processes with mixed read/write operations
+    return generate_processes(config, UniformPattern(config), processes_num, operations_num,
+                              read_ratio=0.5, seed=seed)
+
+
+def _cache_config(buffers_num: int) -> SystemConfig:
+    return SystemConfig(BUFFERS_NUM=buffers_num,
+                        LFU_LEFT_SEGMENT_MAX=max(3, buffers_num * 3 // 10),
+                        LFU_MIDDLE_SEGMENT_MAX=max(2, buffers_num * 2 // 10))
+
+
+def bench_cache_hit(buffers_num: int) -> tuple:
+    # access_buffer when the working set fits into the cache
+    config = _cache_config(buffers_num)
+    cache = LFUCache(config)
+    working_set = list(range(buffers_num))
+    for sector in working_set:
+        cache.access_buffer(sector, sector // config.SECTORS_PER_TRACK)
+
+    rng = random.Random(SEED)
+    sectors = [rng.choice(working_set) for _ in range(CACHE_OPERATIONS)]
+    sectors_per_track = config.SECTORS_PER_TRACK
+
+    start = perf_counter_ns()
+    for sector in sectors:
+        cache.access_buffer(sector, sector // sectors_per_track)
+    return perf_counter_ns() - start, len(sectors)
+
+
+def bench_cache_evict(buffers_num: int) -> tuple:
+    # access_buffer when every access misses and evicts from the right segment
+    config = _cache_config(buffers_num)
+    cache = LFUCache(config)
+    sectors_per_track = config.SECTORS_PER_TRACK
+    sectors = range(CACHE_OPERATIONS + buffers_num)
+
+    for sector in sectors[:buffers_num]:
+        cache.access_buffer(sector, sector // sectors_per_track)
+
+    start = perf_counter_ns()
+    for sector in sectors[buffers_num:]:
+        cache.access_buffer(sector, sector // sectors_per_track)
+    return perf_counter_ns() - start, CACHE_OPERATIONS
+
+
+def bench_strategy(strategy_name: str, depth: int) -> tuple:
+    # Fills the strategy queue to depth with add_request, then drains it with get_next_buffer
+    config = SystemConfig()
+    disk = HardDisk(config)
+    strategy = STRATEGIES[strategy_name](disk, config)
+
+    buffers = []
+    for i, sector in enumerate(random_sectors(config, depth)):
+        buffer = Buffer(i)
+        buffer.load_sector(sector, disk.get_track_for_sector(sector))
+        buffers.append(buffer)
+
+    start = perf_counter_ns()
+    for buffer in buffers:
+        strategy.add_request(buffer, 'READ')
+    while True:
+        buffer = strategy.get_next_buffer()
+        if buffer is None:
+            break
+        disk.current_track = buffer.track_num
+        strategy.complete_io()
+    return perf_counter_ns() - start, depth * 2
+
+
+def bench_simulator(strategy_name: str, processes_num: int = 8, operations_num: int = 200) -> tuple:
+    # End-to-end Simulator.run, operations are simulator events (main cycle iterations)
+    config = SystemConfig(BUFFERS_NUM=100, LFU_LEFT_SEGMENT_MAX=30, LFU_MIDDLE_SEGMENT_MAX=20,
+                          TRACE=False)
+
+    simulator = Simulator(config, STRATEGIES[strategy_name])
+    simulator.max_iterations = float('inf')
+    for process in random_processes(config, processes_num, operations_num):
+        simulator.add_process(process)
+
+    start = perf_counter_ns()
+    simulator.run()
+    elapsed = perf_counter_ns() - start
+
+    return elapsed, simulator.iteration
+
+
+def collect(depths=QUEUE_DEPTHS) -> dict:
+    # Benchmark name -> zero-argument callable
+    benchmarks = {}
+
+    for buffers_num in CACHE_SIZES:
+        benchmarks[f'cache.hit[{buffers_num}]'] = lambda n=buffers_num: bench_cache_hit(n)
+        benchmarks[f'cache.evict[{buffers_num}]'] = lambda n=buffers_num: bench_cache_evict(n)
+
+    for strategy_name in STRATEGIES:
+        for depth in depths:
+            benchmarks[f'strategy.{strategy_name}[{depth}]'] = \
+                lambda s=strategy_name, d=depth: bench_strategy(s, d)
+
+    for strategy_name in STRATEGIES:
+        benchmarks[f'simulator.{strategy_name}'] = lambda s=strategy_name: bench_simulator(s)
+
+    return benchmarks
@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Tuple
 from models.buffer import Buffer
 
 
+# States of lookup_or_reserve
+HIT = 'HIT'              # Buffer is in the cache
+MISS = 'MISS'            # Buffer is not in the cache, a victim is taken
+IN_FLIGHT = 'IN_FLIGHT'  # Buffer of the sector is being read or written back
+
+
 # Base class for buffer cache management algorithms
 class BaseCache(ABC):
     # Abstract base class for buffer cache
@@ -12,8 +18,23 @@ class BaseCache(ABC):
         pass
 
     @abstractmethod
-    def get_free_buffer(self) -> Buffer:
-        # Gets a free buffer (possibly with overflow)
+    def lookup_buffer(self, sector_num: int) -> Optional[Buffer]:
+        # Accessing the buffer if it is in the cache, None on a miss
+        pass
+
+    @abstractmethod
+    def lookup_or_reserve(self, sector_num: int) -> Tuple[str, Optional[Buffer]]:
+        # Accessing the buffer or reserving a victim on a miss, returns (state, buffer)
+        pass
+
+    @abstractmethod
+    def release_buffer(self, buffer: Buffer):
+        # Returns written back buffer to the free buffers
+        pass
+
+    @abstractmethod
+    def get_free_buffer(self) -> Optional[Buffer]:
+        # Gets a free buffer (possibly with overflow), None if all buffers are in I/O
         pass
 
     @abstractmethod
@@ -25,3 +46,8 @@ class BaseCache(ABC):
     def get_state_string(self) -> str:
         # Returns a string with the cache status
         pass
+
+    @abstractmethod
+    def get_state(self):
+        # Returns the cache status rendered on output (console.StateView)
+        pass
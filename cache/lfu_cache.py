@@ -1,6 +1,8 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from collections import deque
 from models.buffer import Buffer
+from cache.base_cache import HIT, MISS, IN_FLIGHT
+from console import ChangeJournal, StateView
 
 
 # LFU (Least Frequently Used) with 3 segments
@@ -28,15 +30,66 @@ class LFUCache:
         ]
 
         # Fast search: sector_num -> Buffer
+        # Also holds buffers in flight (Buffer.segment is None): reserved for reading
+        # and evicted modified buffers being written back
         self.sector_to_buffer = {}
 
+        # Changes for the console output
+        self.journal = ChangeJournal(config)
+        self.state_title = "CACHE: Buffer cache LFU"
+
     def find_buffer(self, sector_num: int) -> Optional[Buffer]:
         # Searches for buffer with the specified sector
-        return self.sector_to_buffer.get(sector_num)
+        buffer = self.sector_to_buffer.get(sector_num)
+        return buffer if buffer and buffer.segment else None
+
+    def lookup_buffer(self, sector_num: int) -> Optional[Buffer]:
+        # Buffer access on a hit with one search: moves the buffer according to the algorithm
+        # Returns None on a miss, the cache is not changed
+        buffer = self.sector_to_buffer.get(sector_num)
+        if buffer and buffer.segment:
+            self._move_on_access(buffer)
+            return buffer
+        return None
+
+    def lookup_or_reserve(self, sector_num: int) -> Tuple[str, Optional[Buffer]]:
+        # Buffer access with one search, returns (state, buffer)
+        #   HIT       - the buffer is moved according to the algorithm
+        #   IN_FLIGHT - the buffer of the sector is being read (not modified)
+        #               or written back (modified), nothing is changed
+        #   MISS      - a victim is taken (free or displaced from the right segment):
+        #               not modified - reserved for the sector, the caller loads the sector into it,
+        #               modified - stays in flight for its old sector until written back,
+        #               None - all buffers are in I/O, nothing is changed
+        buffer = self.sector_to_buffer.get(sector_num)
 
-    def get_free_buffer(self) -> Buffer:
+        if buffer:
+            if buffer.segment is None:
+                return IN_FLIGHT, buffer
+            self._move_on_access(buffer)
+            return HIT, buffer
+
+        victim = self.get_free_buffer()
+        if victim is None:
+            return MISS, None
+        if victim.modified and victim.sector_num is not None:
+            self.sector_to_buffer[victim.sector_num] = victim
+        else:
+            self.sector_to_buffer[sector_num] = victim
+        return MISS, victim
+
+    def release_buffer(self, buffer: Buffer):
+        # Returns written back buffer to the free buffers
+        if self.sector_to_buffer.get(buffer.sector_num) is buffer:
+            del self.sector_to_buffer[buffer.sector_num]
+        buffer.reset()
+        buffer.segment = None
+        self.free_buffers.append(buffer)
+
+    def get_free_buffer(self) -> Optional[Buffer]:
         # Gets free buffer
-        # If there are no free ones - displaces from the right segment
+        # If there are no free ones - displaces from the right segment,
+        # None if all of them are in I/O
         if self.free_buffers:
             return self.free_buffers.pop()
 
@@ -44,20 +97,27 @@ class LFUCache:
         # Select the buffer with the smallest counter
         return self._evict_from_right()
 
-    def _evict_from_right(self) -> Buffer:
+    def can_get_free_buffer(self) -> bool:
+        # Checks if get_free_buffer will succeed
+        return bool(self.free_buffers) or any(b.io_operation is None for b in self.right_segment)
+
+    def _evict_from_right(self) -> Optional[Buffer]:
         # Displaces the buffer from the right segment
-        if not self.right_segment:
-            raise Exception("No buffers available for eviction")
+        # None if every buffer there is in I/O operation
 
-        # Find the buffer with the minimum counter that can be evicted
-        # Filter out buffers that are in I/O operation
-        evictable_buffers = [b for b in self.right_segment if b.io_operation is None]
+        # Find the buffer with the minimum counter that can be evicted (the first one on a tie)
+        min_buffer = None
+        for buffer in self.right_segment:
+            if buffer.io_operation is None and (
+                    min_buffer is None or buffer.access_counter < min_buffer.access_counter):
+                min_buffer = buffer
 
-        if not evictable_buffers:
-            raise Exception("No buffers available for eviction")
+        if min_buffer is None:
+            return None
 
-        min_buffer = min(evictable_buffers, key=lambda b: b.access_counter)
         self.right_segment.remove(min_buffer)
+        min_buffer.segment = None
+        self.journal.record(min_buffer, 'removed')
 
         # Remove from the map
         if min_buffer.sector_num in self.sector_to_buffer:
@@ -81,26 +141,23 @@ class LFUCache:
 
     def _move_on_access(self, buffer: Buffer):
         # Moves the buffer on access according to the LFU algorithm
-        # Determine in which segment the buffer is
-        if buffer in self.left_segment:
-            # Buffer in left segment: increment counter and move to beginning
+        # From any segment: increment counter and move to the beginning of the left one
+        if buffer.segment == 'Left':
             self.left_segment.remove(buffer)
-            buffer.increment_access()
-            self._add_to_left(buffer)
-        elif buffer in self.middle_segment:
-            # Buffer in middle segment: increment counter and move to left
+        elif buffer.segment == 'Middle':
             self.middle_segment.remove(buffer)
-            buffer.increment_access()
-            self._add_to_left(buffer)
-        elif buffer in self.right_segment:
-            # Buffer in right segment: increment counter and move to left
+        elif buffer.segment == 'Right':
             self.right_segment.remove(buffer)
-            buffer.increment_access()
-            self._add_to_left(buffer)
+        else:
+            return
+        buffer.increment_access()
+        self._add_to_left(buffer)
 
     def _add_new_buffer(self, sector_num: int, track_num: int) -> Buffer:
         # Adds a new buffer to the left segment
         buffer = self.get_free_buffer()
+        if buffer is None:
+            raise Exception("No buffers available for eviction")
         buffer.load_sector(sector_num, track_num)
         self._add_to_left(buffer)
         self.sector_to_buffer[sector_num] = buffer
@@ -109,6 +166,8 @@ class LFUCache:
     def _add_to_left(self, buffer: Buffer):
         # Adds a buffer to the beginning of the left segment
         self.left_segment.appendleft(buffer)
+        buffer.segment = 'Left'
+        self.journal.record(buffer, 'Left')
 
         # If the left one is full, move it to the middle one
         if len(self.left_segment) > self.left_max:
@@ -118,6 +177,8 @@ class LFUCache:
     def _add_to_middle(self, buffer: Buffer):
         # Adds a buffer to the beginning of the middle segment
         self.middle_segment.appendleft(buffer)
+        buffer.segment = 'Middle'
+        self.journal.record(buffer, 'Middle')
 
         # If the middle one is full, move it to the right one
         if len(self.middle_segment) > self.middle_max:
@@ -127,13 +188,19 @@ class LFUCache:
     def _add_to_right(self, buffer: Buffer):
         # Adds a buffer to the beginning of the right segment
         self.right_segment.appendleft(buffer)
+        buffer.segment = 'Right'
+        self.journal.record(buffer, 'Right')
 
     def add_buffer_to_cache(self, buffer: Buffer):
-        # Adds a buffer to the cache after I/O completes
-        if buffer.sector_num not in self.sector_to_buffer:
+        # Adds a buffer to the cache after I/O completes (or a reserved one claimed for writing)
+        if buffer.segment is None:
             self.sector_to_buffer[buffer.sector_num] = buffer
             self._add_to_left(buffer)
 
+    def get_state(self) -> StateView:
+        # Cache status for output: live view rendered when printed (console.StateView)
+        return StateView(self)
+
     def get_state_string(self) -> str:
         # Returns a string with the cache status for output
         left_str = ', '.join([str(b) for b in self.left_segment])
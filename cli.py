@@ -0,0 +1,412 @@
+import argparse
+import importlib
+import itertools
+import sys
+
+
+# Non-interactive command line interface
+#
+#   python cli.py run --strategy look --workload workload.json
+#   python cli.py compare --generate zipf --processes 8 --operations 1000 --format csv
+#   python cli.py sweep --grid BUFFERS_NUM=10,50,100 --grid LOOK_TRACK_READ_MAX=1,2 --workload workload.json
+#   python cli.py run --strategy look --workload workload.json --record look.trace
+#   python cli.py replay look.trace [other.trace]
+#   python cli.py compare --import sda.blktrace.txt --import-format blkparse
+#   python cli.py load --rates 5,10,20,40 --arrivals poisson --generate zipf --requests 2000
+#   HDSIM_BUFFERS_NUM=50 python cli.py run --config disk.json --set LOOK_TRACK_READ_MAX=2
+#   python cli.py sweep --grid BUFFERS_NUM=10,50,100 --generate zipf --result-cache .hdsim-results
+#   python cli.py compare --generate zipf --operations 1000 --profile sim.folded
+#
+# Simulator modules are imported only when a subcommand runs, tracing is off unless --trace
+# Config: defaults, then --config FILE, then HDSIM_<PARAMETER> variables, then --set
+
+STRATEGIES = {
+    'fifo': ('strategies.fifo', 'FIFOStrategy'),
+    'look': ('strategies.look', 'LOOKStrategy'),
+    'clook': ('strategies.clook', 'CLOOKStrategy'),
+    'nlook': ('strategies.nlook', 'NLOOKStrategy'),
+    'deadline': ('strategies.deadline', 'DeadlineStrategy'),
+}
+
+CACHES = {
+    'lfu': ('cache.lfu_cache', 'LFUCache'),
+}
+
+
+def _load_class(registry: dict, name: str):
+    module_name, class_name = registry[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _parse_value(text: str):
+    # Converts override value to int, float or bool if possible
+    lowered = text.lower()
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _parse_assignment(text: str) -> tuple:
+    if '=' not in text:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got `{text}`")
+    key, value = text.split('=', 1)
+    return key.strip(), value.strip()
+
+
+def _make_config(args, overrides: dict):
+    from config import SystemConfig
+
+    try:
+        return SystemConfig.load(args.config, overrides=dict(overrides, TRACE=args.trace))
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"error: {e}")
+
+
+def _make_layout(args, config):
+    if args.disks <= 1:
+        return None
+
+    from models.disk_array import ConcatLayout, StripeLayout, MirrorLayout
+
+    if args.layout == 'stripe':
+        return StripeLayout(config, args.disks, args.stripe_sectors)
+    if args.layout == 'mirror':
+        return MirrorLayout(config, args.disks)
+    return ConcatLayout(config, args.disks)
+
+
+def _make_processes(args, config) -> list:
+    from workload.files import load_workload, generate_workload
+
+    if args.workload:
+        return load_workload(args.workload, config)
+
+    if args.arrivals:
+        # Requests come from the open-loop source only
+        return []
+
+    if args.import_path:
+        from workload.importers import import_trace
+        return import_trace(args.import_path, config, args.import_format,
+                            max_requests=args.max_requests or None,
+                            max_sectors=args.max_sectors or None)
+
+    if args.generate:
+        return generate_workload({
+            'pattern': args.generate,
+            'processes': args.processes,
+            'operations': args.operations,
+            'read_ratio': args.read_ratio,
+            'seed': args.seed,
+        }, config)
+
+    raise SystemExit("error: a workload is required "
+                     "(--workload FILE, --generate PATTERN or --import TRACE)")
+
+
+def _make_sources(args, config) -> list:
+    # Open-loop request source for --arrivals
+    if not args.arrivals:
+        return []
+
+    from workload.arrivals import RequestSource, TraceSource, make_arrivals
+
+    if args.arrivals == 'trace':
+        if not args.import_path:
+            raise SystemExit("error: --arrivals trace requires --import TRACE")
+        from workload.importers import import_trace
+        return [TraceSource('trace', import_trace(args.import_path, config, args.import_format,
+                                                  max_requests=args.max_requests or None,
+                                                  max_sectors=args.max_sectors or None))]
+
+    from workload.generators import make_pattern
+    return [RequestSource('req', make_arrivals(args.arrivals, args.rate, args.burst_factor),
+                          make_pattern(config, args.generate or 'uniform'),
+                          read_ratio=args.read_ratio, count=args.requests, seed=args.seed)]
+
+
+# Options that change the result of a run, part of the result cache key with the config
+RUN_OPTIONS = ('generate', 'import_format', 'max_requests', 'max_sectors', 'processes', 'operations',
+               'read_ratio', 'seed', 'arrivals', 'rate', 'requests', 'burst_factor', 'disks', 'layout',
+               'stripe_sectors', 'warmup', 'max_iterations')
+
+
+def _simulate(args, strategy_name: str, overrides: dict) -> dict:
+    # Runs one simulation (or takes it from the result cache) and returns a result row
+    config = _make_config(args, overrides)
+
+    results = getattr(args, 'results', None)
+    if results is None or args.trace or getattr(args, 'record', None) or args.profiler:
+        stats = _run_simulation(args, strategy_name, config)
+    else:
+        from simulation.results import result_key
+
+        files = tuple(path for path in (args.workload, args.import_path) if path)
+        key = result_key(config, strategy_name, args.cache,
+                         {name: getattr(args, name) for name in RUN_OPTIONS}, files)
+        stats = results.get(key)
+        if stats is None:
+            stats = _run_simulation(args, strategy_name, config)
+            results.put(key, stats)
+
+    row = {'strategy': strategy_name, 'cache': args.cache}
+    if args.arrivals and args.arrivals != 'trace':
+        row.update({'arrivals': args.arrivals, 'rate': args.rate})
+    if args.disks > 1:
+        row.update({'disks': args.disks, 'layout': args.layout})
+    row.update(overrides)
+    row.update(stats)
+    return row
+
+
+def _run_simulation(args, strategy_name: str, config) -> dict:
+    # Runs one simulation and returns its statistics
+    from simulation.simulator import Simulator
+
+    simulator = Simulator(config, _load_class(STRATEGIES, strategy_name),
+                          _load_class(CACHES, args.cache), _make_layout(args, config))
+    simulator.max_iterations = args.max_iterations or float('inf')
+
+    for process in _make_processes(args, config):
+        simulator.add_process(process)
+    for source in _make_sources(args, config):
+        simulator.add_source(source)
+
+    if args.profiler:
+        args.profiler.attach(simulator, label=strategy_name)
+
+    if args.warmup:
+        simulator.fast_forward(args.warmup, through_strategy=True)
+
+    record = getattr(args, 'record', None)
+    if record:
+        from simulation.recorder import TraceRecorder
+        try:
+            recorder = TraceRecorder(record, append=args.record_append)
+        except FileExistsError as e:
+            raise SystemExit(f"error: {e}")
+        with recorder:
+            simulator.attach_recorder(recorder)
+            simulator.run()
+    else:
+        simulator.run()
+
+    return simulator.get_stats()
+
+
+def _write_rows(args, rows: list):
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        # Columns of all rows in order of appearance, rows of a sweep can differ
+        # (the drive cache statistics are reported only with DISK_CACHE_SIZE)
+        columns = list(dict.fromkeys(c for row in rows for c in row))
+
+        if args.format == 'json':
+            import json
+            json.dump(rows, out, indent=2)
+            out.write('\n')
+        elif args.format == 'csv':
+            import csv
+            writer = csv.DictWriter(out, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            widths = {c: max(len(c), *(len(_format_cell(r.get(c, ''))) for r in rows)) for c in columns}
+            out.write('  '.join(c.ljust(widths[c]) for c in columns).rstrip() + '\n')
+            out.write('  '.join('-' * widths[c] for c in columns) + '\n')
+            for row in rows:
+                out.write('  '.join(_format_cell(row.get(c, '')).ljust(widths[c])
+                                    for c in columns).rstrip() + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def _write_profile(profiler, path: str):
+    # Collapsed stacks to the file, the most expensive methods to stderr
+    profiler.write_collapsed(path)
+
+    print(f"Profile written to {path}", file=sys.stderr)
+    print(f"{'method':<48} {'calls':>10} {'total ms':>10} {'self ms':>10}", file=sys.stderr)
+    for row in profiler.summary()[:15]:
+        print(f"{row['method']:<48} {row['calls']:>10} {row['total_ns'] / 1e6:>10.1f} "
+              f"{row['self_ns'] / 1e6:>10.1f}", file=sys.stderr)
+
+
+def _format_cell(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def _strategy_list(text: str) -> list:
+    names = [name.strip().lower() for name in text.split(',') if name.strip()]
+    for name in names:
+        if name not in STRATEGIES:
+            raise argparse.ArgumentTypeError(f"unknown strategy `{name}`")
+    return names
+
+
+def cmd_run(args) -> list:
+    return [_simulate(args, args.strategy, dict(args.overrides))]
+
+
+def cmd_compare(args) -> list:
+    return [_simulate(args, name, dict(args.overrides)) for name in args.strategies]
+
+
+def cmd_sweep(args) -> list:
+    keys = [key for key, _ in args.grid]
+    values = [[_parse_value(v) for v in raw.split(',')] for _, raw in args.grid]
+
+    rows = []
+    for combination in itertools.product(*values):
+        overrides = dict(args.overrides)
+        overrides.update(zip(keys, combination))
+        for name in args.strategies:
+            rows.append(_simulate(args, name, overrides))
+    return rows
+
+
+def cmd_load(args) -> list:
+    # Response time against offered load (requests per second)
+    args.arrivals = args.arrivals or 'poisson'
+    rows = []
+    for rate in args.rates:
+        args.rate = rate
+        for name in args.strategies:
+            rows.append(_simulate(args, name, dict(args.overrides)))
+    return rows
+
+
+def cmd_replay(args) -> list:
+    # Metrics rebuilt from recorded traces, with two traces also the first differing event
+    from simulation.recorder import replay_metrics, first_difference, read_trace, format_event
+
+    rows = [dict({'trace': path}, **replay_metrics(path)) for path in args.traces]
+
+    if len(args.traces) == 2:
+        index = first_difference(*args.traces)
+        if index is None:
+            print("Traces are identical", file=sys.stderr)
+        else:
+            print(f"Traces differ from event {index}", file=sys.stderr)
+            for path in args.traces:
+                events, names = read_trace(path)
+                event = format_event(events[index], names) if index < len(events) else "end of trace"
+                print(f"    {path}: {event}", file=sys.stderr)
+    return rows
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--cache', choices=sorted(CACHES), default='lfu')
+    common.add_argument('--config', metavar='FILE', help="JSON file with SystemConfig parameters")
+    common.add_argument('--set', dest='overrides', type=_parse_assignment, action='append', default=[],
+                        metavar='KEY=VALUE', help="override SystemConfig parameter")
+    common.add_argument('--workload', metavar='FILE', help="JSON workload file")
+    common.add_argument('--generate', choices=['uniform', 'zipf', 'sequential', 'hotspot'],
+                        help="generate workload instead of reading a file")
+    common.add_argument('--import', dest='import_path', metavar='TRACE',
+                        help="import block device trace (plain or .gz)")
+    common.add_argument('--import-format', choices=['blkparse', 'msr'], default='blkparse')
+    common.add_argument('--max-requests', type=int, default=0, help="import at most N requests, 0 - all")
+    common.add_argument('--max-sectors', type=int, default=0,
+                        help="import at most N sectors of every request, 0 - whole requests")
+    common.add_argument('--processes', type=int, default=4)
+    common.add_argument('--operations', type=int, default=100)
+    common.add_argument('--read-ratio', type=float, default=0.5)
+    common.add_argument('--seed', type=int, default=0)
+    common.add_argument('--arrivals', choices=['poisson', 'bursty', 'trace'],
+                        help="open-loop requests: --generate pattern at --rate, or --import trace times")
+    common.add_argument('--rate', type=float, default=10.0, help="open-loop requests per second")
+    common.add_argument('--requests', type=int, default=1000, help="number of open-loop requests")
+    common.add_argument('--burst-factor', type=float, default=10.0,
+                        help="bursty arrivals: rate during bursts relative to the mean rate")
+    common.add_argument('--disks', type=int, default=1, help="number of disks in the array")
+    common.add_argument('--layout', choices=['concat', 'stripe', 'mirror'], default='stripe')
+    common.add_argument('--stripe-sectors', type=int, default=64)
+    common.add_argument('--warmup', type=int, default=0, metavar='N',
+                        help="fast-forward the first N operations into the cache")
+    common.add_argument('--max-iterations', type=int, default=0, help="0 means unlimited")
+    common.add_argument('--format', choices=['text', 'json', 'csv'], default='text')
+    common.add_argument('--output', metavar='FILE', help="write results to file instead of stdout")
+    common.add_argument('--trace', action='store_true', help="print the full simulation trace")
+    common.add_argument('--profile', metavar='FILE',
+                        help="write host CPU time of the components as collapsed stacks (flamegraph.pl)")
+    common.add_argument('--result-cache', metavar='DIR',
+                        help="reuse results of identical runs stored in DIR "
+                             "(not with --trace, --record or --profile)")
+    common.add_argument('--result-cache-size', type=float, default=64.0, metavar='MB',
+                        help="result cache size limit, least recently used results are removed")
+
+    parser = argparse.ArgumentParser(description="Hard drive buffer cache simulator")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', parents=[common], help="run one simulation")
+    run_parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='fifo')
+    run_parser.add_argument('--record', metavar='FILE', help="write binary trace of the run to file")
+    run_parser.add_argument('--record-append', action='store_true',
+                            help="add the run to a non-empty --record file (replay reads the last run)")
+    run_parser.set_defaults(handler=cmd_run)
+
+    compare_parser = subparsers.add_parser('compare', parents=[common], help="compare strategies")
+    compare_parser.add_argument('--strategies', type=_strategy_list, default=list(STRATEGIES))
+    compare_parser.set_defaults(handler=cmd_compare)
+
+    sweep_parser = subparsers.add_parser('sweep', parents=[common], help="grid over config parameters")
+    sweep_parser.add_argument('--grid', type=_parse_assignment, action='append', required=True,
+                              metavar='KEY=V1,V2,...')
+    sweep_parser.add_argument('--strategies', type=_strategy_list, default=list(STRATEGIES))
+    sweep_parser.set_defaults(handler=cmd_sweep)
+
+    load_parser = subparsers.add_parser('load', parents=[common], help="response time against offered load")
+    load_parser.add_argument('--rates', type=lambda text: [float(v) for v in text.split(',')], required=True,
+                             metavar='R1,R2,...', help="offered loads, requests per second")
+    load_parser.add_argument('--strategies', type=_strategy_list, default=list(STRATEGIES))
+    load_parser.set_defaults(handler=cmd_load)
+
+    replay_parser = subparsers.add_parser('replay', help="metrics from recorded traces")
+    replay_parser.add_argument('traces', nargs='+', metavar='TRACE')
+    replay_parser.add_argument('--format', choices=['text', 'json', 'csv'], default='text')
+    replay_parser.add_argument('--output', metavar='FILE', help="write results to file instead of stdout")
+    replay_parser.set_defaults(handler=cmd_replay)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    args.overrides = [(key, _parse_value(value)) for key, value in getattr(args, 'overrides', [])]
+
+    args.results = None
+    if getattr(args, 'result_cache', None):
+        from simulation.results import ResultCache
+        try:
+            args.results = ResultCache(args.result_cache, int(args.result_cache_size * 1024 * 1024))
+        except (OSError, ValueError) as e:
+            raise SystemExit(f"error: {e}")
+
+    args.profiler = None
+    if getattr(args, 'profile', None):
+        from simulation.profiler import Profiler
+        args.profiler = Profiler()
+
+    rows = args.handler(args)
+    _write_rows(args, rows)
+
+    if args.profiler is not None:
+        _write_profile(args.profiler, args.profile)
+
+    if args.results is not None:
+        print(f"Result cache: {args.results.hits} hits, {args.results.misses} misses", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
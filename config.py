@@ -1,17 +1,54 @@
+import json
+import os
+from typing import Optional
+
+
+# Environment variables HDSIM_<PARAMETER> override the defaults (SystemConfig.load)
+ENV_PREFIX = 'HDSIM_'
+
+# Allowed values of the string parameters
+CHOICES = {
+    'DISK_TIME_MODEL': ('average', 'position'),
+    'SCHEDULER_POLICY': ('rr', 'mlfq', 'cfs', 'edf'),
+    'TRACE_STATE': ('full', 'changes'),
+}
+
+
 class SystemConfig:
     # System and drive config
+    # Immutable: parameters are given to the constructor (or SystemConfig.load),
+    # checked once and the derived timings are computed at construction
+    # replace() returns a changed copy. Equal configs have equal hashes,
+    # so a config can be a key of memoized results
 
-    def __init__(self):
+    def __init__(self, **overrides):
         # Hard disk parameters
         self.TRACKS_NUM = 10000
         self.SECTORS_PER_TRACK = 500
         self.TRACK_SEEK_TIME = 0.5  # ms
         self.REWIND_SEEK_TIME = 10.0  # ms
         self.ROTATION_SPEED = 7500  # rpm
+        self.SECTOR_SIZE = 512  # bytes, used to map byte offsets of imported traces
+
+        # Rotational delay (models.disk.TIME_MODELS): 'average' - half a revolution for every access,
+        # 'position' - from the platter position at the time the seek ends
+        self.DISK_TIME_MODEL = 'average'
+
+        # On-drive cache (track buffer) KB, 0 - no cache, split into DISK_CACHE_SEGMENTS segments
+        # A read miss reads ahead the rest of the track into a segment
+        self.DISK_CACHE_SIZE = 0
+        self.DISK_CACHE_SEGMENTS = 16
+
+        # Device command queue depth (1 - one request at a time, >1 - NCQ/TCQ)
+        self.DEVICE_QUEUE_DEPTH = 1
 
         # Buffer cache parameters
         self.BUFFERS_NUM = 10
 
+        # Write miss: False - read the sector first, True - the whole sector is overwritten,
+        # the buffer is claimed without reading and written back later
+        self.WRITE_FULL_SECTOR = False
+
         # System calls parameters us
         self.SYSCALL_READ_TIME = 150
         self.SYSCALL_WRITE_TIME = 150
@@ -22,6 +59,16 @@ class SystemConfig:
         self.BEFORE_WRITING_TIME = 7000
         self.AFTER_READING_TIME = 7000
 
+        # Scheduling policy: 'rr' (round-robin), 'mlfq', 'cfs', 'edf'
+        self.SCHEDULER_POLICY = 'rr'
+
+        # MLFQ parameters
+        self.MLFQ_LEVELS = 3
+
+        # CFS parameters us
+        self.CFS_TARGET_LATENCY = 60000
+        self.CFS_MIN_GRANULARITY = 5000
+
         # LFU parameters
         self.LFU_LEFT_SEGMENT_MAX = 3
         self.LFU_MIDDLE_SEGMENT_MAX = 2
@@ -29,15 +76,134 @@ class SystemConfig:
         # LOOK parameters
         self.LOOK_TRACK_READ_MAX = 1
 
+        # C-LOOK parameters us
+        # Time the head may stay on one track in a sweep, 0 - one request per track
+        self.CLOOK_TRACK_TIME_BUDGET = 20000
+
         # NLOOK parameters
         self.NLOOK_QUEUE_MAX_LENGTH = 10
 
-    @property
-    def ROTATION_DELAY_TIME(self):
-        # Average rotation delay
-        return ((60 * 1000) / self.ROTATION_SPEED) / 2
+        # Deadline parameters us
+        # Expiry times are scaled to the disk: a full stroke seek takes about 5 s here
+        self.DEADLINE_READ_EXPIRE = 10000000
+        self.DEADLINE_WRITE_EXPIRE = 50000000
+        self.DEADLINE_PRIO_AGING_EXPIRE = 100000000
+        self.DEADLINE_WRITES_STARVED = 2
+        self.DEADLINE_FIFO_BATCH = 16
+
+        # Console output of the components
+        self.TRACE = True
+
+        # State of the cache and strategies in the output:
+        # 'full' - the whole state after every event, 'changes' - only changes since the previous one
+        self.TRACE_STATE = 'full'
+
+        for name, value in overrides.items():
+            setattr(self, name, self._check(name, value))
+        self._validate()
+
+        # Derived timings ms
+        self.ROTATION_DELAY_TIME = ((60 * 1000) / self.ROTATION_SPEED) / 2  # Average rotation delay
+        self.SECTOR_ACCESS_TIME = ((60 * 1000) / self.ROTATION_SPEED) / self.SECTORS_PER_TRACK
+
+        self._key = tuple(sorted(self.parameters().items()))
+
+    def _check(self, name: str, value):
+        # Value of the parameter converted to the type of its default
+        if not name.isupper() or name not in vars(self):
+            raise ValueError(f"Unknown config parameter `{name}`")
+
+        default = getattr(self, name)
+        if isinstance(default, bool):
+            if isinstance(value, str) and value.lower() in ('true', 'false', '1', '0'):
+                return value.lower() in ('true', '1')
+            if not isinstance(value, bool):
+                raise ValueError(f"{name} must be true or false, got `{value}`")
+            return value
+
+        try:
+            if isinstance(default, int):
+                converted = int(value)
+                if converted != float(value):
+                    raise ValueError
+                return converted
+            if isinstance(default, float):
+                return float(value)
+        except (TypeError, ValueError):
+            kind = 'an integer' if isinstance(default, int) else 'a number'
+            raise ValueError(f"{name} must be {kind}, got `{value}`") from None
+
+        if name in CHOICES and value not in CHOICES[name]:
+            raise ValueError(f"{name} must be one of {', '.join(CHOICES[name])}, got `{value}`")
+        return value
+
+    def _validate(self):
+        # Ranges and relations between the parameters
+        positive = ['TRACKS_NUM', 'SECTORS_PER_TRACK', 'ROTATION_SPEED', 'SECTOR_SIZE',
+                    'DISK_CACHE_SEGMENTS', 'DEVICE_QUEUE_DEPTH', 'BUFFERS_NUM', 'QUANTUM_TIME', 'MLFQ_LEVELS',
+                    'CFS_TARGET_LATENCY', 'CFS_MIN_GRANULARITY', 'LFU_LEFT_SEGMENT_MAX',
+                    'LFU_MIDDLE_SEGMENT_MAX', 'LOOK_TRACK_READ_MAX', 'NLOOK_QUEUE_MAX_LENGTH',
+                    'DEADLINE_FIFO_BATCH']
+        for name in positive:
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} must be positive, got {getattr(self, name)}")
+
+        for name, value in self.parameters().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value < 0:
+                raise ValueError(f"{name} must not be negative, got {value}")
+
+        # Every drive cache segment holds at least one sector
+        if self.DISK_CACHE_SIZE and self.DISK_CACHE_SIZE * 1024 // self.SECTOR_SIZE < self.DISK_CACHE_SEGMENTS:
+            raise ValueError(f"DISK_CACHE_SIZE ({self.DISK_CACHE_SIZE} KB) is too small "
+                             f"for {self.DISK_CACHE_SEGMENTS} segments")
+
+        # The right segment must keep buffers to evict
+        if self.LFU_LEFT_SEGMENT_MAX + self.LFU_MIDDLE_SEGMENT_MAX >= self.BUFFERS_NUM:
+            raise ValueError(f"LFU_LEFT_SEGMENT_MAX + LFU_MIDDLE_SEGMENT_MAX "
+                             f"({self.LFU_LEFT_SEGMENT_MAX} + {self.LFU_MIDDLE_SEGMENT_MAX}) "
+                             f"must be less than BUFFERS_NUM ({self.BUFFERS_NUM})")
+
+    def __setattr__(self, name: str, value):
+        if '_key' in vars(self):
+            raise AttributeError(f"SystemConfig is immutable, use replace({name}=...)")
+        super().__setattr__(name, value)
+
+    def parameters(self) -> dict:
+        # Parameters that can be given to the constructor
+        return {name: value for name, value in vars(self).items()
+                if name.isupper() and name not in ('ROTATION_DELAY_TIME', 'SECTOR_ACCESS_TIME')}
+
+    def replace(self, **changes) -> 'SystemConfig':
+        # Copy with changed parameters
+        return SystemConfig(**dict(self.parameters(), **changes))
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, env: Optional[dict] = None,
+             overrides: Optional[dict] = None) -> 'SystemConfig':
+        # Config from the defaults, then JSON file {"PARAMETER": value},
+        # then environment variables HDSIM_<PARAMETER>, then overrides (command line)
+        parameters = {}
+        if path:
+            with open(path) as f:
+                parameters.update(json.load(f))
+
+        env = os.environ if env is None else env
+        parameters.update({name[len(ENV_PREFIX):]: value for name, value in env.items()
+                           if name.startswith(ENV_PREFIX)})
+
+        parameters.update(overrides or {})
+        return cls(**parameters)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SystemConfig) and self._key == other._key
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __repr__(self) -> str:
+        changed = {name: value for name, value in self.parameters().items()
+                   if value != _DEFAULTS.get(name)}
+        return f"SystemConfig({', '.join(f'{k}={v!r}' for k, v in changed.items())})"
+
 
-    @property
-    def SECTOR_ACCESS_TIME(self):
-        # Sector access time ms
-        return ((60 * 1000) / self.ROTATION_SPEED) / self.SECTORS_PER_TRACK
+_DEFAULTS = SystemConfig().parameters()
@@ -0,0 +1,60 @@
+# Console output of the simulator components
+# With config.TRACE switched off the components print nothing
+
+
+def silent(*args, **kwargs):
+    # Output function used when tracing is off
+    pass
+
+
+def get_printer(config):
+    # Returns the output function for the components
+    return print if config.TRACE else silent
+
+
+class ChangeJournal:
+    # Changes of a component since its state was printed last time
+    # Kept only when tracing prints changes (config.TRACE_STATE == 'changes')
+    def __init__(self, config):
+        self.enabled = config.TRACE and config.TRACE_STATE == 'changes'
+        self.entries = []
+
+    def record(self, buffer, change: str):
+        if self.enabled:
+            self.entries.append((str(buffer), change))
+
+    def take(self) -> list:
+        entries = self.entries
+        self.entries = []
+        return entries
+
+
+class StateView:
+    # State of a component (cache or strategy) for the console
+    # Rendered only when printed, so it costs nothing with tracing off
+    # Prints the full state or, with a change journal, only the changes since the previous print
+    # This is a live view: it keeps a reference to the component, not a copy of its state,
+    # and shows the state at the time it is first printed (print() does that at once).
+    # The text is kept after the first print, printing the view again repeats it.
+    # Call str() at once when the state of this moment is needed later
+    __slots__ = ('component', 'text')
+
+    def __init__(self, component):
+        self.component = component
+        self.text = None
+
+    def __str__(self) -> str:
+        if self.text is None:
+            self.text = self._render()
+        return self.text
+
+    def _render(self) -> str:
+        journal = self.component.journal
+        if not journal.enabled:
+            return self.component.get_state_string()
+
+        entries = journal.take()
+        if not entries:
+            return f"{self.component.state_title}: no changes"
+        return f"{self.component.state_title} changes:\n" + \
+            '\n'.join(f"    {label} -> {change}" for label, change in entries)
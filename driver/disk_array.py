@@ -0,0 +1,120 @@
+from typing import List, Optional
+from models.buffer import Buffer, IO_PRIORITY_BE
+from driver.disk_driver import DiskDriver, append_waiter
+
+
+# Disk array
+# Routes I/O requests to the drivers of the member disks according to the layout
+# Every disk has its own head, strategy and interrupt timeline, so I/O on different disks overlaps
+class DiskArray:
+
+    def __init__(self, drivers: List[DiskDriver], layout=None):
+        # layout None means a single disk
+        self.drivers = drivers
+        self.layout = layout
+
+        # Mirrored writes: sector -> number of copies still in progress
+        self.pending_copies = {}
+
+        # Processes waiting for a sector that is not being read yet: sector -> [(process, op_type)]
+        # They move to the READ request of the sector when it is scheduled, a blocked process
+        # leaves when it is woken otherwise (discard_waiter)
+        self.parked_waiters = {}
+
+    def drivers_for(self, sector_num: int, operation: str) -> List[DiskDriver]:
+        # Chooses member drivers for the request
+        if self.layout is None:
+            return self.drivers
+
+        disks = [self.drivers[i] for i in self.layout.disks_for_sector(sector_num)]
+
+        if operation == 'READ' and len(disks) > 1:
+            # Mirror read: the nearest head
+            return [min(disks, key=lambda d: d.disk.calculate_seek_time(
+                d.disk.current_track, d.disk.get_track_for_sector(sector_num)))]
+
+        return disks
+
+    def get_track_for_sector(self, sector_num: int) -> int:
+        # Track on the first disk that holds the sector
+        return self.drivers_for(sector_num, 'WRITE')[0].disk.get_track_for_sector(sector_num)
+
+    def schedule_io(self, buffer: Buffer, operation: str, current_time: int = 0,
+                    io_priority: int = IO_PRIORITY_BE) -> None:
+        # Adds request to the member disks
+        drivers = self.drivers_for(buffer.sector_num, operation)
+
+        if len(drivers) > 1:
+            self.pending_copies[buffer.sector_num] = len(drivers)
+
+        for driver in drivers:
+            request = driver.schedule_io(buffer, operation, current_time, io_priority)
+
+        if operation == 'READ' and buffer.sector_num in self.parked_waiters:
+            request.waiters[:0] = self.parked_waiters.pop(buffer.sector_num)
+
+    def start_next_io(self, current_time: int) -> List[tuple]:
+        # Feeds every disk and starts I/O on the idle ones
+        # Returns started (buffer, operation, completion_time)
+        started = []
+        for driver in self.drivers:
+            io_info = driver.start_next_io(current_time)
+            if io_info:
+                started.append(io_info)
+        return started
+
+    def next_interrupt_time(self) -> Optional[int]:
+        # Earliest completion among the disks
+        times = [d.current_operation[2] for d in self.drivers if d.current_operation]
+        return min(times) if times else None
+
+    def add_waiter(self, sector_num: int, process, op_type: Optional[str]):
+        # Attaches the process to the pending READ of the sector on any disk,
+        # if the sector is not being read - to its next READ
+        if not any(driver.add_waiter(sector_num, process, op_type) for driver in self.drivers):
+            append_waiter(self.parked_waiters.setdefault(sector_num, []), process, op_type)
+
+    def discard_waiter(self, sector_num: int, process):
+        # The blocked process was woken without the READ of the sector (a free buffer
+        # appeared), it is not kept parked
+        waiters = self.parked_waiters.get(sector_num)
+        if waiters and (process, None) in waiters:
+            waiters.remove((process, None))
+            if not waiters:
+                del self.parked_waiters[sector_num]
+
+    def complete_next_io(self) -> tuple:
+        # Completes the earliest operation
+        # Returns (buffer, operation, done, waiters), done is False while other mirror copies
+        # are in progress, waiters - processes attached to the request [(process, op_type)]
+        driver = min((d for d in self.drivers if d.current_operation),
+                     key=lambda d: d.current_operation[2])
+        buffer, operation, _ = driver.current_operation
+        waiters = driver.complete_io(buffer, operation)
+
+        sector_num = buffer.sector_num
+        if sector_num in self.pending_copies:
+            self.pending_copies[sector_num] -= 1
+            if self.pending_copies[sector_num] > 0:
+                # Other copies still use the buffer
+                buffer.io_operation = operation
+                return buffer, operation, False, waiters
+            del self.pending_copies[sector_num]
+
+        return buffer, operation, True, waiters
+
+    def serve_without_timing(self):
+        # Warm-up: every disk serves its queued requests at once (DiskDriver.serve_without_timing)
+        for driver in self.drivers:
+            driver.serve_without_timing()
+        self.pending_copies.clear()
+
+    def has_active_io(self) -> bool:
+        return any(driver.has_active_io() for driver in self.drivers)
+
+    def has_pending_requests(self) -> bool:
+        return any(driver.strategy.has_pending_requests() for driver in self.drivers)
+
+    @property
+    def disks(self) -> list:
+        return [driver.disk for driver in self.drivers]
@@ -1,6 +1,29 @@
-from typing import Optional
-from models.buffer import Buffer
+from typing import Dict, List, Optional
+from models.buffer import Buffer, IO_PRIORITY_BE
 from models.disk import HardDisk
+from console import get_printer
+from simulation.clock import us
+from simulation.recorder import EVENT_SCHEDULE, EVENT_DISPATCH, EVENT_INTERRUPT, OPERATION_CODES
+
+
+# I/O request in the driver, from scheduling to completion
+class PendingRequest:
+    __slots__ = ('buffer', 'operation', 'waiters')
+
+    def __init__(self, buffer: Buffer, operation: str):
+        self.buffer = buffer
+        self.operation = operation
+        # Processes waiting for the request: [(process, op_type)] in order of arrival,
+        # op_type of an asynchronous call or None for a blocked process
+        self.waiters = []
+
+
+def append_waiter(waiters: list, process, op_type: Optional[str]):
+    # A blocked process is woken in order of blocking, so it is moved to the end
+    # if it already waits after an earlier wakeup
+    if op_type is None and (process, None) in waiters:
+        waiters.remove((process, None))
+    waiters.append((process, op_type))
 
 
 # Hard disk driver
@@ -10,74 +33,165 @@ class DiskDriver:
     def __init__(self, disk: HardDisk, strategy):
         self.disk = disk
         self.strategy = strategy  # FIFO, LOOK, or NLOOK
+        self.log = get_printer(disk.config)
 
         # Current active operation
-        self.current_operation = None  # ('READ'/'WRITE', buffer, start_time)
+        self.current_operation = None  # (buffer, 'READ'/'WRITE', completion_time)
+
+        # Device command queue (NCQ/TCQ): requests already sent to the drive, not yet started
+        # The drive serves them in order of positioning cost
+        self.queue_depth = disk.config.DEVICE_QUEUE_DEPTH
+        self.device_queue: List[tuple] = []  # (buffer, operation)
+
+        # Index of requests from scheduling to completion: sector -> [PendingRequest]
+        # in order of scheduling (a write-back of the old buffer and a read of the new one
+        # can wait for the same sector)
+        self.pending: Dict[int, List[PendingRequest]] = {}
+        # Requests still in the strategy (not sent to the drive): track -> count
+        self.track_requests: Dict[int, int] = {}
 
-        # Buffers that are currently being processed
-        self.buffers_in_io = {}
+        # Strategies can ask about the queued requests (requests_on_track)
+        strategy.driver = self
 
-    def schedule_io(self, buffer: Buffer, operation: str) -> None:
+        # Time from scheduling to completion of every request, ns
+        self.io_latencies = {'READ': [], 'WRITE': []}
+
+        # Trace recorder (simulation.recorder), None - not recording
+        self.recorder = None
+        self.disk_index = getattr(disk, 'disk_index', 0)
+
+    def schedule_io(self, buffer: Buffer, operation: str, current_time: int = 0,
+                    io_priority: int = IO_PRIORITY_BE) -> PendingRequest:
         # Adds I/O request to the drive queue, operation 'READ' or 'WRITE'
-        print(f"DRIVER: Buffer {buffer} scheduled for I/O ({operation})")
+        # The same operation for a sector already in the queue is not repeated,
+        # the pending request is returned
+        request = self._find_request(buffer.sector_num, operation, buffer)
+        if request is not None:
+            self.log(f"DRIVER: Buffer {buffer} is already scheduled for I/O ({operation})")
+            return request
+
+        self.log(f"DRIVER: Buffer {buffer} scheduled for I/O ({operation})")
+
+        buffer.io_submit_time = current_time
+        buffer.io_priority = io_priority
+
+        if self.recorder:
+            self.recorder.record(EVENT_SCHEDULE, current_time, buffer.sector_num,
+                                 OPERATION_CODES[operation], self.disk_index)
 
         # Marks the buffer is being processed
-        if buffer.sector_num not in self.buffers_in_io:
-            self.buffers_in_io[buffer.sector_num] = (operation, [])
+        new_request = PendingRequest(buffer, operation)
+        self.pending.setdefault(buffer.sector_num, []).append(new_request)
+        track_num = self.disk.get_track_for_sector(buffer.sector_num)
+        self.track_requests[track_num] = self.track_requests.get(track_num, 0) + 1
 
         # Adds to the strategy
         self.strategy.add_request(buffer, operation)
 
         # Outputs strategy state
-        print(self.strategy.get_state_string())
+        self.log(self.strategy.get_state())
+
+        return new_request
+
+    def add_waiter(self, sector_num: int, process, op_type: Optional[str]) -> bool:
+        # Attaches the process to the pending READ of the sector
+        # Returns False if the sector is not being read
+        request = self._find_request(sector_num, 'READ')
+        if request is None:
+            return False
+        append_waiter(request.waiters, process, op_type)
+        return True
+
+    def _find_request(self, sector_num: int, operation: str,
+                      buffer: Optional[Buffer] = None) -> Optional[PendingRequest]:
+        # First pending request of the operation for the sector (of the buffer, if given)
+        for request in self.pending.get(sector_num, ()):
+            if request.operation == operation and (buffer is None or request.buffer is buffer):
+                return request
+        return None
+
+    def requests_on_track(self, track_num: int) -> int:
+        # Number of requests for the track waiting in the strategy
+        return self.track_requests.get(track_num, 0)
+
+    def start_next_io(self, current_time: int) -> Optional[tuple]:
+        # Sends requests to the drive up to the queue depth and starts the next command
+        # if the drive is idle. Returns (buffer, operation, completion_time) or None
+        self._fill_device_queue(current_time)
 
-    def start_next_io(self, current_time: float) -> Optional[tuple]:
-        # Starts next I/O (operation, returns buffer, operation, completion_time) or None
         if self.current_operation:
             return None
 
-        # Get the next buffer from the strategy
-        next_buffer = self.strategy.get_next_buffer()
-
-        if not next_buffer:
-            print("DRIVER: Device strategy has nothing to do")
+        if not self.device_queue:
+            self.log("DRIVER: Device strategy has nothing to do")
             return None
 
-        operation = next_buffer.io_operation
+        return self._start_command(current_time)
+
+    def _fill_device_queue(self, current_time: int):
+        # Takes requests from the strategy while the device queue has free slots
+        in_service = 1 if self.current_operation else 0
+
+        while len(self.device_queue) + in_service < self.queue_depth:
+            next_buffer = self.strategy.get_next_buffer(current_time)
+            if not next_buffer:
+                break
+            if self.recorder:
+                self.recorder.record(EVENT_DISPATCH, current_time, next_buffer.sector_num,
+                                     OPERATION_CODES[next_buffer.io_operation], self.disk_index)
+
+            self._take_track_request(next_buffer)
+            self.device_queue.append((next_buffer, next_buffer.io_operation))
+
+    def _take_track_request(self, buffer: Buffer) -> int:
+        # The request left the strategy. Returns its track
+        track_num = self.disk.get_track_for_sector(buffer.sector_num)
+        count = self.track_requests[track_num] - 1
+        if count:
+            self.track_requests[track_num] = count
+        else:
+            del self.track_requests[track_num]
+        return track_num
+
+    def serve_without_timing(self):
+        # Warm-up (Simulator.fast_forward): serves the queued requests in strategy order at once,
+        # the head moves to their tracks. Disk statistics and latencies are not touched
+        while True:
+            next_buffer = self.strategy.get_next_buffer()
+            if not next_buffer:
+                break
+            self.disk.current_track = self._take_track_request(next_buffer)
+            self._remove_pending(next_buffer, next_buffer.io_operation)
+            self.strategy.complete_io(next_buffer)
+
+    def _start_command(self, current_time: int) -> tuple:
+        # The drive starts the queued command with the smallest positioning cost
+        if len(self.device_queue) == 1:
+            index = 0
+        else:
+            current_track = self.disk.current_track
+            index = min(range(len(self.device_queue)),
+                        key=lambda i: self.disk.calculate_seek_time(
+                            current_track,
+                            self.disk.get_track_for_sector(self.device_queue[i][0].sector_num)))
+
+        next_buffer, operation = self.device_queue.pop(index)
 
         # Calculates the best mechanism move decision
         self._print_best_move_decision(next_buffer)
 
         # Calculates operation completion time
-        io_duration = self._calculate_io_duration(next_buffer, operation)
+        io_duration = self.disk.access_sector(next_buffer.sector_num, operation, current_time)
         completion_time = current_time + io_duration
 
         # Saves current operation
         self.current_operation = (next_buffer, operation, completion_time)
 
-        print(f"DRIVER: Started I/O ({operation}) for buffer {next_buffer}, "
-              f"will complete at {int(completion_time)} us")
+        self.log(f"DRIVER: Started I/O ({operation}) for buffer {next_buffer}, "
+              f"will complete at {us(completion_time)} us")
 
         return (next_buffer, operation, completion_time)
 
-    def _calculate_io_duration(self, buffer: Buffer, operation: str) -> float:
-
-        # Travel time to the track
-        target_track = self.disk.get_track_for_sector(buffer.sector_num)
-        seek_time = self.disk.seek_to_track(target_track)
-
-        # Updates current track
-        self.disk.current_track = target_track
-
-        rotational_delay = self.disk.config.ROTATION_DELAY_TIME
-        transfer_time = self.disk.config.SECTOR_ACCESS_TIME
-
-        # Total time (convert ms to µs)
-        total_time_ms = seek_time + rotational_delay + transfer_time
-        total_time_us = total_time_ms * 1000
-
-        return total_time_us
-
     def _print_best_move_decision(self, buffer: Buffer):
         # Displays information about the best way to move the mechanism
         target_track = self.disk.get_track_for_sector(buffer.sector_num)
@@ -85,43 +199,62 @@ class DiskDriver:
 
         # Calculates direct distance
         direct_distance = abs(target_track - current_track)
-        direct_time = direct_distance * self.disk.config.TRACK_SEEK_TIME
+        direct_time = direct_distance * self.disk.track_seek_time
 
-        rewind_time = self.disk.config.REWIND_SEEK_TIME + \
-                      target_track * self.disk.config.TRACK_SEEK_TIME
+        rewind_time = self.disk.rewind_seek_time + target_track * self.disk.track_seek_time
 
         context = "next buffer in queue"
 
-        print(f"DRIVER: Best move decision for tracks {current_track} => {buffer} ({context})")
+        self.log(f"DRIVER: Best move decision for tracks {current_track} => {buffer} ({context})")
 
         if direct_time == 0:
-            print(f"    not to move, that is 0 us")
+            self.log(f"    not to move, that is 0 us")
         else:
-            print(f"    direct move time {int(direct_time * 1000)} us, " +
-                  f"move time with rewind {int(rewind_time * 1000)} us")
+            self.log(f"    direct move time {us(direct_time)} us, " +
+                  f"move time with rewind {us(rewind_time)} us")
 
-    def complete_io(self, buffer: Buffer, operation: str):
+    def complete_io(self, buffer: Buffer, operation: str) -> list:
         # Ends I/O operation
-        print(f"DRIVER: Interrupt from disk")
-        print(f"DRIVER: Completed I/O ({operation}) for buffer {buffer}")
+        # Returns processes waiting for it [(process, op_type)]
+        self.log(f"DRIVER: Interrupt from disk")
+        self.log(f"DRIVER: Completed I/O ({operation}) for buffer {buffer}")
 
         # Removes from buffers in processing
-        if buffer.sector_num in self.buffers_in_io:
-            del self.buffers_in_io[buffer.sector_num]
+        waiters = self._remove_pending(buffer, operation)
 
         # Informs the strategy
-        self.strategy.complete_io()
+        self.strategy.complete_io(buffer)
 
         # Cleans current operation
+        completion_time = self.current_operation[2]
+        self.io_latencies[operation].append(completion_time - buffer.io_submit_time)
+
+        if self.recorder:
+            self.recorder.record(EVENT_INTERRUPT, completion_time, buffer.sector_num,
+                                 OPERATION_CODES[operation], self.disk_index)
         self.current_operation = None
 
         # Prints strategy state
-        print(self.strategy.get_state_string())
-
-    def is_buffer_in_io(self, sector_num: int) -> bool:
-        # Checks if I/O currently in progress for this sector
-        return sector_num in self.buffers_in_io
+        self.log(self.strategy.get_state())
+
+        # The drive continues with the next queued command without waiting for the host
+        if self.device_queue:
+            self._start_command(completion_time)
+
+        return waiters
+
+    def _remove_pending(self, buffer: Buffer, operation: str) -> list:
+        # Drops the completed request from the index, later requests for the sector stay
+        # Returns its waiters
+        request = self._find_request(buffer.sector_num, operation, buffer)
+        if request is None:
+            return []
+        requests = self.pending[buffer.sector_num]
+        requests.remove(request)
+        if not requests:
+            del self.pending[buffer.sector_num]
+        return request.waiters
 
     def has_active_io(self) -> bool:
-        # Has active I/O
-        return self.current_operation is not None
+        # Has active I/O (in service or waiting in the device queue)
+        return self.current_operation is not None or len(self.device_queue) > 0
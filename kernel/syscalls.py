@@ -1,129 +1,180 @@
+from typing import Optional
+
 from models.buffer import Buffer
 from models.process import Process
+from cache.base_cache import HIT as CACHE_HIT, IN_FLIGHT
+from console import get_printer
+from simulation.clock import us_to_ns, us
+from simulation.recorder import EVENT_EVICT
+
+
+# Outcomes of the buffer cache request (SystemCalls.request_buffer)
+HIT = 'hit'                  # Buffer is in the cache
+CLAIMED = 'claimed'          # Miss, free buffer claimed for a full sector write
+SCHEDULED = 'scheduled'      # Miss, reading of the sector is scheduled
+IN_IO_READ = 'in_io_read'    # Miss, the sector is being read
+IN_IO_WRITE = 'in_io_write'  # Miss, old contents of the sector are being written back
+NO_BUFFER = 'no_buffer'      # Miss, no free buffer (a modified one is being written back)
+DEFERRED = 'deferred'        # Miss, no free buffer for the rest of the batch, nothing is done
+
+# The process continues without waiting for I/O
+COMPLETED = (HIT, CLAIMED)
 
 
 # System read and write calls
 class SystemCalls:
     # Implementing system calls for working with the disk
+    # Every call (read, write, asynchronous, vectored) goes through request_buffer,
+    # the operation type chooses what is done with the buffer on a hit and on a miss
 
     def __init__(self, config, cache, driver, scheduler):
         self.config = config
         self.cache = cache
         self.driver = driver
         self.scheduler = scheduler
-
-    def sys_read(self, process: Process, sector_num: int, current_time: float) -> tuple:
-        # System read call
-        # Returns (success: bool, time_spent: float, blocked: bool)
-        print(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
-
-        syscall_time = self.config.SYSCALL_READ_TIME
-        time_spent = syscall_time
-
-        print(f"... worked for {int(syscall_time)} us in system call, request buffer cache")
-
-        buffer = self.cache.find_buffer(sector_num)
-
-        if buffer:
-            print(f"CACHE: Buffer {buffer} found in cache")
-
-            self.cache.access_buffer(sector_num,
-                                     self.driver.disk.get_track_for_sector(sector_num))
-
-            print(self.cache.get_state_string())
-
-            return (True, time_spent, False)
-
-        else:
-            # Checks if I/O is already in progress for this sector
-            if self.driver.is_buffer_in_io(sector_num):
-                print(f"CACHE: Buffer for sector {sector_num} not found in cache")
-                print(f"SCHEDULER: But this buffer is scheduled for I/O (READ)")
-                return (False, time_spent, True)  # Блокуємо процес
-
-            print(f"CACHE: Buffer for sector {sector_num} not found in cache")
-
-            free_buffer = self._get_or_evict_buffer(sector_num, current_time + time_spent)
-
-            if free_buffer is None:
-                return (False, time_spent, True)
-
-            track_num = self.driver.disk.get_track_for_sector(sector_num)
-            free_buffer.load_sector(sector_num, track_num)
-
-            self.driver.schedule_io(free_buffer, 'READ')
-
-            return (False, time_spent, True)
-
-    def sys_write(self, process: Process, sector_num: int, current_time: float) -> tuple:
-        # System write call
-        # Returns (success: bool, time_spent: float, blocked: bool)
-        print(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
-
-        syscall_time = self.config.SYSCALL_WRITE_TIME
-        time_spent = syscall_time
-
-        print(f"... worked for {int(syscall_time)} us in system call, request buffer cache")
-
-        buffer = self.cache.find_buffer(sector_num)
-
-        if buffer:
-            print(f"CACHE: Buffer {buffer} found in cache")
-
-            self.cache.access_buffer(sector_num,
-                                     self.driver.disk.get_track_for_sector(sector_num))
-
-            print(self.cache.get_state_string())
-
+        self.log = get_printer(config)
+
+        # ns
+        self.syscall_read_time = us_to_ns(config.SYSCALL_READ_TIME)
+        self.syscall_write_time = us_to_ns(config.SYSCALL_WRITE_TIME)
+
+        # Set when a process had to wait because every buffer was in I/O
+        self.buffer_shortage = False
+
+        # Trace recorder (simulation.recorder), None - not recording
+        self.recorder = None
+
+        # Operation type -> (action on a hit, action on a miss with a free buffer)
+        read_actions = (self._read_hit, self._read_miss)
+        write_actions = (self._write_hit, self.prepare_write_buffer)
+        self.actions = {
+            'r': read_actions,
+            'w': write_actions,
+            'ar': read_actions,
+            'aw': write_actions,
+            'rv': read_actions,
+        }
+
+    def sys_read(self, process: Process, sector_num: int, current_time: int) -> tuple:
+        # System read call, times in ns
+        # Returns (success: bool, time_spent: int, blocked: bool)
+        return self._syscall(process, 'r', sector_num, current_time, self.syscall_read_time)
+
+    def sys_write(self, process: Process, sector_num: int, current_time: int) -> tuple:
+        # System write call, times in ns
+        # Returns (success: bool, time_spent: int, blocked: bool)
+        return self._syscall(process, 'w', sector_num, current_time, self.syscall_write_time)
+
+    def _syscall(self, process: Process, op_type: str, sector_num: int, current_time: int,
+                 syscall_time: int) -> tuple:
+        self.log(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
+        self.log(f"... worked for {us(syscall_time)} us in system call, request buffer cache")
+
+        outcome = self.request_buffer(process, op_type, sector_num, current_time + syscall_time)
+        success = outcome in COMPLETED
+        return (success, syscall_time, not success)
+
+    def request_buffer(self, process: Process, op_type: str, sector_num: int,
+                       current_time: int, log_state: bool = True,
+                       batch_started: bool = False) -> str:
+        # Kernel part of the call after the system call time is spent
+        # One cache lookup (lookup_or_reserve), on a miss uses the victim and starts I/O
+        # batch_started: part of a vectored call is in flight, a miss without a free buffer
+        # is DEFERRED instead of waiting for one
+        # Returns the outcome (HIT, CLAIMED, SCHEDULED, IN_IO_READ, IN_IO_WRITE, NO_BUFFER, DEFERRED)
+        on_hit, on_miss = self.actions[op_type]
+
+        state, buffer = self.cache.lookup_or_reserve(sector_num)
+
+        if state == CACHE_HIT:
+            self.log(f"CACHE: Buffer {buffer} found in cache")
+            if log_state:
+                self.log(self.cache.get_state())
+            on_hit(process, buffer)
+            return HIT
+
+        self.log(f"CACHE: Buffer for sector {sector_num} not found in cache")
+
+        # I/O is already in progress for this sector: reading or writing back the old contents
+        if state == IN_FLIGHT:
+            if buffer.modified:
+                self.log("SCHEDULER: But this buffer is scheduled for I/O (WRITE)")
+                return IN_IO_WRITE
+            self.log("SCHEDULER: But this buffer is scheduled for I/O (READ)")
+            return IN_IO_READ
+
+        if buffer is None and batch_started:
+            self.log("CACHE: No free buffers, the rest of the batch waits")
+            return DEFERRED
+
+        free_buffer = self._use_victim(buffer, current_time)
+        if free_buffer is None:
+            return NO_BUFFER
+
+        return CLAIMED if on_miss(process, free_buffer, sector_num, current_time) else SCHEDULED
+
+    def _read_hit(self, process: Process, buffer: Buffer):
+        pass
+
+    def _write_hit(self, process: Process, buffer: Buffer):
+        buffer.mark_modified()
+        self.log(f"SCHEDULER: Process `{process.name}` modified buffer {buffer}")
+
+    def _read_miss(self, process: Process, buffer: Buffer, sector_num: int,
+                   current_time: int) -> bool:
+        # Schedules reading of the sector into the free buffer, the process has to wait
+        track_num = self.driver.get_track_for_sector(sector_num)
+        buffer.load_sector(sector_num, track_num)
+        self.driver.schedule_io(buffer, 'READ', current_time, process.io_priority)
+        return False
+
+    def prepare_write_buffer(self, process: Process, buffer: Buffer, sector_num: int,
+                             current_time: int) -> bool:
+        # Loads a free buffer for the write miss
+        # Full sector write: the buffer is modified at once, no read (returns True)
+        # Otherwise schedules reading of the sector (returns False, the process has to wait)
+        if self.config.WRITE_FULL_SECTOR:
+            track_num = self.driver.get_track_for_sector(sector_num)
+            buffer.load_sector(sector_num, track_num)
+            self.cache.add_buffer_to_cache(buffer)
             buffer.mark_modified()
-            print(f"SCHEDULER: Process `{process.name}` modified buffer {buffer}")
+            self.log(f"CACHE: Buffer {buffer} claimed for full sector write, no read")
+            self.log(self.cache.get_state())
+            self.log(f"SCHEDULER: Process `{process.name}` modified buffer {buffer}")
+            return True
 
-            return (True, time_spent, False)
+        return self._read_miss(process, buffer, sector_num, current_time)
 
-        else:
-            # Checks if I/O is already in progress for this sector
-            if self.driver.is_buffer_in_io(sector_num):
-                print(f"CACHE: Buffer for sector {sector_num} not found in cache")
-                print(f"SCHEDULER: But this buffer is scheduled for I/O (READ)")
-                return (False, time_spent, True)
-
-            print(f"CACHE: Buffer for sector {sector_num} not found in cache")
-
-            free_buffer = self._get_or_evict_buffer(sector_num, current_time + time_spent)
-
-            if free_buffer is None:
-                return (False, time_spent, True)
-
-            track_num = self.driver.disk.get_track_for_sector(sector_num)
-            free_buffer.load_sector(sector_num, track_num)
-
-            self.driver.schedule_io(free_buffer, 'READ')
-
-            return (False, time_spent, True)
-
-    def _get_or_evict_buffer(self, sector_num: int, current_time: float) -> Buffer:
-        # Gets a free buffer or replaces an existing one
+    def _use_victim(self, evicted_buffer: Optional[Buffer], current_time: int) -> Optional[Buffer]:
+        # Free buffer or the replaced one taken by lookup_or_reserve
         # If the replaced buffer is modified - starts writing to disk
-        print("CACHE: Get free buffer")
+        self.log("CACHE: Get free buffer")
+
+        if evicted_buffer is None:
+            self.log("CACHE: All buffers are in I/O, wait for completion")
+            self.buffer_shortage = True
+            return None
 
-        evicted_buffer = self.cache.get_free_buffer()
+        if self.recorder and evicted_buffer.sector_num is not None:
+            self.recorder.record(EVENT_EVICT, current_time, evicted_buffer.sector_num,
+                                 int(bool(evicted_buffer.modified)))
 
         # Checks whether the displaced buffer needs to be written
         if evicted_buffer.modified and evicted_buffer.sector_num is not None:
-            print(f"CACHE: Buffer {evicted_buffer} removed from cache")
-            print(self.cache.get_state_string())
-            print("SCHEDULER: This buffer was modified, will write it")
+            self.log(f"CACHE: Buffer {evicted_buffer} removed from cache")
+            self.log(self.cache.get_state())
+            self.log("SCHEDULER: This buffer was modified, will write it")
 
             # Sends WRITE
-            self.driver.schedule_io(evicted_buffer, 'WRITE')
+            self.driver.schedule_io(evicted_buffer, 'WRITE', current_time)
 
             # Return None - the process have to be blocked
             return None
 
         # Deletes from cache if it was there
         if evicted_buffer.sector_num is not None:
-            print(f"CACHE: Buffer {evicted_buffer} removed from cache")
-            print(self.cache.get_state_string())
-            print("SCHEDULER: This buffer was not modified, will reuse it")
+            self.log(f"CACHE: Buffer {evicted_buffer} removed from cache")
+            self.log(self.cache.get_state())
+            self.log("SCHEDULER: This buffer was not modified, will reuse it")
 
         return evicted_buffer
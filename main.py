@@ -1,3 +1,5 @@
+import sys
+
 from config import SystemConfig
 from models.process import Process
 from simulation.simulator import Simulator
@@ -187,8 +189,7 @@ def scenario_8_look_three_read_max_2():
     print("=" * 70)
     print()
 
-    config = SystemConfig()
-    config.LOOK_TRACK_READ_MAX = 2
+    config = SystemConfig(LOOK_TRACK_READ_MAX=2)
 
     print_header("LFU (3 segments)", "LOOK (2)")
 
@@ -213,9 +214,7 @@ def scenario_9_nlook_complex_processes():
     print("=" * 70)
     print()
 
-    config = SystemConfig()
-    config.SYSCALL_READ_TIME = 50000
-    config.SYSCALL_WRITE_TIME = 50000
+    config = SystemConfig(SYSCALL_READ_TIME=50000, SYSCALL_WRITE_TIME=50000)
     print_header("LFU (3 segments)", "NLOOK (num 10)")
 
     simulator = Simulator(config, NLOOKStrategy)
@@ -270,14 +269,10 @@ def compare_strategies():
 
         simulator.run()
 
-        results[strategy_name] = {
-            'total_time': simulator.current_time,
-            'total_seeks': simulator.disk.total_seeks,
-            'total_seek_time': simulator.disk.total_seek_time,
-        }
+        results[strategy_name] = simulator.get_stats()
 
         print(
-            f"Done (Time: {int(simulator.current_time)} μs, Seeks: {simulator.disk.total_seeks}, Seek Time: {results[strategy_name]['total_seek_time']:.2f} ms)")
+            f"Done (Time: {int(results[strategy_name]['total_time'])} μs, Seeks: {simulator.disk.total_seeks}, Seek Time: {results[strategy_name]['total_seek_time']:.2f} ms)")
         print()
 
     print()
@@ -328,4 +323,8 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Non-interactive mode, see cli.py
+        import cli
+        sys.exit(cli.main(sys.argv[1:]))
     main()
@@ -1,3 +1,11 @@
+# I/O priority classes of requests (like Linux ioprio): real time, best effort, idle
+IO_PRIORITY_RT = 0
+IO_PRIORITY_BE = 1
+IO_PRIORITY_IDLE = 2
+
+IO_PRIORITY_CLASSES = {'rt': IO_PRIORITY_RT, 'be': IO_PRIORITY_BE, 'idle': IO_PRIORITY_IDLE}
+
+
 # Buffer for storing the contents of the sector in RAM
 class Buffer:
     # Buffer cache buffer
@@ -12,9 +20,12 @@ class Buffer:
         # For LFU algorithm
         self.access_counter = 0
         self.last_access_time = 0
+        self.segment = None  # Segment of the cache, None - not in the cache or in flight
 
         # For I/O operation
         self.io_operation = None # READ or WRITE
+        self.io_priority = IO_PRIORITY_BE
+        self.io_submit_time = 0  # ns
 
     def load_sector(self, sector_num: int, track_num: int, data=None):
         # Loads sector into buffer
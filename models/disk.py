@@ -1,5 +1,8 @@
 from functools import total_ordering
 
+from models.disk_cache import TrackBuffer
+from simulation.clock import ms_to_ns
+
 
 class Sector:
     # Sector
@@ -12,14 +15,53 @@ class Sector:
         return f"({self.track_num}:{self.sector_num})"
 
 
+# Time models of the platter rotation (config.DISK_TIME_MODEL)
+class AverageRotationModel:
+    # Every access waits the average rotational delay (half a revolution)
+    def __init__(self, config):
+        self.rotation_delay = ms_to_ns(config.ROTATION_DELAY_TIME)
+
+    def rotational_delay(self, position: int, time_ns: int) -> int:
+        return self.rotation_delay
+
+
+class PositionRotationModel:
+    # The platter turns with the simulation clock (sector 0 of every track is under the head
+    # at time 0), an access waits until its sector comes under the head after the seek
+    def __init__(self, config):
+        self.sectors_per_track = config.SECTORS_PER_TRACK
+        self.revolution = ms_to_ns(60 * 1000 / config.ROTATION_SPEED)
+
+    def rotational_delay(self, position: int, time_ns: int) -> int:
+        # position: sector index on the track
+        sector_time = position * self.revolution // self.sectors_per_track
+        return (sector_time - time_ns) % self.revolution
+
+
+TIME_MODELS = {
+    'average': AverageRotationModel,
+    'position': PositionRotationModel,
+}
+
+
 class HardDisk:
     # Hard drive with logical block addressing
+    # Times are in ns (simulation.clock)
     def __init__(self, config):
         self.config = config
         self.tracks_num = config.TRACKS_NUM
         self.sectors_per_track = config.SECTORS_PER_TRACK
         self.total_sectors = self.tracks_num * self.sectors_per_track
 
+        # Durations converted once
+        self.track_seek_time = ms_to_ns(config.TRACK_SEEK_TIME)
+        self.rewind_seek_time = ms_to_ns(config.REWIND_SEEK_TIME)
+        self.sector_access_time = ms_to_ns(config.SECTOR_ACCESS_TIME)
+        self.time_model = TIME_MODELS[config.DISK_TIME_MODEL](config)
+
+        # On-drive cache (models.disk_cache), None - every access goes to the platter
+        self.track_buffer = TrackBuffer(config) if config.DISK_CACHE_SIZE else None
+
         # Current position of the drive mechanism
         self.current_track = 0
         self.current_sector_position = 0
@@ -32,19 +74,23 @@ class HardDisk:
         # Specifies the track number for the logical sector number
         return sector_num // self.sectors_per_track
 
-    def calculate_seek_time(self, from_track: int, to_track: int) -> float:
+    def get_position_on_track(self, sector_num: int) -> int:
+        # Index of the logical sector on its track
+        return sector_num % self.sectors_per_track
+
+    def calculate_seek_time(self, from_track: int, to_track: int) -> int:
         # Calculates seek time. Can be direct or rewind
         # Direct
         direct_distance = abs(to_track - from_track)
-        direct_time = direct_distance * self.config.TRACK_SEEK_TIME
+        direct_time = direct_distance * self.track_seek_time
 
         # Rewind
-        rewind_time = self.config.REWIND_SEEK_TIME + to_track * self.config.TRACK_SEEK_TIME
+        rewind_time = self.rewind_seek_time + to_track * self.track_seek_time
 
         # Choose the shortest
         return min(direct_time, rewind_time)
 
-    def seek_to_track(self, track_num: int) -> float:
+    def seek_to_track(self, track_num: int) -> int:
         # Moves the drive mechanism to the specified track
         seek_time = self.calculate_seek_time(self.current_track, track_num)
         self.current_track = track_num
@@ -52,13 +98,25 @@ class HardDisk:
         self.total_seek_time += seek_time
         return seek_time
 
-    def access_sector(self, sector_num: int, operation: str) -> float:
-        # Performs a sector read/write operation
-        # Returns the total operation time (seek + rotational delay + transfer)
+    def access_sector(self, sector_num: int, operation: str, start_time: int = 0) -> int:
+        # Performs a sector read/write operation started at start_time
+        # Returns the total operation time (seek + rotational delay + transfer),
+        # a read from the drive cache takes only the transfer
         track = self.get_track_for_sector(sector_num)
+        position = self.get_position_on_track(sector_num)
+
+        if self.track_buffer:
+            if operation == 'READ':
+                ready_time = self.track_buffer.lookup(track, position)
+                if ready_time is not None:
+                    # Waits if the read-ahead has not reached the sector yet
+                    return max(0, ready_time - start_time) + self.sector_access_time
+            self.track_buffer.stop_read_ahead(start_time)
+
         seek_time = self.seek_to_track(track)
-        rotational_delay = self.config.ROTATION_DELAY_TIME
-        transfer_time = self.config.SECTOR_ACCESS_TIME
+        rotational_delay = self.time_model.rotational_delay(position, start_time + seek_time)
+        duration = seek_time + rotational_delay + self.sector_access_time
 
-        total_time = seek_time + rotational_delay + transfer_time
-        return total_time
+        if self.track_buffer and operation == 'READ':
+            self.track_buffer.start_read_ahead(track, position, start_time + duration)
+        return duration
@@ -0,0 +1,71 @@
+from typing import List
+
+from models.disk import HardDisk
+
+
+# Layouts of the logical sector space over several disks
+# Every layout maps a logical sector to the disks that hold it and to the physical sector on them
+
+class ConcatLayout:
+    # Disks are joined one after another
+    def __init__(self, config, disks_num: int):
+        self.disks_num = disks_num
+        self.sectors_per_disk = config.TRACKS_NUM * config.SECTORS_PER_TRACK
+        self.mirrored = False
+
+    def disks_for_sector(self, sector_num: int) -> List[int]:
+        return [min(sector_num // self.sectors_per_disk, self.disks_num - 1)]
+
+    def physical_sector(self, disk_index: int, sector_num: int) -> int:
+        return sector_num - disk_index * self.sectors_per_disk
+
+
+class StripeLayout(ConcatLayout):
+    # RAID-0: consecutive stripes of stripe_sectors go to consecutive disks
+    def __init__(self, config, disks_num: int, stripe_sectors: int = 64):
+        super().__init__(config, disks_num)
+        self.stripe_sectors = stripe_sectors
+
+    def disks_for_sector(self, sector_num: int) -> List[int]:
+        return [(sector_num // self.stripe_sectors) % self.disks_num]
+
+    def physical_sector(self, disk_index: int, sector_num: int) -> int:
+        stripe, offset = divmod(sector_num, self.stripe_sectors)
+        return (stripe // self.disks_num) * self.stripe_sectors + offset
+
+
+class MirrorLayout(ConcatLayout):
+    # RAID-1: every disk holds a full copy
+    # Writes go to all disks, a read goes to the disk with the nearest head
+    def __init__(self, config, disks_num: int):
+        super().__init__(config, disks_num)
+        self.mirrored = True
+        self.all_disks = list(range(disks_num))
+
+    def disks_for_sector(self, sector_num: int) -> List[int]:
+        return self.all_disks
+
+    def physical_sector(self, disk_index: int, sector_num: int) -> int:
+        return sector_num
+
+
+LAYOUTS = {
+    'concat': ConcatLayout,
+    'stripe': StripeLayout,
+    'mirror': MirrorLayout,
+}
+
+
+class ArrayDisk(HardDisk):
+    # Member of a disk array, tracks are computed from the physical sector on this disk
+    def __init__(self, config, layout, disk_index: int):
+        super().__init__(config)
+        self.layout = layout
+        self.disk_index = disk_index
+
+    def get_track_for_sector(self, sector_num: int) -> int:
+        physical_sector = self.layout.physical_sector(self.disk_index, sector_num)
+        return physical_sector // self.sectors_per_track
+
+    def get_position_on_track(self, sector_num: int) -> int:
+        return self.layout.physical_sector(self.disk_index, sector_num) % self.sectors_per_track
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from typing import Optional
+
+from simulation.clock import ms_to_ns
+
+
+# On-drive cache (track buffer)
+class TrackBuffer:
+    # Segmented read cache of the drive (config.DISK_CACHE_SIZE KB in DISK_CACHE_SEGMENTS segments)
+    # A read miss fills a segment with the sector and reads ahead the rest of the track
+    # (as much as the segment holds) while the head stays there. The read-ahead
+    # stops when the drive starts the next mechanical access, the segment keeps the
+    # sectors read by then. A read of a buffered sector costs only the transfer.
+    # Writes go to the platter (write-through), the least recently used segment is replaced
+    # Times are in ns
+    def __init__(self, config):
+        self.segments_num = config.DISK_CACHE_SEGMENTS
+        self.sectors_per_track = config.SECTORS_PER_TRACK
+        self.segment_sectors = min(config.SECTORS_PER_TRACK,
+                                   config.DISK_CACHE_SIZE * 1024 // config.SECTOR_SIZE // self.segments_num)
+        self.sector_access_time = ms_to_ns(config.SECTOR_ACCESS_TIME)
+
+        # track -> [first position, end position, time the first sector was read]
+        # Position first + k is in the buffer at time + k * sector_access_time
+        self.segments = OrderedDict()
+        # Track of the segment being read ahead
+        self.filling = None
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, track_num: int, position: int) -> Optional[int]:
+        # Time the sector is in the buffer or None if it is not buffered
+        segment = self.segments.get(track_num)
+        if segment is None or not segment[0] <= position < segment[1]:
+            self.misses += 1
+            return None
+
+        self.segments.move_to_end(track_num)
+        self.hits += 1
+        return segment[2] + (position - segment[0]) * self.sector_access_time
+
+    def stop_read_ahead(self, time_ns: int):
+        # The drive starts a mechanical access, the segment keeps the sectors read by then
+        if self.filling is None:
+            return
+
+        segment = self.segments.get(self.filling)
+        if segment:
+            read = max(0, time_ns - segment[2]) // self.sector_access_time + 1
+            segment[1] = min(segment[1], segment[0] + read)
+        self.filling = None
+
+    def start_read_ahead(self, track_num: int, position: int, time_ns: int):
+        # Sector at position was read at time_ns, the rest of the track follows
+        self.segments[track_num] = [position, min(position + self.segment_sectors, self.sectors_per_track),
+                                    time_ns]
+        self.segments.move_to_end(track_num)
+        if len(self.segments) > self.segments_num:
+            self.segments.popitem(last=False)
+        self.filling = track_num
@@ -1,26 +1,54 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from models.buffer import IO_PRIORITY_BE
 
 
 # User process
 class Process:
     # User process
     # Performs a sequence of sector read/write operations
-    def __init__(self, name: str, operations: List[Tuple[str, int]]):
+    def __init__(self, name: str, operations: List[Tuple[str, int]],
+                 priority: int = 0, deadline: Optional[float] = None,
+                 io_priority: int = IO_PRIORITY_BE):
         # operations: list ('r', sector) or ('w', sector)
+        # Asynchronous I/O: ('ar', sector), ('aw', sector) submit without blocking,
+        # ('wait', None) blocks until all submitted asynchronous I/O is completed
+        # Vectored read: ('rv', [sector, ...]) reads all sectors in one system call
         self.name = name
         self.operations = operations
         self.current_op_index = 0
 
+        # Scheduling: priority is a nice value (-20 highest .. 19 lowest),
+        # deadline is the absolute completion time in us for EDF
+        self.priority = priority
+        self.deadline = deadline
+        self.sched_level = 0  # MLFQ level
+        self.vruntime = 0.0  # CFS virtual runtime
+
+        # I/O priority class of the disk requests (models.buffer IO_PRIORITY_*)
+        self.io_priority = io_priority
+
+        # Arrival time (ns) of a request injected by an open-loop source, None otherwise
+        self.arrival_time = None
+
         # Process state
         self.state = 'READY'  # READY, RUNNING, BLOCKED, TERMINATED
         self.remaining_quantum = 0
         self.blocked_on_sector = None
 
+        # Remaining parts of interrupted work, ns
         self.syscall_remaining_time = 0
         self.syscall_in_progress = None
         self.before_write_remaining_time = 0
         self.after_read_remaining_time = 0
 
+        # Asynchronous I/O
+        self.aio_in_flight = 0
+        self.waiting_aio = False
+
+        # Vectored read: sectors of the current batch already submitted and still in flight
+        self.readv_next_index = 0
+        self.readv_in_flight = 0
+
     def get_next_operation(self) -> tuple[str, int] | None:
         # Returns next operation
         if self.current_op_index < len(self.operations):
@@ -34,6 +62,7 @@ class Process:
         self.syscall_in_progress = None
         self.before_write_remaining_time = 0
         self.after_read_remaining_time = 0
+        self.readv_next_index = 0
 
     def is_finished(self) -> bool:
         # Checks if the process ended all operations
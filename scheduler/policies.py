@@ -0,0 +1,211 @@
+import heapq
+from collections import deque
+from typing import Optional
+
+from models.process import Process
+from simulation.clock import us_to_ns
+
+
+# Scheduling policies of the process scheduler
+# A policy keeps the READY processes and decides which one runs next and for how long
+#
+#   push(process, woken)      - process becomes READY, woken is True after unblock_process
+#   pop()                     - takes the next process to run
+#   quantum(process)          - time slice for the process that starts running
+#   account(process, time_ns) - CPU time used by the running process
+#   expired(process)          - the running process used up its whole quantum
+#   should_preempt(process)   - a READY process must run before the current one
+#
+# All operations are O(1) or O(log n) in the number of READY processes
+# Times are in ns (simulation.clock)
+
+
+class RoundRobinPolicy:
+    # All processes have the same priority, one FIFO queue
+    def __init__(self, config):
+        self.quantum_time = us_to_ns(config.QUANTUM_TIME)
+        self.queue: deque[Process] = deque()
+
+    def push(self, process: Process, woken: bool = False):
+        self.queue.append(process)
+
+    def pop(self) -> Optional[Process]:
+        return self.queue.popleft() if self.queue else None
+
+    def quantum(self, process: Process) -> int:
+        return self.quantum_time
+
+    def account(self, process: Process, time_ns: int):
+        pass
+
+    def expired(self, process: Process):
+        pass
+
+    def should_preempt(self, process: Process) -> bool:
+        return False
+
+    def processes(self) -> list:
+        return list(self.queue)
+
+    def __len__(self):
+        return len(self.queue)
+
+
+class MLFQPolicy:
+    # Multilevel feedback queue
+    # Level 0 has the highest priority and the shortest quantum, every next level doubles it
+    # A process that uses its whole quantum goes one level down,
+    # a process woken after I/O goes one level up (I/O-bound processes stay on top)
+    def __init__(self, config):
+        self.quantum_time = us_to_ns(config.QUANTUM_TIME)
+        self.levels = [deque() for _ in range(config.MLFQ_LEVELS)]
+        self.count = 0
+
+    def push(self, process: Process, woken: bool = False):
+        if woken and process.sched_level > 0:
+            process.sched_level -= 1
+        self.levels[process.sched_level].append(process)
+        self.count += 1
+
+    def pop(self) -> Optional[Process]:
+        # Number of levels is a small constant
+        for level in self.levels:
+            if level:
+                self.count -= 1
+                return level.popleft()
+        return None
+
+    def quantum(self, process: Process) -> int:
+        return self.quantum_time * (2 ** process.sched_level)
+
+    def account(self, process: Process, time_ns: int):
+        pass
+
+    def expired(self, process: Process):
+        if process.sched_level < len(self.levels) - 1:
+            process.sched_level += 1
+
+    def should_preempt(self, process: Process) -> bool:
+        # A READY process on a higher level
+        return any(self.levels[i] for i in range(process.sched_level))
+
+    def processes(self) -> list:
+        return [p for level in self.levels for p in level]
+
+    def __len__(self):
+        return self.count
+
+
+# Weights of nice values -20..19 (every step is ~10% of CPU time)
+NICE_0_WEIGHT = 1024
+
+
+def nice_to_weight(nice: int) -> float:
+    return NICE_0_WEIGHT / (1.25 ** max(-20, min(19, nice)))
+
+
+class CFSPolicy:
+    # Completely fair scheduler
+    # The process with the smallest virtual runtime runs next, virtual runtime grows
+    # slower for processes with higher priority (smaller nice value, Process.priority)
+    # A woken process gets the virtual runtime of the leftmost process minus half of
+    # the target latency, so it runs soon but can not monopolize the CPU
+    def __init__(self, config):
+        self.target_latency = us_to_ns(config.CFS_TARGET_LATENCY)
+        self.min_granularity = us_to_ns(config.CFS_MIN_GRANULARITY)
+        self.heap = []
+        self.sequence = 0
+        self.min_vruntime = 0.0
+        self.total_weight = 0.0
+
+    def push(self, process: Process, woken: bool = False):
+        if woken:
+            process.vruntime = max(process.vruntime, self.min_vruntime - self.target_latency / 2)
+        else:
+            # New process starts from the current minimum
+            process.vruntime = max(process.vruntime, self.min_vruntime)
+
+        weight = nice_to_weight(process.priority)
+        self.total_weight += weight
+        self.sequence += 1
+        heapq.heappush(self.heap, (process.vruntime, self.sequence, process))
+
+    def pop(self) -> Optional[Process]:
+        if not self.heap:
+            return None
+        vruntime, _, process = heapq.heappop(self.heap)
+        self.total_weight -= nice_to_weight(process.priority)
+        self.min_vruntime = max(self.min_vruntime, vruntime)
+        return process
+
+    def quantum(self, process: Process) -> int:
+        # Share of the target latency proportional to the weight
+        weight = nice_to_weight(process.priority)
+        share = int(self.target_latency * weight / (self.total_weight + weight))
+        return max(self.min_granularity, share)
+
+    def account(self, process: Process, time_ns: int):
+        # Virtual runtime is weighted, so it is not a whole number of ns
+        process.vruntime += time_ns * NICE_0_WEIGHT / nice_to_weight(process.priority)
+
+    def expired(self, process: Process):
+        pass
+
+    def should_preempt(self, process: Process) -> bool:
+        # Leftmost process is behind by more than the minimal granularity
+        return bool(self.heap) and \
+            self.heap[0][0] + self.min_granularity < process.vruntime
+
+    def processes(self) -> list:
+        return [process for _, _, process in sorted(self.heap)]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class EDFPolicy:
+    # Earliest deadline first
+    # Process.deadline is the absolute time (us) the process should complete by,
+    # processes without a deadline run after all processes with one, by priority
+    # Among equal deadlines a process woken after I/O goes first
+    def __init__(self, config):
+        self.quantum_time = us_to_ns(config.QUANTUM_TIME)
+        self.heap = []
+        self.sequence = 0
+
+    def _key(self, process: Process) -> tuple:
+        deadline = process.deadline if process.deadline is not None else float('inf')
+        return deadline, process.priority
+
+    def push(self, process: Process, woken: bool = False):
+        self.sequence += 1
+        heapq.heappush(self.heap, (self._key(process), 0 if woken else 1, self.sequence, process))
+
+    def pop(self) -> Optional[Process]:
+        return heapq.heappop(self.heap)[-1] if self.heap else None
+
+    def quantum(self, process: Process) -> int:
+        return self.quantum_time
+
+    def account(self, process: Process, time_ns: int):
+        pass
+
+    def expired(self, process: Process):
+        pass
+
+    def should_preempt(self, process: Process) -> bool:
+        return bool(self.heap) and self.heap[0][0] < self._key(process)
+
+    def processes(self) -> list:
+        return [entry[-1] for entry in sorted(self.heap)]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+POLICIES = {
+    'rr': RoundRobinPolicy,
+    'mlfq': MLFQPolicy,
+    'cfs': CFSPolicy,
+    'edf': EDFPolicy,
+}
@@ -1,21 +1,24 @@
-from typing import List, Optional
-from collections import deque
+from typing import Dict, List, Optional
 from models.process import Process
+from console import get_printer
+from scheduler.policies import POLICIES
+from simulation.clock import us_to_ns
 
 
 # Process scheduler
 class ProcessScheduler:
 
     # Process scheduler
-    # All processes have the same priority
-    # Each process executes its own time quantum
+    # Order of READY processes and their time quanta are defined by the policy
+    # (config.SCHEDULER_POLICY), round-robin by default
 
-    def __init__(self, config):
+    def __init__(self, config, policy=None):
         self.config = config
-        self.quantum_time = config.QUANTUM_TIME  # us
+        self.quantum_time = us_to_ns(config.QUANTUM_TIME)  # ns
+        self.log = get_printer(config)
 
-        # Queue of ready processes (READY)
-        self.ready_queue: deque[Process] = deque()
+        # Ready processes (READY)
+        self.policy = policy or POLICIES[config.SCHEDULER_POLICY](config)
 
         # Current process
         self.current_process: Optional[Process] = None
@@ -23,91 +26,121 @@ class ProcessScheduler:
         # Remaining quantum for current process
         self.remaining_quantum = 0
 
-        # Blocked processes
-        self.blocked_processes: List[Process] = []
+        # The policy wants to preempt the current process, done at the next safe point
+        # (preempt_if_requested), not in the middle of a system call
+        self.preempt_requested = False
+
+        # Blocked processes (dict keeps blocking order and removes in O(1))
+        self.blocked_processes: Dict[Process, None] = {}
 
         # Completed processes
         self.terminated_processes: List[Process] = []
 
     def add_process(self, process: Process):
         # Adds new process
-        print(f"SCHEDULER: Process `{process.name}` was added")
-        print(f"    {process}")
+        self.log(f"SCHEDULER: Process `{process.name}` was added")
+        self.log("   ", process)
         process.state = 'READY'
-        self.ready_queue.append(process)
+        self.policy.push(process)
+
+    @property
+    def ready_queue(self) -> List[Process]:
+        # READY processes in the order they would run
+        return self.policy.processes()
 
     def schedule_next(self) -> Optional[Process]:
-        # Chooses next process from the queue (the first one)
-        if not self.ready_queue:
+        # Chooses next process by the policy
+        next_process = self.policy.pop()
+        if next_process is None:
             return None
 
-        next_process = self.ready_queue.popleft()
         next_process.state = 'RUNNING'
         self.current_process = next_process
+        self.preempt_requested = False
 
-        self.remaining_quantum = self.quantum_time
+        self.remaining_quantum = self.policy.quantum(next_process)
 
         return next_process
 
     def switch_context(self, new_process: Process):
         # Switches context on another process
         if self.current_process:
-            print(f"SCHEDULER: Switch context from process `{self.current_process.name}` " +
+            self.log(f"SCHEDULER: Switch context from process `{self.current_process.name}` " +
                   f"to process `{new_process.name}`")
         else:
-            print(f"SCHEDULER: Switch context to process `{new_process.name}`")
+            self.log(f"SCHEDULER: Switch context to process `{new_process.name}`")
 
         self.current_process = new_process
         new_process.state = 'RUNNING'
 
-    def consume_time(self, time_us: float):
+    def consume_time(self, time_ns: int):
         # Consumes time for the current process
         if self.current_process:
-            self.remaining_quantum -= time_us
-
-            # If quantum is up returns to the queue
-            if self.remaining_quantum <= 0:
-                self._preempt_current_process()
+            self.remaining_quantum -= time_ns
+            self.policy.account(self.current_process, time_ns)
+
+            # If quantum is up or the policy prefers a READY process, the process returns
+            # to the queue at the next safe point
+            if self.remaining_quantum <= 0 or self.policy.should_preempt(self.current_process):
+                self.preempt_requested = True
+
+    def preempt_if_requested(self):
+        # Returns the current process to the queue when its quantum is up
+        # or the policy chose a READY process to run before it
+        # Called between the steps of the process, when its state is saved in the process
+        if not self.preempt_requested:
+            return
+        self.preempt_requested = False
+
+        if not self.current_process:
+            return
+        if self.remaining_quantum <= 0:
+            self.policy.expired(self.current_process)
+            self._preempt_current_process()
+        elif self.policy.should_preempt(self.current_process):
+            self.log(f"SCHEDULER: Preempt process `{self.current_process.name}`")
+            self._preempt_current_process()
 
     def _preempt_current_process(self):
         # Terminates the current process (quantum is over)
         # Returns it to the queue
         if self.current_process and self.current_process.state == 'RUNNING':
             self.current_process.state = 'READY'
-            self.ready_queue.append(self.current_process)
+            self.policy.push(self.current_process)
             self.current_process = None
 
     def block_current_process(self, reason: str = ""):
         # Blocks current process (waits for I/O)
         if self.current_process:
-            print(f"SCHEDULER: Block process `{self.current_process.name}`")
+            self.log(f"SCHEDULER: Block process `{self.current_process.name}`")
             self.current_process.state = 'BLOCKED'
-            self.blocked_processes.append(self.current_process)
+            self.blocked_processes[self.current_process] = None
             self.current_process = None
 
     def unblock_process(self, process: Process):
         # Unlocks current process (I/O is completed)
+        # The policy gives a latency boost to the woken process
         if process in self.blocked_processes:
-            print(f"SCHEDULER: Wake up process `{process.name}`")
-            self.blocked_processes.remove(process)
+            self.log(f"SCHEDULER: Wake up process `{process.name}`")
+            del self.blocked_processes[process]
             process.state = 'READY'
-            self.ready_queue.append(process)
+            self.policy.push(process, woken=True)
 
     def terminate_current_process(self):
         # Terminates current process
         if self.current_process:
-            print(f"SCHEDULER: Process `{self.current_process.name}` exited")
+            self.log(f"SCHEDULER: Process `{self.current_process.name}` exited")
             self.current_process.state = 'TERMINATED'
             self.terminated_processes.append(self.current_process)
             self.current_process = None
 
     def has_ready_processes(self) -> bool:
         # Checks if there are any READY processes
-        return len(self.ready_queue) > 0
+        return len(self.policy) > 0
 
     def has_any_processes(self) -> bool:
         # Checks if there are any active processes (READY OR BLOCKED)
-        return len(self.ready_queue) > 0 or \
+        return len(self.policy) > 0 or \
             len(self.blocked_processes) > 0 or \
             self.current_process is not None
 
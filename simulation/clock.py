@@ -0,0 +1,24 @@
+# Simulation clock
+# Time inside the simulator is an integer number of nanoseconds, so events are ordered
+# exactly however long the run is. Config durations (us, disk parameters in ms) are
+# converted once when the components are created, output and statistics stay in us
+
+NS_PER_US = 1000
+NS_PER_MS = 1_000_000
+
+
+def us_to_ns(time_us: float) -> int:
+    return round(time_us * NS_PER_US)
+
+
+def ms_to_ns(time_ms: float) -> int:
+    return round(time_ms * NS_PER_MS)
+
+
+def ns_to_us(time_ns: int) -> float:
+    return time_ns / NS_PER_US
+
+
+def us(time_ns: int) -> int:
+    # Whole us for the output
+    return time_ns // NS_PER_US
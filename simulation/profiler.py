@@ -0,0 +1,123 @@
+from time import perf_counter_ns
+from typing import List, Optional
+
+
+# Host CPU profile of the simulator components
+# attach() wraps the entry points of the simulator, system calls, cache, process scheduler,
+# drivers, strategies and disks of one simulator instance, every call is counted with its
+# perf_counter_ns time under the stack of profiled calls it was made from
+# Nothing is wrapped until attach(), so a simulator without a profiler runs unchanged
+# detach() removes the wrappers (needed before save_checkpoint or fork)
+#
+# write_collapsed() writes the collapsed stack format of flamegraph.pl / speedscope:
+#   Simulator.run;SystemCalls.request_buffer;LFUCache.lookup_or_reserve 123456
+# (self time in ns of the last frame)
+
+ENTRY_POINTS = {
+    'simulator': ('run', 'fast_forward', '_execute_read', '_execute_write', '_execute_async',
+                  '_execute_readv', '_check_and_handle_interrupt', '_start_next_io', '_flush_cache'),
+    'syscalls': ('sys_read', 'sys_write', 'request_buffer'),
+    'cache': ('lookup_or_reserve', 'access_buffer', 'add_buffer_to_cache', 'release_buffer',
+              'get_state'),
+    'process_scheduler': ('schedule_next', 'switch_context', 'consume_time',
+                          'block_current_process', 'unblock_process'),
+    'driver': ('schedule_io', 'start_next_io', 'complete_next_io'),
+    'drivers': ('schedule_io', 'complete_io', '_start_command'),
+    'strategies': ('add_request', 'get_next_buffer', 'complete_io', 'get_state'),
+    'disks': ('access_sector',),
+}
+
+
+class Profiler:
+    # Calls and host time per stack of profiled calls
+    def __init__(self):
+        # stack (tuple of frame names) -> [calls, total ns, self ns]
+        self.stacks = {}
+
+        # Stacks and time of the children of the calls in progress
+        self._paths = [()]
+        self._children = [0]
+
+        # (object, attribute) of the installed wrappers
+        self._wrapped = []
+
+    def attach(self, simulator, label: Optional[str] = None):
+        # Wraps the entry points of the simulator components
+        # label: root frame of the stacks (e.g. strategy name when several runs share the profile)
+        components = {
+            'simulator': [simulator],
+            'syscalls': [simulator.syscalls],
+            'cache': [simulator.cache],
+            'process_scheduler': [simulator.process_scheduler],
+            'driver': [simulator.driver],
+            'drivers': simulator.driver.drivers,
+            'strategies': simulator.strategies,
+            'disks': simulator.disks,
+        }
+        root = (label,) if label else ()
+
+        for component, objects in components.items():
+            for obj in objects:
+                for method_name in ENTRY_POINTS[component]:
+                    method = getattr(obj, method_name, None)
+                    if method is None or method_name in vars(obj):
+                        continue
+                    setattr(obj, method_name, self._wrap(method, f"{type(obj).__name__}.{method_name}", root))
+                    self._wrapped.append((obj, method_name))
+
+    def detach(self):
+        # Removes the wrappers, collected data is kept
+        for obj, method_name in self._wrapped:
+            delattr(obj, method_name)
+        self._wrapped = []
+
+    def _wrap(self, method, frame: str, root: tuple):
+        paths = self._paths
+        children = self._children
+        stacks = self.stacks
+
+        def profiled(*args, **kwargs):
+            path = (paths[-1] or root) + (frame,)
+            paths.append(path)
+            children.append(0)
+            start = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                paths.pop()
+                child_time = children.pop()
+                children[-1] += elapsed
+
+                entry = stacks.get(path)
+                if entry is None:
+                    entry = stacks[path] = [0, 0, 0]
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] += elapsed - child_time
+
+        return profiled
+
+    def summary(self) -> List[dict]:
+        # Rows per method sorted by self time: calls, total and self time in ns
+        methods = {}
+        for path, (calls, total_time, self_time) in self.stacks.items():
+            frame = path[-1]
+            row = methods.setdefault(frame, {'method': frame, 'calls': 0, 'total_ns': 0, 'self_ns': 0})
+            row['calls'] += calls
+            row['self_ns'] += self_time
+            if frame not in path[:-1]:
+                # Time of a recursive call is already in the outer one
+                row['total_ns'] += total_time
+
+        return sorted(methods.values(), key=lambda row: row['self_ns'], reverse=True)
+
+    def collapsed(self) -> List[str]:
+        # Lines of the collapsed stack format, self time in ns
+        return [f"{';'.join(path)} {self_time}"
+                for path, (_, _, self_time) in sorted(self.stacks.items()) if self_time > 0]
+
+    def write_collapsed(self, path: str):
+        with open(path, 'w') as f:
+            for line in self.collapsed():
+                f.write(line + '\n')
@@ -0,0 +1,277 @@
+import os
+import struct
+import zlib
+from array import array
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+
+from simulation.clock import us_to_ns, ns_to_us, us
+from simulation.stats import percentile
+
+
+# Binary trace of the simulator decisions
+#
+# Every event is (kind, time ns, a, b, c):
+#   SCHEDULE   request added to the driver       a=sector  b=operation  c=disk
+#   DISPATCH   buffer picked by get_next_buffer  a=sector  b=operation  c=disk
+#   INTERRUPT  I/O completed                     a=sector  b=operation  c=disk
+#   EVICT      eviction victim                   a=sector  b=modified   c=-1
+#   SWITCH     context switch                    a=process b=-1         c=-1
+#   EXIT       process exited                    a=process b=-1         c=-1
+#   RUN        start of a recorded run           a=-1      b=-1         c=-1
+# operation: 0 - READ, 1 - WRITE, process: index in the process names table
+# A file holds one run unless the recorder appends (append=True), every run starts
+# with a RUN event. Traces without RUN events are one run
+#
+# File: magic (4 bytes) + format version (1 byte), then blocks, new blocks are only appended
+# Block: event count, names of processes first seen in the block,
+# then every column zlib-compressed (kinds uint8, times int64, a, b, c int64)
+# Version 1 traces (times float64 in us) are read too
+TRACE_MAGIC = b'HDBT'
+TRACE_VERSION = 2
+
+EVENT_SCHEDULE = 0
+EVENT_DISPATCH = 1
+EVENT_INTERRUPT = 2
+EVENT_EVICT = 3
+EVENT_SWITCH = 4
+EVENT_EXIT = 5
+EVENT_RUN = 6
+
+EVENT_NAMES = ['SCHEDULE', 'DISPATCH', 'INTERRUPT', 'EVICT', 'SWITCH', 'EXIT', 'RUN']
+
+OPERATION_CODES = {'READ': 0, 'WRITE': 1}
+
+_COUNT = struct.Struct('<I')
+
+
+class TraceRecorder:
+    # Collects events in columns and appends them to the file block by block
+    # A non-empty file is refused unless append is set, then the run is added after
+    # the runs already in the file
+    def __init__(self, path: str, block_size: int = 65536, append: bool = False):
+        self.path = path
+        self.block_size = block_size
+
+        if not append and os.path.exists(path) and os.path.getsize(path) > 0:
+            raise FileExistsError(f"Trace file `{path}` is not empty (record with append to add a run)")
+
+        self.process_ids = {}
+        self.new_names: List[str] = []
+        self._reset_columns()
+        self._open()
+        self.record(EVENT_RUN, 0)
+
+    def _open(self):
+        self.file = open(self.path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(TRACE_MAGIC + bytes([TRACE_VERSION]))
+        else:
+            # Process ids continue the table of the existing trace
+            _, names = read_trace(self.path)
+            self.process_ids = {name: i for i, name in enumerate(names)}
+
+    def _reset_columns(self):
+        self.kinds = array('B')
+        self.times = array('q')
+        self.a = array('q')
+        self.b = array('q')
+        self.c = array('q')
+
+    def record(self, kind: int, time: int, a: int = -1, b: int = -1, c: int = -1):
+        self.kinds.append(kind)
+        self.times.append(time)
+        self.a.append(a)
+        self.b.append(b)
+        self.c.append(c)
+
+        if len(self.kinds) >= self.block_size:
+            self.flush()
+
+    def process_id(self, name: str) -> int:
+        # Index of the process in the names table
+        process_id = self.process_ids.get(name)
+        if process_id is None:
+            process_id = self.process_ids[name] = len(self.process_ids)
+            self.new_names.append(name)
+        return process_id
+
+    def flush(self):
+        # Appends collected events as one block
+        if not self.kinds:
+            return
+
+        names = '\n'.join(self.new_names).encode()
+        parts = [_COUNT.pack(len(self.kinds)), _COUNT.pack(len(names)), names]
+        for column in (self.kinds, self.times, self.a, self.b, self.c):
+            data = zlib.compress(column.tobytes())
+            parts.append(_COUNT.pack(len(data)))
+            parts.append(data)
+
+        self.file.write(b''.join(parts))
+        self.file.flush()
+
+        self.new_names = []
+        self._reset_columns()
+
+    def close(self):
+        if self.file:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __reduce__(self):
+        # Snapshots do not take the recorder: it is restored as None (detached),
+        # recording goes on only after attach_recorder
+        return _detached_recorder, ()
+
+
+def _detached_recorder():
+    return None
+
+
+def read_trace(path: str) -> Tuple[List[tuple], List[str]]:
+    # Reads the whole trace
+    # Returns (events [(kind, time, a, b, c)], process names)
+    events = []
+    names = []
+    for block_events, block_names in iter_blocks(path):
+        events.extend(block_events)
+        names.extend(block_names)
+    return events, names
+
+
+def _read_exact(f, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated simulator trace")
+    return data
+
+
+def iter_blocks(path: str) -> Iterator[Tuple[list, List[str]]]:
+    # Yields (events, new process names) of every block, the file is read block by block
+    with open(path, 'rb') as f:
+        header = f.read(len(TRACE_MAGIC) + 1)
+        if header[:len(TRACE_MAGIC)] != TRACE_MAGIC or len(header) <= len(TRACE_MAGIC):
+            raise ValueError("Not a simulator trace")
+        version = header[len(TRACE_MAGIC)]
+        if version not in (1, TRACE_VERSION):
+            raise ValueError(f"Unsupported trace version {version}")
+        time_typecode = 'd' if version == 1 else 'q'
+
+        while True:
+            block_header = f.read(8)
+            if not block_header:
+                return
+            if len(block_header) != 8:
+                raise ValueError("Truncated simulator trace")
+            count, names_len = struct.unpack('<II', block_header)
+            names = _read_exact(f, names_len).decode().split('\n') if names_len else []
+
+            columns = []
+            for typecode in ('B', time_typecode, 'q', 'q', 'q'):
+                (size,) = _COUNT.unpack(_read_exact(f, 4))
+                column = array(typecode)
+                column.frombytes(zlib.decompress(_read_exact(f, size)))
+                columns.append(column)
+
+            if version == 1:
+                columns[1] = [us_to_ns(time) for time in columns[1]]
+
+            yield list(zip(*columns)), names
+
+
+def split_runs(events: List[tuple]) -> List[List[tuple]]:
+    # Events of every run of the trace (a new run starts at every RUN event)
+    runs = [[]]
+    for event in events:
+        if event[0] == EVENT_RUN:
+            if runs[-1]:
+                runs.append([])
+            continue
+        runs[-1].append(event)
+    return runs
+
+
+def replay_metrics(path: str, run: int = -1) -> dict:
+    # Rebuilds run metrics from the trace without simulation, times in us
+    # run: index of the run in the trace, the last one by default
+    events, names = read_trace(path)
+    events = split_runs(events)[run]
+
+    counts = [0] * len(EVENT_NAMES)
+    scheduled = {}  # (sector, operation, disk) -> deque of schedule times
+    latencies = ([], [])
+    exits = {}
+    dirty_evictions = 0
+    last_time = 0
+
+    for kind, time, a, b, c in events:
+        counts[kind] += 1
+        last_time = max(last_time, time)
+
+        if kind == EVENT_SCHEDULE:
+            scheduled.setdefault((a, b, c), deque()).append(time)
+        elif kind == EVENT_INTERRUPT:
+            times = scheduled.get((a, b, c))
+            if times:
+                latencies[b].append(time - times.popleft())
+        elif kind == EVENT_EVICT:
+            dirty_evictions += b
+        elif kind == EVENT_EXIT:
+            exits[names[a]] = time
+
+    read_latencies = sorted(latencies[0])
+    write_latencies = sorted(latencies[1])
+
+    return {
+        'events': len(events),
+        'last_event_time': ns_to_us(last_time),
+        'dispatched': counts[EVENT_DISPATCH],
+        'reads': len(read_latencies),
+        'writes': len(write_latencies),
+        'evictions': counts[EVENT_EVICT],
+        'dirty_evictions': dirty_evictions,
+        'context_switches': counts[EVENT_SWITCH],
+        'processes_exited': len(exits),
+        'last_exit_time': ns_to_us(max(exits.values())) if exits else 0.0,
+        'read_latency_p50': ns_to_us(percentile(read_latencies, 0.5)),
+        'read_latency_p99': ns_to_us(percentile(read_latencies, 0.99)),
+        'read_latency_max': ns_to_us(read_latencies[-1]) if read_latencies else 0.0,
+        'write_latency_p99': ns_to_us(percentile(write_latencies, 0.99)),
+    }
+
+
+def first_difference(path_a: str, path_b: str) -> Optional[int]:
+    # Index of the first event that differs between two traces, None if they are equal
+    events_a, names_a = read_trace(path_a)
+    events_b, names_b = read_trace(path_b)
+
+    for i, (event_a, event_b) in enumerate(zip(events_a, events_b)):
+        if event_a != event_b:
+            return i
+
+    if len(events_a) != len(events_b):
+        return min(len(events_a), len(events_b))
+    if names_a != names_b:
+        return 0
+    return None
+
+
+def format_event(event: tuple, names: List[str]) -> str:
+    # Readable form of the event
+    kind, time, a, b, c = event
+    if kind == EVENT_RUN:
+        return "RUN start"
+    if kind in (EVENT_SWITCH, EVENT_EXIT):
+        return f"{us(time)} us {EVENT_NAMES[kind]} `{names[a]}`"
+    if kind == EVENT_EVICT:
+        return f"{us(time)} us EVICT sector {a}{' (modified)' if b else ''}"
+    operation = 'READ' if b == 0 else 'WRITE'
+    return f"{us(time)} us {EVENT_NAMES[kind]} sector {a} ({operation}) disk {c}"
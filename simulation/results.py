@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+
+
+# Content-addressed cache of simulation results on disk
+# A run is identified by the hash of everything it depends on: config parameters,
+# digests of the workload files, the run options and the simulator source code,
+# so a changed strategy or cache class never returns stale results
+# Every result is a small JSON file <key>.json, the least recently used ones are
+# removed when the directory grows over max_bytes (file mtime is the last use)
+
+RESULT_CACHE_VERSION = 1
+
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_PACKAGES = ('cache', 'driver', 'kernel', 'models', 'scheduler',
+                   'simulation', 'strategies', 'workload')
+SOURCE_MODULES = ('config.py',)
+
+_code_digest = None
+
+
+def code_digest() -> str:
+    # Digest of the simulator sources, computed once per process
+    global _code_digest
+    if _code_digest is None:
+        paths = [os.path.join(SOURCE_ROOT, name) for name in SOURCE_MODULES]
+        for package in SOURCE_PACKAGES:
+            directory = os.path.join(SOURCE_ROOT, package)
+            paths.extend(os.path.join(directory, name) for name in os.listdir(directory)
+                         if name.endswith('.py'))
+
+        digest = hashlib.sha256()
+        for path in sorted(paths):
+            digest.update(os.path.relpath(path, SOURCE_ROOT).encode())
+            digest.update(file_digest(path).encode())
+        _code_digest = digest.hexdigest()
+    return _code_digest
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    # SHA-256 of the file contents
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def result_key(config, strategy: str, cache: str, run: dict, files: tuple = ()) -> str:
+    # Key of a run: config parameters, strategy and cache names, run options (JSON values),
+    # contents of the input files and the simulator code
+    description = {
+        'version': RESULT_CACHE_VERSION,
+        'code': code_digest(),
+        'config': config.parameters(),
+        'strategy': strategy,
+        'cache': cache,
+        'run': run,
+        'files': [file_digest(path) for path in files],
+    }
+    text = json.dumps(description, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultCache:
+    # Stored results (dicts of JSON values) by key, LRU eviction by total size
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024):
+        if max_bytes <= 0:
+            raise ValueError("Result cache size must be positive")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key: str) -> Optional[dict]:
+        # Stored result or None, a hit makes the entry most recently used
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: dict):
+        # Stores the result atomically, then evicts the least recently used entries
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(result, f)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        # Removes the least recently used entries until the total size fits max_bytes
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
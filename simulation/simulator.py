@@ -1,23 +1,49 @@
+import heapq
+
 from models.process import Process
 from models.disk import HardDisk
 from cache.lfu_cache import LFUCache
 from driver.disk_driver import DiskDriver
+from driver.disk_array import DiskArray
+from models.disk_array import ArrayDisk
 from scheduler.process_scheduler import ProcessScheduler
-from kernel.syscalls import SystemCalls
+from kernel.syscalls import (SystemCalls, COMPLETED, HIT, IN_IO_WRITE, NO_BUFFER,
+                             DEFERRED)
+from cache.base_cache import HIT as CACHE_HIT
+from simulation import snapshot
+from simulation.clock import NS_PER_MS, us_to_ns, ns_to_us, us
+from simulation.stats import percentile
+from simulation.recorder import EVENT_SWITCH, EVENT_EXIT
+from console import get_printer
 
 
 class Simulator:
     # Event-driven OS simulator
 
-    def __init__(self, config, strategy_class):
+    def __init__(self, config, strategy_class, cache_class=LFUCache, layout=None):
+        # layout: disk array layout (models.disk_array), None for a single disk
         self.config = config
-        self.current_time = 0.0
+        self.current_time = 0  # ns (simulation.clock)
+        self.log = get_printer(config)
+
+        # Durations of the user mode work and interrupt handler, ns
+        self.before_writing_time = us_to_ns(config.BEFORE_WRITING_TIME)
+        self.after_reading_time = us_to_ns(config.AFTER_READING_TIME)
+        self.disk_intr_time = us_to_ns(config.DISK_INTR_TIME)
+
+        # Disks, every disk has its own strategy instance and driver
+        if layout is None:
+            self.disks = [HardDisk(config)]
+        else:
+            self.disks = [ArrayDisk(config, layout, i) for i in range(layout.disks_num)]
+        self.strategies = [strategy_class(disk, config) for disk in self.disks]
+        drivers = [DiskDriver(disk, strategy) for disk, strategy in zip(self.disks, self.strategies)]
 
         # System components
-        self.disk = HardDisk(config)
-        self.cache = LFUCache(config)
-        self.strategy = strategy_class(self.disk, config)
-        self.driver = DiskDriver(self.disk, self.strategy)
+        self.disk = self.disks[0]
+        self.cache = cache_class(config)
+        self.strategy = self.strategies[0]
+        self.driver = DiskArray(drivers, layout)
         self.process_scheduler = ProcessScheduler(config)
         self.syscalls = SystemCalls(config, self.cache, self.driver, self.process_scheduler)
 
@@ -26,42 +52,235 @@ class Simulator:
         # Process status tracking
         self.waiting_for_write_completion = {}  # process -> sector after write
 
+        # Main cycle state (kept between run() calls so a paused run can be resumed)
+        self.started = False
+        self.iteration = 0
+        self.max_iterations = 1000
+
+        # Trace recorder (simulation.recorder), None - not recording
+        self.recorder = None
+
+        # Open-loop request sources (workload.arrivals), next request of every source:
+        # heap of (arrival_time ns, source index, request)
+        self.sources = []
+        self.next_arrivals = []
+        self.injected = 0
+        self.response_times = []  # ns from arrival to exit of injected requests
+
+        # Warm-up (fast_forward): consumed operations and write-backs of modified victims
+        self.warmup_operations = 0
+        self.warmup_write_backs = 0
+
     def add_process(self, process: Process):
         # Adds process
         self.process_scheduler.add_process(process)
 
-    def run(self):
-        # Main cycle
-        print()
-        print("Settings:")
-        self._print_settings()
-        print()
+    def add_source(self, source):
+        # Adds open-loop request source, its requests are injected at their arrival times
+        self.sources.append(source)
+        self._schedule_arrival(len(self.sources) - 1)
+
+    def _schedule_arrival(self, index: int):
+        request = self.sources[index].next_request()
+        if request is not None:
+            heapq.heappush(self.next_arrivals, (us_to_ns(request[0]), index, request))
+
+    def _inject_arrivals(self):
+        # Every arrived request becomes a process with one operation
+        while self.next_arrivals and self.next_arrivals[0][0] <= self.current_time:
+            arrival_time, index, (_, op_type, sector_num) = heapq.heappop(self.next_arrivals)
+            source = self.sources[index]
+
+            self.injected += 1
+            process = Process(f"{source.name}{self.injected}", [(op_type, sector_num)])
+            process.arrival_time = arrival_time
+            self.add_process(process)
+
+            self._schedule_arrival(index)
+
+    def attach_recorder(self, recorder):
+        # Records scheduling decisions of the simulator, driver and system calls
+        # (None stops recording)
+        self.recorder = recorder
+        self.syscalls.recorder = recorder
+        for driver in self.driver.drivers:
+            driver.recorder = recorder
+
+    def fast_forward(self, num_operations: int, through_strategy: bool = False) -> int:
+        # Warm-up phase before the run: feeds the first operations of the ready processes
+        # (round-robin) into the cache without timing
+        # Misses take their buffer as in a system call (lookup_or_reserve, _use_victim):
+        # a modified victim is written back through the driver, served at once and counted
+        # in warmup_write_backs. With through_strategy the reads of misses also pass the driver,
+        # so the disk head and strategy state are warmed up too
+        # Returns number of consumed operations
+        if (self.started or self.current_time or self.driver.has_pending_requests()
+                or self.driver.has_active_io()):
+            raise ValueError("fast_forward() is only possible before the run, with no queued I/O")
+
+        active = [p for p in self.process_scheduler.ready_queue if not p.is_finished()]
+        consumed = 0
+
+        while active and consumed < num_operations:
+            for process in active:
+                if consumed >= num_operations:
+                    break
+
+                op_type, sector_num = process.get_next_operation()
 
-        iteration = 0
+                if op_type == 'wait':
+                    sectors = []
+                elif op_type == 'rv':
+                    sectors = sector_num
+                else:
+                    sectors = [sector_num]
+
+                for sector_num in sectors:
+                    buffer = self._fast_forward_buffer(sector_num, through_strategy)
+                    if op_type in ('w', 'aw'):
+                        buffer.mark_modified()
+
+                process.advance_operation()
+                consumed += 1
+
+            active = [p for p in active if not p.is_finished()]
+
+        self.warmup_operations += consumed
+        return consumed
+
+    def _fast_forward_buffer(self, sector_num: int, through_strategy: bool):
+        # Buffer with the sector for the warm-up, the miss path of request_buffer
+        # with the I/O served at once
+        state, victim = self.cache.lookup_or_reserve(sector_num)
+        if state == CACHE_HIT:
+            return victim
+
+        buffer = self.syscalls._use_victim(victim, 0)
+        if buffer is None:
+            # Modified victim: written back, then reused
+            self.warmup_write_backs += 1
+            self.driver.serve_without_timing()
+            self.cache.release_buffer(victim)
+            _, buffer = self.cache.lookup_or_reserve(sector_num)
+
+        buffer.load_sector(sector_num, self.driver.get_track_for_sector(sector_num))
+        if through_strategy:
+            self.driver.schedule_io(buffer, 'READ')
+            self.driver.serve_without_timing()
+        self.cache.add_buffer_to_cache(buffer)
+        return buffer
+
+    def get_stats(self) -> dict:
+        # Run statistics, latencies of disk requests are in us from scheduling to completion
+        read_latencies = sorted(t for d in self.driver.drivers for t in d.io_latencies['READ'])
+        write_latencies = sorted(t for d in self.driver.drivers for t in d.io_latencies['WRITE'])
+
+        # Times in us, seek time in ms
+        stats = {
+            'total_time': ns_to_us(self.current_time),
+            'total_seeks': sum(disk.total_seeks for disk in self.disks),
+            'total_seek_time': sum(disk.total_seek_time for disk in self.disks) / NS_PER_MS,
+            'iterations': self.iteration,
+            'completed': self.process_scheduler.all_processes_completed(),
+            'read_latency_p50': ns_to_us(percentile(read_latencies, 0.5)),
+            'read_latency_p99': ns_to_us(percentile(read_latencies, 0.99)),
+            'read_latency_max': ns_to_us(read_latencies[-1]) if read_latencies else 0.0,
+            'write_latency_p99': ns_to_us(percentile(write_latencies, 0.99)),
+        }
+
+        if self.warmup_operations:
+            stats['warmup_write_backs'] = self.warmup_write_backs
+
+        track_buffers = [disk.track_buffer for disk in self.disks if disk.track_buffer]
+        if track_buffers:
+            # On-drive cache, reads served from it and reads that went to the platter
+            stats.update({
+                'disk_cache_hits': sum(b.hits for b in track_buffers),
+                'disk_cache_misses': sum(b.misses for b in track_buffers),
+            })
+
+        if self.sources:
+            # Open-loop requests: response time from arrival to completion
+            response_times = sorted(self.response_times)
+            measured_time = self.current_time or 1
+            stats.update({
+                'requests': len(response_times),
+                'throughput': len(response_times) / measured_time * 1_000_000_000,
+                'response_time_mean': ns_to_us(sum(response_times) / len(response_times)) if response_times else 0.0,
+                'response_time_p50': ns_to_us(percentile(response_times, 0.5)),
+                'response_time_p99': ns_to_us(percentile(response_times, 0.99)),
+            })
+        return stats
+
+    def save_checkpoint(self, path: str):
+        # Saves the full simulator state to a binary snapshot
+        snapshot.save_snapshot(self, path)
+
+    @staticmethod
+    def load_checkpoint(path: str) -> 'Simulator':
+        # Restores simulator from a snapshot, run() continues from the saved point
+        # Snapshots do not keep the trace recorder: attach_recorder to record the rest of the run
+        return snapshot.load_snapshot(path)
+
+    def fork(self, recorder=None) -> 'Simulator':
+        # Independent copy of the current state for what-if runs
+        # The copy does not write to the trace of this simulator, it records to recorder if given
+        copy = snapshot.loads(snapshot.dumps(self))
+        if recorder:
+            copy.attach_recorder(recorder)
+        return copy
+
+    def run(self, until_time: int = None) -> bool:
+        # Main cycle
+        # If until_time (ns, like current_time) is set, pauses when simulated time reaches it,
+        # run() again resumes
+        # Returns True when all processes have completed and the cache is flushed,
+        # False when paused or stopped by max_iterations (counted over all run() calls)
+        if not self.started:
+            self.log()
+            self.log("Settings:")
+            self._print_settings()
+            self.log()
+            self.started = True
 
         while True:
-            iteration += 1
-            if iteration > 1000:
-                print("ERROR: Too many iterations")
+            if until_time is not None and self.current_time >= until_time:
+                self.log(f"SCHEDULER: {us(self.current_time)} us (PAUSED)")
+                return False
+
+            self.iteration += 1
+            if self.iteration > self.max_iterations:
+                self.log("ERROR: Too many iterations")
+                completed = False
                 break
 
-            print(f"SCHEDULER: {int(self.current_time)} us (NEXT ITERATION)")
+            self.log(f"SCHEDULER: {us(self.current_time)} us (NEXT ITERATION)")
+
+            if self.next_arrivals:
+                self._inject_arrivals()
 
             if self._check_and_handle_interrupt():
                 continue
 
+            # A process preempted by the policy gives way between its steps
+            self.process_scheduler.preempt_if_requested()
+
             # Chooses process
             if not self.process_scheduler.current_process:
                 if self.process_scheduler.has_ready_processes():
                     next_proc = self.process_scheduler.schedule_next()
                     self.process_scheduler.switch_context(next_proc)
-                elif self.process_scheduler.all_processes_completed():
-                    print("SCHEDULER: RunQ is empty")
-                    print("SCHEDULER: All processes completed")
+                    if self.recorder:
+                        self.recorder.record(EVENT_SWITCH, self.current_time,
+                                             self.recorder.process_id(next_proc.name))
+                elif self.process_scheduler.all_processes_completed() and not self.next_arrivals:
+                    self.log("SCHEDULER: RunQ is empty")
+                    self.log("SCHEDULER: All processes completed")
                     self._flush_cache()
+                    completed = True
                     break
                 else:
-                    print("SCHEDULER: RunQ is empty")
+                    self.log("SCHEDULER: RunQ is empty")
                     self._idle_until_interrupt()
                     continue
 
@@ -70,6 +289,11 @@ class Simulator:
             operation = current.get_next_operation()
 
             if operation is None:
+                if current.arrival_time is not None:
+                    self.response_times.append(self.current_time - current.arrival_time)
+                if self.recorder:
+                    self.recorder.record(EVENT_EXIT, self.current_time,
+                                         self.recorder.process_id(current.name))
                 self.process_scheduler.terminate_current_process()
                 continue
 
@@ -79,10 +303,20 @@ class Simulator:
                 self._execute_read(current, sector_num)
             elif op_type == 'w':
                 self._execute_write(current, sector_num)
+            elif op_type in ('ar', 'aw'):
+                self._execute_async(current, op_type, sector_num)
+            elif op_type == 'wait':
+                self._execute_wait(current)
+            elif op_type == 'rv':
+                self._execute_readv(current, sector_num)
 
-        print()
-        print(f"SCHEDULER: {int(self.current_time)} us (NEXT ITERATION)")
-        print("SCHEDULER: Scheduler has nothing to do, exit")
+        self.log()
+        self.log(f"SCHEDULER: {us(self.current_time)} us (NEXT ITERATION)")
+        self.log("SCHEDULER: Scheduler has nothing to do, exit")
+
+        if self.recorder:
+            self.recorder.flush()
+        return completed
 
     def _execute_read(self, process: Process, sector_num: int):
         # Execute read operation
@@ -92,19 +326,19 @@ class Simulator:
         if process.syscall_in_progress == ('read', sector_num):
             return self._continue_syscall_read(process, sector_num)
 
-        print(f"SCHEDULER: User mode for process `{process.name}`")
-        print(f"SCHEDULER: Process `{process.name}` invoked read() for sector {sector_num}")
+        self.log(f"SCHEDULER: User mode for process `{process.name}`")
+        self.log(f"SCHEDULER: Process `{process.name}` invoked read() for sector {sector_num}")
 
         return self._start_syscall_read(process, sector_num)
 
     def _start_syscall_read(self, process: Process, sector_num: int):
-        syscall_time = self.config.SYSCALL_READ_TIME
+        syscall_time = self.syscalls.syscall_read_time
 
         if self._will_interrupt_during(syscall_time):
             time_until_interrupt = self.next_disk_interrupt_time - self.current_time
 
-            print(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
-            print(f"... worked for {int(time_until_interrupt)} us in system call (interrupted)")
+            self.log(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
+            self.log(f"... worked for {us(time_until_interrupt)} us in system call (interrupted)")
 
             self.current_time = self.next_disk_interrupt_time
             self.process_scheduler.consume_time(time_until_interrupt)
@@ -120,14 +354,7 @@ class Simulator:
         self.current_time += time_spent
         self.process_scheduler.consume_time(time_spent)
 
-        if blocked:
-            process.blocked_on_sector = sector_num
-            process.syscall_in_progress = None
-            self.process_scheduler.block_current_process()
-            self._start_next_io()
-        else:
-            process.syscall_in_progress = None
-            self._start_after_read_processing(process)
+        self._end_syscall_read(process, sector_num, not blocked)
 
     def _continue_syscall_read(self, process: Process, sector_num: int):
         remaining_time = process.syscall_remaining_time
@@ -135,8 +362,8 @@ class Simulator:
         if self._will_interrupt_during(remaining_time):
             time_until_interrupt = self.next_disk_interrupt_time - self.current_time
 
-            print(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
-            print(f"... worked for {int(time_until_interrupt)} us in system call (interrupted)")
+            self.log(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
+            self.log(f"... worked for {us(time_until_interrupt)} us in system call (interrupted)")
 
             self.current_time = self.next_disk_interrupt_time
             self.process_scheduler.consume_time(time_until_interrupt)
@@ -144,61 +371,41 @@ class Simulator:
             process.syscall_remaining_time = remaining_time - time_until_interrupt
             return
 
-        print(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
-        print(f"... worked for {int(remaining_time)} us in system call, request buffer cache")
+        self.log(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
+        self.log(f"... worked for {us(remaining_time)} us in system call, request buffer cache")
 
         self.current_time += remaining_time
         self.process_scheduler.consume_time(remaining_time)
 
         process.syscall_remaining_time = 0
 
-        buffer = self.cache.find_buffer(sector_num)
+        outcome = self.syscalls.request_buffer(process, 'r', sector_num, self.current_time)
+        self._end_syscall_read(process, sector_num, outcome in COMPLETED)
 
-        if buffer:
-            print(f"CACHE: Buffer {buffer} found in cache")
-            self.cache.access_buffer(sector_num, self.driver.disk.get_track_for_sector(sector_num))
-            print(self.cache.get_state_string())
+    def _end_syscall_read(self, process: Process, sector_num: int, completed: bool):
+        # The data is in the cache - user mode processing, otherwise waits for I/O
+        process.syscall_in_progress = None
 
-            process.syscall_in_progress = None
+        if completed:
             self._start_after_read_processing(process)
-        else:
-            print(f"CACHE: Buffer for sector {sector_num} not found in cache")
-
-            if self.driver.is_buffer_in_io(sector_num):
-                print(f"SCHEDULER: But this buffer is scheduled for I/O (READ)")
-                process.blocked_on_sector = sector_num
-                process.syscall_in_progress = None
-                self.process_scheduler.block_current_process()
-                return
-
-            free_buffer = self._get_free_buffer_for_read(sector_num)
-            if free_buffer is None:
-                process.blocked_on_sector = sector_num
-                process.syscall_in_progress = None
-                self.process_scheduler.block_current_process()
-                self._start_next_io()
-                return
+            return
 
-            track_num = self.driver.disk.get_track_for_sector(sector_num)
-            free_buffer.load_sector(sector_num, track_num)
-            self.driver.schedule_io(free_buffer, 'READ')
-
-            process.blocked_on_sector = sector_num
-            process.syscall_in_progress = None
-            self.process_scheduler.block_current_process()
-            self._start_next_io()
+        process.blocked_on_sector = sector_num
+        self.driver.add_waiter(sector_num, process, None)
+        self.process_scheduler.block_current_process()
+        self._start_next_io()
 
     def _start_after_read_processing(self, process: Process):
-        print()
-        print(f"SCHEDULER: {int(self.current_time)} us (NEXT ITERATION)")
-        print(f"SCHEDULER: User mode for process `{process.name}`")
+        self.log()
+        self.log(f"SCHEDULER: {us(self.current_time)} us (NEXT ITERATION)")
+        self.log(f"SCHEDULER: User mode for process `{process.name}`")
 
-        time_after = self.config.AFTER_READING_TIME
+        time_after = self.after_reading_time
 
         if self._will_interrupt_during(time_after):
             time_until_interrupt = self.next_disk_interrupt_time - self.current_time
 
-            print(f"... worked for {int(time_until_interrupt)} us in user mode (interrupted)")
+            self.log(f"... worked for {us(time_until_interrupt)} us in user mode (interrupted)")
 
             self.current_time = self.next_disk_interrupt_time
             self.process_scheduler.consume_time(time_until_interrupt)
@@ -206,7 +413,7 @@ class Simulator:
             process.after_read_remaining_time = time_after - time_until_interrupt
             return
 
-        print(f"... worked for {int(time_after)} us in user mode (completed)")
+        self.log(f"... worked for {us(time_after)} us in user mode (completed)")
 
         self.current_time += time_after
         self.process_scheduler.consume_time(time_after)
@@ -216,12 +423,12 @@ class Simulator:
     def _continue_after_read_processing(self, process: Process):
         remaining_time = process.after_read_remaining_time
 
-        print(f"SCHEDULER: User mode for process `{process.name}`")
+        self.log(f"SCHEDULER: User mode for process `{process.name}`")
 
         if self._will_interrupt_during(remaining_time):
             time_until_interrupt = self.next_disk_interrupt_time - self.current_time
 
-            print(f"... worked for {int(time_until_interrupt)} us in user mode (interrupted)")
+            self.log(f"... worked for {us(time_until_interrupt)} us in user mode (interrupted)")
 
             self.current_time = self.next_disk_interrupt_time
             self.process_scheduler.consume_time(time_until_interrupt)
@@ -229,7 +436,7 @@ class Simulator:
             process.after_read_remaining_time = remaining_time - time_until_interrupt
             return
 
-        print(f"... worked for {int(remaining_time)} us in user mode (completed)")
+        self.log(f"... worked for {us(remaining_time)} us in user mode (completed)")
 
         self.current_time += remaining_time
         self.process_scheduler.consume_time(remaining_time)
@@ -244,14 +451,14 @@ class Simulator:
         if process.before_write_remaining_time > 0:
             return self._continue_before_write_processing(process, sector_num)
 
-        print(f"SCHEDULER: User mode for process `{process.name}`")
+        self.log(f"SCHEDULER: User mode for process `{process.name}`")
 
-        time_before = self.config.BEFORE_WRITING_TIME
+        time_before = self.before_writing_time
 
         if self._will_interrupt_during(time_before):
             time_until_interrupt = self.next_disk_interrupt_time - self.current_time
 
-            print(f"... worked for {int(time_until_interrupt)} us in user mode (interrupted)")
+            self.log(f"... worked for {us(time_until_interrupt)} us in user mode (interrupted)")
 
             self.current_time = self.next_disk_interrupt_time
             self.process_scheduler.consume_time(time_until_interrupt)
@@ -259,7 +466,7 @@ class Simulator:
             process.before_write_remaining_time = time_before - time_until_interrupt
             return
 
-        print(f"... worked for {int(time_before)} us in user mode (completed)")
+        self.log(f"... worked for {us(time_before)} us in user mode (completed)")
 
         self.current_time += time_before
         self.process_scheduler.consume_time(time_before)
@@ -269,12 +476,12 @@ class Simulator:
     def _continue_before_write_processing(self, process: Process, sector_num: int):
         remaining_time = process.before_write_remaining_time
 
-        print(f"SCHEDULER: User mode for process `{process.name}`")
+        self.log(f"SCHEDULER: User mode for process `{process.name}`")
 
         if self._will_interrupt_during(remaining_time):
             time_until_interrupt = self.next_disk_interrupt_time - self.current_time
 
-            print(f"... worked for {int(time_until_interrupt)} us in user mode (interrupted)")
+            self.log(f"... worked for {us(time_until_interrupt)} us in user mode (interrupted)")
 
             self.current_time = self.next_disk_interrupt_time
             self.process_scheduler.consume_time(time_until_interrupt)
@@ -282,7 +489,7 @@ class Simulator:
             process.before_write_remaining_time = remaining_time - time_until_interrupt
             return
 
-        print(f"... worked for {int(remaining_time)} us in user mode (completed)")
+        self.log(f"... worked for {us(remaining_time)} us in user mode (completed)")
 
         self.current_time += remaining_time
         self.process_scheduler.consume_time(remaining_time)
@@ -292,15 +499,15 @@ class Simulator:
         self._start_syscall_write(process, sector_num)
 
     def _start_syscall_write(self, process: Process, sector_num: int):
-        print(f"SCHEDULER: Process `{process.name}` invoked write() for sector {sector_num}")
+        self.log(f"SCHEDULER: Process `{process.name}` invoked write() for sector {sector_num}")
 
-        syscall_time = self.config.SYSCALL_WRITE_TIME
+        syscall_time = self.syscalls.syscall_write_time
 
         if self._will_interrupt_during(syscall_time):
             time_until_interrupt = self.next_disk_interrupt_time - self.current_time
 
-            print(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
-            print(f"... worked for {int(time_until_interrupt)} us in system call (interrupted)")
+            self.log(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
+            self.log(f"... worked for {us(time_until_interrupt)} us in system call (interrupted)")
 
             self.current_time = self.next_disk_interrupt_time
             self.process_scheduler.consume_time(time_until_interrupt)
@@ -316,17 +523,7 @@ class Simulator:
         self.current_time += time_spent
         self.process_scheduler.consume_time(time_spent)
 
-        if blocked:
-            process.blocked_on_sector = sector_num
-            process.syscall_in_progress = None
-            self.process_scheduler.block_current_process()
-            self._start_next_io()
-        else:
-            process.syscall_in_progress = None
-            print()
-            print(f"SCHEDULER: {int(self.current_time)} us (NEXT ITERATION)")
-            print(f"SCHEDULER: User mode for process `{process.name}`")
-            process.advance_operation()
+        self._end_syscall_write(process, sector_num, not blocked)
 
     def _continue_syscall_write(self, process: Process, sector_num: int):
         remaining_time = process.syscall_remaining_time
@@ -334,8 +531,8 @@ class Simulator:
         if self._will_interrupt_during(remaining_time):
             time_until_interrupt = self.next_disk_interrupt_time - self.current_time
 
-            print(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
-            print(f"... worked for {int(time_until_interrupt)} us in system call (interrupted)")
+            self.log(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
+            self.log(f"... worked for {us(time_until_interrupt)} us in system call (interrupted)")
 
             self.current_time = self.next_disk_interrupt_time
             self.process_scheduler.consume_time(time_until_interrupt)
@@ -343,112 +540,257 @@ class Simulator:
             process.syscall_remaining_time = remaining_time - time_until_interrupt
             return
 
-        print(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
-        print(f"... worked for {int(remaining_time)} us in system call, request buffer cache")
+        self.log(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
+        self.log(f"... worked for {us(remaining_time)} us in system call, request buffer cache")
 
         self.current_time += remaining_time
         self.process_scheduler.consume_time(remaining_time)
 
         process.syscall_remaining_time = 0
 
-        buffer = self.cache.find_buffer(sector_num)
+        outcome = self.syscalls.request_buffer(process, 'w', sector_num, self.current_time)
+        self._end_syscall_write(process, sector_num, outcome in COMPLETED)
 
-        if buffer:
-            print(f"CACHE: Buffer {buffer} found in cache")
-            self.cache.access_buffer(sector_num, self.driver.disk.get_track_for_sector(sector_num))
-            print(self.cache.get_state_string())
+    def _end_syscall_write(self, process: Process, sector_num: int, completed: bool):
+        # The buffer is modified - the process goes on, otherwise waits for I/O
+        process.syscall_in_progress = None
 
-            buffer.mark_modified()
-            print(f"SCHEDULER: Process `{process.name}` modified buffer {buffer}")
-
-            process.syscall_in_progress = None
-            print()
-            print(f"SCHEDULER: {int(self.current_time)} us (NEXT ITERATION)")
-            print(f"SCHEDULER: User mode for process `{process.name}`")
+        if completed:
+            self.log()
+            self.log(f"SCHEDULER: {us(self.current_time)} us (NEXT ITERATION)")
+            self.log(f"SCHEDULER: User mode for process `{process.name}`")
             process.advance_operation()
+            return
+
+        process.blocked_on_sector = sector_num
+        self.driver.add_waiter(sector_num, process, None)
+        self.process_scheduler.block_current_process()
+        self._start_next_io()
+
+    def _execute_async(self, process: Process, op_type: str, sector_num: int):
+        # Submits asynchronous read/write, the process keeps running
+        kind = 'aio_read' if op_type == 'ar' else 'aio_write'
+
+        if process.syscall_in_progress == (kind, sector_num):
+            remaining_time = process.syscall_remaining_time
         else:
-            print(f"CACHE: Buffer for sector {sector_num} not found in cache")
+            self.log(f"SCHEDULER: User mode for process `{process.name}`")
+            self.log(f"SCHEDULER: Process `{process.name}` invoked {kind}() for sector {sector_num}")
+            remaining_time = self.syscalls.syscall_read_time if op_type == 'ar' else self.syscalls.syscall_write_time
+            process.syscall_in_progress = (kind, sector_num)
 
-            if self.driver.is_buffer_in_io(sector_num):
-                print(f"SCHEDULER: But this buffer is scheduled for I/O (READ)")
-                process.blocked_on_sector = sector_num
-                process.syscall_in_progress = None
-                self.process_scheduler.block_current_process()
-                return
+        if self._will_interrupt_during(remaining_time):
+            time_until_interrupt = self.next_disk_interrupt_time - self.current_time
 
-            free_buffer = self._get_free_buffer_for_write(sector_num)
-            if free_buffer is None:
-                process.blocked_on_sector = sector_num
-                process.syscall_in_progress = None
-                self.process_scheduler.block_current_process()
-                self._start_next_io()
-                return
+            self.log(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
+            self.log(f"... worked for {us(time_until_interrupt)} us in system call (interrupted)")
+
+            self.current_time = self.next_disk_interrupt_time
+            self.process_scheduler.consume_time(time_until_interrupt)
+
+            process.syscall_remaining_time = remaining_time - time_until_interrupt
+            return
+
+        self.log(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
+        self.log(f"... worked for {us(remaining_time)} us in system call, request buffer cache")
+
+        self.current_time += remaining_time
+        self.process_scheduler.consume_time(remaining_time)
+
+        process.syscall_remaining_time = 0
+        process.syscall_in_progress = None
 
-            track_num = self.driver.disk.get_track_for_sector(sector_num)
-            free_buffer.load_sector(sector_num, track_num)
-            self.driver.schedule_io(free_buffer, 'READ')
+        self._submit_async_io(process, op_type, sector_num)
 
+    def _submit_async_io(self, process: Process, op_type: str, sector_num: int):
+        outcome = self.syscalls.request_buffer(process, op_type, sector_num, self.current_time)
+
+        if outcome in COMPLETED:
+            process.advance_operation()
+            return
+
+        if outcome == IN_IO_WRITE:
+            # Old contents are being written back: wait like a blocking call, then submit again
             process.blocked_on_sector = sector_num
-            process.syscall_in_progress = None
+            self.driver.add_waiter(sector_num, process, None)
+            self.process_scheduler.block_current_process()
+            return
+
+        if outcome == NO_BUFFER:
+            process.blocked_on_sector = sector_num
+            self.driver.add_waiter(sector_num, process, None)
             self.process_scheduler.block_current_process()
             self._start_next_io()
+            return
 
-    def _will_interrupt_during(self, time_duration: float) -> bool:
-        if self.next_disk_interrupt_time is None:
-            return False
+        self.driver.add_waiter(sector_num, process, op_type)
+        process.aio_in_flight += 1
+        self.log(f"SCHEDULER: Process `{process.name}` continues, "
+                 f"{process.aio_in_flight} asynchronous I/O in flight")
 
-        return self.current_time < self.next_disk_interrupt_time < self.current_time + time_duration
+        process.advance_operation()
+        self._start_next_io()
+
+    def _execute_wait(self, process: Process):
+        # Waits for all asynchronous I/O of the process
+        if process.aio_in_flight == 0:
+            self.log(f"SCHEDULER: Process `{process.name}` has no asynchronous I/O in flight")
+            process.waiting_aio = False
+            process.advance_operation()
+            return
+
+        self.log(f"SCHEDULER: Process `{process.name}` waits for "
+                 f"{process.aio_in_flight} asynchronous I/O")
+        process.waiting_aio = True
+        self.process_scheduler.block_current_process()
+
+    def _complete_async_io(self, buffer, waiters: list):
+        # Notifies processes whose asynchronous I/O for this sector is completed
+        for process, op_type in waiters:
+            if op_type is None:
+                continue
+            if op_type == 'aw':
+                buffer.mark_modified()
+                self.log(f"SCHEDULER: Process `{process.name}` modified buffer {buffer} (asynchronous)")
+
+            if op_type == 'rv':
+                process.readv_in_flight -= 1
+                completed = process.readv_in_flight == 0
+            else:
+                process.aio_in_flight -= 1
+                completed = process.aio_in_flight == 0
+                self.log(f"SCHEDULER: Asynchronous I/O for buffer {buffer} completed "
+                         f"for process `{process.name}`")
+
+            # The process waits in ('wait', None) or ('rv', ...) for its own counter
+            if completed and process.waiting_aio and \
+                    (process.get_next_operation()[0] == 'rv') == (op_type == 'rv'):
+                process.waiting_aio = False
+                self.process_scheduler.unblock_process(process)
+
+    def _execute_readv(self, process: Process, sectors: list):
+        # Vectored read: one system call for the batch, blocks until the last sector is read
+        if process.after_read_remaining_time > 0:
+            return self._continue_after_read_processing(process)
+
+        if process.readv_next_index == len(sectors):
+            # Whole batch is submitted
+            if process.readv_in_flight > 0:
+                process.waiting_aio = True
+                self.process_scheduler.block_current_process()
+                return
+            return self._start_after_read_processing(process)
+
+        tag = ('readv', process.current_op_index)
+
+        if process.syscall_in_progress == tag:
+            remaining_time = process.syscall_remaining_time
+        else:
+            pending = sectors[process.readv_next_index:]
+            self.log(f"SCHEDULER: User mode for process `{process.name}`")
+            self.log(f"SCHEDULER: Process `{process.name}` invoked readv() for sectors {pending}")
+            remaining_time = self.syscalls.syscall_read_time
+            process.syscall_in_progress = tag
+
+        if self._will_interrupt_during(remaining_time):
+            time_until_interrupt = self.next_disk_interrupt_time - self.current_time
 
-    def _get_free_buffer_for_read(self, sector_num: int):
-        print("CACHE: Get free buffer")
+            self.log(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
+            self.log(f"... worked for {us(time_until_interrupt)} us in system call (interrupted)")
 
-        evicted_buffer = self.cache.get_free_buffer()
+            self.current_time = self.next_disk_interrupt_time
+            self.process_scheduler.consume_time(time_until_interrupt)
+
+            process.syscall_remaining_time = remaining_time - time_until_interrupt
+            return
 
-        if evicted_buffer.modified and evicted_buffer.sector_num is not None:
-            print(f"CACHE: Buffer {evicted_buffer} removed from cache")
-            print(self.cache.get_state_string())
-            print("SCHEDULER: This buffer was modified, will write it")
+        self.log(f"SCHEDULER: Kernel mode (syscall) for process `{process.name}`")
+        self.log(f"... worked for {us(remaining_time)} us in system call, request buffer cache")
 
-            self.driver.schedule_io(evicted_buffer, 'WRITE')
-            return None
+        self.current_time += remaining_time
+        self.process_scheduler.consume_time(remaining_time)
+
+        process.syscall_remaining_time = 0
+        process.syscall_in_progress = None
 
-        if evicted_buffer.sector_num is not None:
-            print(f"CACHE: Buffer {evicted_buffer} removed from cache")
-            print(self.cache.get_state_string())
-            print("SCHEDULER: This buffer was not modified, will reuse it")
+        self._submit_readv(process, sectors)
 
-        return evicted_buffer
+    def _submit_readv(self, process: Process, sectors: list):
+        # Looks up every sector and schedules all misses together, so the strategy can order them
+        while process.readv_next_index < len(sectors):
+            sector_num = sectors[process.readv_next_index]
+            outcome = self.syscalls.request_buffer(
+                process, 'rv', sector_num, self.current_time,
+                log_state=False, batch_started=process.readv_in_flight > 0
+            )
 
-    def _get_free_buffer_for_write(self, sector_num: int):
-        return self._get_free_buffer_for_read(sector_num)
+            if outcome == HIT:
+                process.readv_next_index += 1
+                continue
+
+            if outcome == DEFERRED:
+                # All buffers are taken by this batch: the rest is submitted after the reads
+                break
+
+            if outcome in (IN_IO_WRITE, NO_BUFFER):
+                # Sector is being written back or no clean buffer: wait, the rest is submitted later
+                process.blocked_on_sector = sector_num
+                self.driver.add_waiter(sector_num, process, None)
+                self.process_scheduler.block_current_process()
+                self._start_next_io()
+                return
+
+            self.driver.add_waiter(sector_num, process, 'rv')
+            process.readv_in_flight += 1
+            process.readv_next_index += 1
+
+        self.log(self.cache.get_state())
+
+        if process.readv_in_flight == 0:
+            return self._start_after_read_processing(process)
+
+        self.log(f"SCHEDULER: Process `{process.name}` waits for {process.readv_in_flight} sectors")
+        process.waiting_aio = True
+        self.process_scheduler.block_current_process()
+        self._start_next_io()
+
+    def _will_interrupt_during(self, time_duration: float) -> bool:
+        if self.next_disk_interrupt_time is None:
+            return False
+
+        return self.current_time < self.next_disk_interrupt_time < self.current_time + time_duration
 
     def _check_and_handle_interrupt(self) -> bool:
         if self.next_disk_interrupt_time and self.current_time >= self.next_disk_interrupt_time:
-            print("SCHEDULER: Disk interrupt handler was invoked")
+            self.log("SCHEDULER: Disk interrupt handler was invoked")
 
-            buffer, operation, _ = self.driver.current_operation
-
-            self.driver.complete_io(buffer, operation)
+            buffer, operation, done, waiters = self.driver.complete_next_io()
 
             self.next_disk_interrupt_time = None
 
             if operation == 'READ':
                 self.cache.add_buffer_to_cache(buffer)
-                print(f"CACHE: Buffer {buffer} added to cache")
-                print(self.cache.get_state_string())
+                self.log(f"CACHE: Buffer {buffer} added to cache")
+                self.log(self.cache.get_state())
 
                 # Unblocks processes waiting for this sector
-                self._wakeup_waiting_processes(buffer.sector_num)
-            elif operation == 'WRITE':
-                buffer.reset()
-                self.cache.free_buffers.append(buffer)
-                print("CACHE: Put free buffer")
+                self._wakeup_waiting_processes(buffer.sector_num, waiters)
+                self._complete_async_io(buffer, waiters)
+
+                # The buffer can be evicted later, processes waiting for any buffer retry
+                if self.syscalls.buffer_shortage:
+                    self.syscalls.buffer_shortage = False
+                    self._wakeup_all_blocked_processes()
+            elif operation == 'WRITE' and done:
+                # Mirrored write frees the buffer after the last copy
+                self.cache.release_buffer(buffer)
+                self.log("CACHE: Put free buffer")
 
                 # Unblocks all processes because a free buffer appeared
                 self._wakeup_all_blocked_processes()
 
-            intr_time = self.config.DISK_INTR_TIME
-            print(f"... worked for {int(intr_time)} us in disk interrupt handler")
+            intr_time = self.disk_intr_time
+            self.log(f"... worked for {us(intr_time)} us in disk interrupt handler")
 
             self.current_time += intr_time
             self.process_scheduler.consume_time(intr_time)
@@ -460,53 +802,58 @@ class Simulator:
         return False
 
     def _start_next_io(self):
-        # Starts next I/O
-        if not self.driver.has_active_io():
-            io_info = self.driver.start_next_io(self.current_time)
+        # Starts next I/O on every idle disk
+        for buffer, operation, completion_time in self.driver.start_next_io(self.current_time):
+            self.log(f"SCHEDULER: Next interrupt from disk will be at {us(completion_time)} us")
 
-            if io_info:
-                buffer, operation, completion_time = io_info
-                self.next_disk_interrupt_time = completion_time
-                print(f"SCHEDULER: Next interrupt from disk will be at {int(completion_time)} us")
+        self.next_disk_interrupt_time = self.driver.next_interrupt_time()
 
     def _idle_until_interrupt(self):
-        # Waits for interruption
-        if self.next_disk_interrupt_time:
-            idle_time = self.next_disk_interrupt_time - self.current_time
-            print()
-            print(f"SCHEDULER: {int(self.current_time)} us (NEXT ITERATION)")
-            print(f"SCHEDULER: Scheduler has nothing to do for {int(idle_time)} us")
-
-            self.current_time = self.next_disk_interrupt_time
+        # Waits for interruption or the next request arrival
+        next_time = self.next_disk_interrupt_time
+        if self.next_arrivals and (not next_time or self.next_arrivals[0][0] < next_time):
+            next_time = self.next_arrivals[0][0]
+
+        if next_time:
+            idle_time = next_time - self.current_time
+            self.log()
+            self.log(f"SCHEDULER: {us(self.current_time)} us (NEXT ITERATION)")
+            self.log(f"SCHEDULER: Scheduler has nothing to do for {us(idle_time)} us")
+
+            self.current_time = next_time
         else:
-            print("ERROR: No pending interrupts and no ready processes")
+            self.log("ERROR: No pending interrupts and no ready processes")
 
-    def _wakeup_waiting_processes(self, sector_num: int):
-        # Unblocks processes waiting for a specific sector
-        for process in self.process_scheduler.blocked_processes[:]:
-            if process.blocked_on_sector == sector_num:
+    def _wakeup_waiting_processes(self, sector_num: int, waiters: list):
+        # Unblocks processes blocked on the sector that was read
+        for process, op_type in waiters:
+            if op_type is None and process.blocked_on_sector == sector_num:
                 self.process_scheduler.unblock_process(process)
                 process.blocked_on_sector = None
 
     def _wakeup_all_blocked_processes(self):
         # Unblocks all blocked processes (after WRITE of the evicted buffer)
-        for process in self.process_scheduler.blocked_processes[:]:
+        for process in list(self.process_scheduler.blocked_processes):
+            if process.waiting_aio:
+                continue
             self.process_scheduler.unblock_process(process)
+            if process.blocked_on_sector is not None:
+                self.driver.discard_waiter(process.blocked_on_sector, process)
             process.blocked_on_sector = None
 
     def _flush_cache(self):
         # Writes modified buffers
-        print("SCHEDULER: Flushing buffer cache")
+        self.log("SCHEDULER: Flushing buffer cache")
 
         all_buffers = (self.cache.left_segment +
                        self.cache.middle_segment +
                        self.cache.right_segment)
 
         for buffer in all_buffers:
-            print(f"CACHE: Buffer {buffer} removed from cache")
+            self.log(f"CACHE: Buffer {buffer} removed from cache")
 
             if buffer.modified:
-                self.driver.schedule_io(buffer, 'WRITE')
+                self.driver.schedule_io(buffer, 'WRITE', self.current_time)
 
         # Cleans caches
         self.cache.left_segment = []
@@ -515,46 +862,45 @@ class Simulator:
         self.cache.sector_to_buffer = {}
 
         # Execute recordings
-        while self.strategy.has_pending_requests() or self.driver.has_active_io():
+        while self.driver.has_pending_requests() or self.driver.has_active_io():
             self._start_next_io()
 
             if self.next_disk_interrupt_time:
                 idle_time = self.next_disk_interrupt_time - self.current_time
-                print()
-                print(f"SCHEDULER: {int(self.current_time)} us (NEXT ITERATION)")
-                print(f"SCHEDULER: Scheduler has nothing to do for {int(idle_time)} us ")
+                self.log()
+                self.log(f"SCHEDULER: {us(self.current_time)} us (NEXT ITERATION)")
+                self.log(f"SCHEDULER: Scheduler has nothing to do for {us(idle_time)} us ")
                 self.current_time = self.next_disk_interrupt_time
 
                 # Interrupt handling for flush
-                if self.driver.current_operation:
-                    buffer, operation, _ = self.driver.current_operation
-                    print("SCHEDULER: Disk interrupt handler was invoked")
-                    self.driver.complete_io(buffer, operation)
-                    self.next_disk_interrupt_time = None
-
-                    buffer.reset()
-                    self.cache.free_buffers.append(buffer)
-                    print("CACHE: Put free buffer")
-
-                    intr_time = self.config.DISK_INTR_TIME
-                    print(f"... worked for {int(intr_time)} us in disk interrupt handler")
+                if self.driver.has_active_io():
+                    self.log("SCHEDULER: Disk interrupt handler was invoked")
+                    buffer, operation, done, _ = self.driver.complete_next_io()
+                    self.next_disk_interrupt_time = self.driver.next_interrupt_time()
+
+                    if done:
+                        self.cache.release_buffer(buffer)
+                        self.log("CACHE: Put free buffer")
+
+                    intr_time = self.disk_intr_time
+                    self.log(f"... worked for {us(intr_time)} us in disk interrupt handler")
                     self.current_time += intr_time
 
     def _print_settings(self):
         # Prints configuration
         c = self.config
-        print(f"    syscall_read_time   {int(c.SYSCALL_READ_TIME):,}".replace(',', "'"))
-        print(f"    syscall_write_time  {int(c.SYSCALL_WRITE_TIME):,}".replace(',', "'"))
-        print(f"    disk_intr_time      {int(c.DISK_INTR_TIME)}")
-        print(f"    quantum_time        {int(c.QUANTUM_TIME):,}".replace(',', "'"))
-        print(f"    before_writing_time {int(c.BEFORE_WRITING_TIME):,}".replace(',', "'"))
-        print(f"    after_reading_time  {int(c.AFTER_READING_TIME):,}".replace(',', "'"))
-        print()
-        print(f"    buffers_num         {c.BUFFERS_NUM}")
-        print()
-        print(f"    sectors_per_track   {c.SECTORS_PER_TRACK}")
-        print(f"    track_seek_time     {int(c.TRACK_SEEK_TIME * 1000):,}".replace(',', "'"))
-        print(f"    rewind_seek_time    {int(c.REWIND_SEEK_TIME):,}".replace(',', "'"))
-        print()
-        print(f"    rotation_delay_time {int(c.ROTATION_DELAY_TIME * 1000):,}".replace(',', "'"))
-        print(f"    sector_access_time  {int(c.SECTOR_ACCESS_TIME * 1000)}")
+        self.log(f"    syscall_read_time   {int(c.SYSCALL_READ_TIME):,}".replace(',', "'"))
+        self.log(f"    syscall_write_time  {int(c.SYSCALL_WRITE_TIME):,}".replace(',', "'"))
+        self.log(f"    disk_intr_time      {int(c.DISK_INTR_TIME)}")
+        self.log(f"    quantum_time        {int(c.QUANTUM_TIME):,}".replace(',', "'"))
+        self.log(f"    before_writing_time {int(c.BEFORE_WRITING_TIME):,}".replace(',', "'"))
+        self.log(f"    after_reading_time  {int(c.AFTER_READING_TIME):,}".replace(',', "'"))
+        self.log()
+        self.log(f"    buffers_num         {c.BUFFERS_NUM}")
+        self.log()
+        self.log(f"    sectors_per_track   {c.SECTORS_PER_TRACK}")
+        self.log(f"    track_seek_time     {int(c.TRACK_SEEK_TIME * 1000):,}".replace(',', "'"))
+        self.log(f"    rewind_seek_time    {int(c.REWIND_SEEK_TIME):,}".replace(',', "'"))
+        self.log()
+        self.log(f"    rotation_delay_time {int(c.ROTATION_DELAY_TIME * 1000):,}".replace(',', "'"))
+        self.log(f"    sector_access_time  {int(c.SECTOR_ACCESS_TIME * 1000)}")
@@ -0,0 +1,41 @@
+import pickle
+import zlib
+
+
+# Binary snapshots of the whole simulator state
+# Header: magic (4 bytes) + format version (1 byte), then zlib-compressed pickle
+SNAPSHOT_MAGIC = b'HDBS'
+SNAPSHOT_VERSION = 1
+
+
+def dumps(simulator) -> bytes:
+    # Serializes the simulator (cache segments, strategy queues, driver operation,
+    # scheduler queues, process cursors, disk head) into compact bytes
+    payload = pickle.dumps(simulator, protocol=pickle.HIGHEST_PROTOCOL)
+    return SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]) + zlib.compress(payload)
+
+
+def loads(data: bytes):
+    # Restores a simulator from snapshot bytes
+    header_len = len(SNAPSHOT_MAGIC) + 1
+
+    if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError("Not a simulator snapshot")
+
+    version = data[len(SNAPSHOT_MAGIC)]
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+
+    return pickle.loads(zlib.decompress(data[header_len:]))
+
+
+def save_snapshot(simulator, path: str):
+    # Writes snapshot to file
+    with open(path, 'wb') as f:
+        f.write(dumps(simulator))
+
+
+def load_snapshot(path: str):
+    # Reads snapshot from file
+    with open(path, 'rb') as f:
+        return loads(f.read())
@@ -0,0 +1,8 @@
+# Helpers for run statistics
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    # Nearest-rank percentile of sorted values
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
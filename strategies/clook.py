@@ -0,0 +1,135 @@
+from bisect import bisect_left, insort
+from heapq import heappush, heappop
+from typing import Dict, List, Optional
+from models.buffer import Buffer
+from console import ChangeJournal, StateView
+from simulation.clock import us_to_ns, us
+
+
+# C-LOOK (one-way elevator)
+class CLOOKStrategy:
+    # Serves requests only in the OUT direction (towards larger tracks)
+    # When nothing is left after the head, returns to the lowest requested track,
+    # the disk chooses the rewind path for the return trip (HardDisk.calculate_seek_time)
+    # A batch serves the requests that were on the track when it started
+    # (driver.requests_on_track) while the time spent on the track is within
+    # track_time_budget, then the track is skipped until the next sweep
+    # Requests are kept in a heap per track, O(log n) to add or take one, and the
+    # requested tracks in a sorted list found by binary search. A track enters or leaves
+    # the list only with its first or last request, that shifts the list: O(tracks
+    # with requests) memmove, bounded by TRACKS_NUM and not by the number of requests
+    def __init__(self, disk, config):
+        self.disk = disk
+        self.config = config
+        self.active_buffer: Optional[Buffer] = None
+
+        # Set by the driver, None - the strategy counts the requests itself
+        self.driver = None
+
+        # Changes for the console output
+        self.journal = ChangeJournal(config)
+        self.state_title = "DRIVER: Device strategy C-LOOK"
+
+        # track -> heap of (sector, seq, buffer), requested tracks sorted
+        self.tracks: Dict[int, List[tuple]] = {}
+        self.track_list: List[int] = []
+        self.sequence = 0
+        self.queued = 0
+
+        # Current batch: track, the time its first request was dispatched (ns)
+        # and the number of its requests still to dispatch
+        self.batch_track = None
+        self.batch_start = 0
+        self.batch_left = 0
+
+        # ns, 0 - one request per track in a sweep
+        self.track_time_budget = us_to_ns(config.CLOOK_TRACK_TIME_BUDGET)
+
+    def add_request(self, buffer: Buffer, operation: str):
+        # Adds request to the heap of its track
+        buffer.io_operation = operation
+        self.journal.record(buffer, 'queued')
+
+        self.sequence += 1
+        self.queued += 1
+        track_num = self.disk.get_track_for_sector(buffer.sector_num)
+        requests = self.tracks.get(track_num)
+        if requests is None:
+            requests = self.tracks[track_num] = []
+            insort(self.track_list, track_num)
+        heappush(requests, (buffer.sector_num, self.sequence, buffer))
+
+    def requests_on_track(self, track_num: int) -> int:
+        # Requests for the track not dispatched yet, as counted by the driver if there is one
+        if self.driver is not None:
+            return self.driver.requests_on_track(track_num)
+        return len(self.tracks.get(track_num, ()))
+
+    def get_next_buffer(self, current_time: int = 0) -> Optional[Buffer]:
+        # Chooses next buffer according to C-LOOK algorithm
+        if not self.queued:
+            return None
+
+        track_num = self.disk.current_track
+
+        # The batch on the current track is over when its requests are dispatched
+        # or its time budget is spent
+        if track_num == self.batch_track and \
+                (self.batch_left <= 0 or current_time - self.batch_start >= self.track_time_budget):
+            track_num += 1
+
+        # Wraps to the lowest track when nothing is left after the head (return trip)
+        if track_num in self.tracks:
+            next_track = track_num
+            index = None
+        else:
+            index = bisect_left(self.track_list, track_num)
+            if index == len(self.track_list):
+                index = 0
+            next_track = self.track_list[index]
+
+        if next_track != self.batch_track or next_track < track_num:
+            # New batch (also on the same track after the return trip)
+            self.batch_track = next_track
+            self.batch_start = current_time
+            self.batch_left = self.requests_on_track(next_track)
+
+        requests = self.tracks[next_track]
+        _, _, next_buffer = heappop(requests)
+        if not requests:
+            del self.tracks[next_track]
+            del self.track_list[bisect_left(self.track_list, next_track) if index is None else index]
+        self.queued -= 1
+        self.batch_left -= 1
+
+        self.active_buffer = next_buffer
+        self.journal.record(next_buffer, 'active')
+        return next_buffer
+
+    def complete_io(self, buffer: Optional[Buffer] = None):
+        # Marks the current operation as completed (the active one by default)
+        if buffer is None:
+            buffer = self.active_buffer
+        if buffer:
+            buffer.io_operation = None
+            self.journal.record(buffer, 'completed')
+        if buffer is self.active_buffer:
+            self.active_buffer = None
+
+    def get_state(self) -> StateView:
+        # Strategy status for output: live view rendered when printed (console.StateView)
+        return StateView(self)
+
+    def get_state_string(self) -> str:
+        # Returns strategy status
+        active_str = str(self.active_buffer) if self.active_buffer else None
+        queue_str = ', '.join(str(entry[2]) for track_num in sorted(self.tracks)
+                              for entry in sorted(self.tracks[track_num]))
+
+        return f"DRIVER: Device strategy C-LOOK (track_time_budget {us(self.track_time_budget)} us):\n" + \
+            f"    Active buffer {active_str}\n" + \
+            f"    Schedule queue [{queue_str}]"
+
+    def has_pending_requests(self) -> bool:
+        # If has requests
+        return self.queued > 0 or self.active_buffer is not None
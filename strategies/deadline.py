@@ -0,0 +1,182 @@
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Optional
+from models.buffer import Buffer, IO_PRIORITY_RT, IO_PRIORITY_BE, IO_PRIORITY_IDLE
+from console import ChangeJournal, StateView
+from simulation.clock import us_to_ns, us
+
+
+# Deadline (like Linux mq-deadline)
+class DeadlineStrategy:
+    # Every I/O priority class has read and write queues sorted by sector
+    # and read and write FIFO queues in order of arrival
+    # Requests are dispatched in batches in sector order, reads are preferred
+    # A batch starts from the oldest request if it has expired, so no request waits
+    # longer than its expiry time plus one batch
+    # Writes are served at least once per writes_starved read batches
+    # Higher priority classes go first, a lower class request older than
+    # prio_aging_expire is dispatched before them
+    def __init__(self, disk, config):
+        self.disk = disk
+        self.config = config
+        self.active_buffer: Optional[Buffer] = None
+
+        # Changes for the console output
+        self.journal = ChangeJournal(config)
+        self.state_title = "DRIVER: Device strategy DEADLINE"
+
+        # ns
+        self.expire = {'READ': us_to_ns(config.DEADLINE_READ_EXPIRE),
+                       'WRITE': us_to_ns(config.DEADLINE_WRITE_EXPIRE)}
+        self.prio_aging_expire = us_to_ns(config.DEADLINE_PRIO_AGING_EXPIRE)
+        self.writes_starved = config.DEADLINE_WRITES_STARVED
+        self.fifo_batch = config.DEADLINE_FIFO_BATCH
+
+        self.priorities = (IO_PRIORITY_RT, IO_PRIORITY_BE, IO_PRIORITY_IDLE)
+
+        # (priority, operation) -> [(sector, seq, buffer)] sorted by sector
+        self.sort_lists = {(p, op): [] for p in self.priorities for op in ('READ', 'WRITE')}
+        # (priority, operation) -> deque[(submit_time, seq, buffer)]
+        # Entries dispatched from the sorted list stay here and are skipped
+        self.fifo_lists = {(p, op): deque() for p in self.priorities for op in ('READ', 'WRITE')}
+        # seq of queued requests
+        self.pending = set()
+        self.sequence = 0
+
+        # Batch state, sweep position is kept for every queue,
+        # so requests of other classes do not move it
+        self.last_priority = None
+        self.last_operation = None
+        self.positions = {key: 0 for key in self.sort_lists}
+        self.batching = 0
+        self.starved = 0
+
+    def add_request(self, buffer: Buffer, operation: str):
+        # Adds request to the sorted and FIFO queues of its class
+        buffer.io_operation = operation
+        self.journal.record(buffer, 'queued')
+        key = (buffer.io_priority, operation)
+
+        self.sequence += 1
+        insort(self.sort_lists[key], (buffer.sector_num, self.sequence, buffer))
+        self.fifo_lists[key].append((buffer.io_submit_time, self.sequence, buffer))
+        self.pending.add(self.sequence)
+
+    def get_next_buffer(self, current_time: int = 0) -> Optional[Buffer]:
+        # Chooses next buffer according to deadline algorithm
+        if not self.pending:
+            return None
+
+        entry = self._dispatch_aged(current_time)
+        if entry is None:
+            for priority in self.priorities:
+                entry = self._dispatch(priority, current_time)
+                if entry:
+                    break
+
+        sector_num, seq, buffer = entry
+        self.pending.discard(seq)
+        self.positions[(buffer.io_priority, buffer.io_operation)] = sector_num
+        self.batching += 1
+        self.active_buffer = buffer
+        self.journal.record(buffer, 'active')
+        return buffer
+
+    def _fifo_head(self, key: tuple) -> Optional[tuple]:
+        # Oldest request still queued
+        fifo = self.fifo_lists[key]
+        while fifo and fifo[0][1] not in self.pending:
+            fifo.popleft()
+        return fifo[0] if fifo else None
+
+    def _take(self, key: tuple, index: int) -> tuple:
+        # Removes request from the sorted list, returns (sector, seq, buffer)
+        return self.sort_lists[key].pop(index)
+
+    def _take_fifo_head(self, key: tuple) -> tuple:
+        submit_time, seq, buffer = self.fifo_lists[key].popleft()
+        index = bisect_left(self.sort_lists[key], (buffer.sector_num, seq))
+        return self._take(key, index)
+
+    def _start_batch(self, priority: int, operation: str):
+        self.last_priority = priority
+        self.last_operation = operation
+        self.batching = 0
+
+    def _dispatch_aged(self, current_time: int) -> Optional[tuple]:
+        # Lower class requests waiting longer than prio_aging_expire
+        for priority in self.priorities[1:]:
+            for operation in ('READ', 'WRITE'):
+                key = (priority, operation)
+                head = self._fifo_head(key)
+                if head and current_time - head[0] >= self.prio_aging_expire:
+                    self._start_batch(priority, operation)
+                    return self._take_fifo_head(key)
+        return None
+
+    def _dispatch(self, priority: int, current_time: int) -> Optional[tuple]:
+        reads = self.sort_lists[(priority, 'READ')]
+        writes = self.sort_lists[(priority, 'WRITE')]
+        if not reads and not writes:
+            return None
+
+        # Continues the current batch in sector order
+        if self.last_priority == priority and self.batching < self.fifo_batch:
+            key = (priority, self.last_operation)
+            sort_list = self.sort_lists[key]
+            index = bisect_left(sort_list, (self.positions[key],))
+            if index < len(sort_list):
+                return self._take(key, index)
+
+        # Chooses direction of the new batch
+        if reads and (not writes or self.starved < self.writes_starved):
+            operation = 'READ'
+            if writes:
+                self.starved += 1
+        else:
+            operation = 'WRITE'
+            self.starved = 0
+
+        key = (priority, operation)
+        self._start_batch(priority, operation)
+
+        # Starts from the oldest request if it has expired, otherwise goes on in sector order
+        # (from the lowest sector when nothing is left after the last one, the rewind is cheap)
+        head = self._fifo_head(key)
+        if current_time - head[0] >= self.expire[operation]:
+            return self._take_fifo_head(key)
+
+        sort_list = self.sort_lists[key]
+        index = bisect_left(sort_list, (self.positions[key],))
+        return self._take(key, index if index < len(sort_list) else 0)
+
+    def complete_io(self, buffer: Optional[Buffer] = None):
+        # Marks the current operation as completed (the active one by default)
+        if buffer is None:
+            buffer = self.active_buffer
+        if buffer:
+            buffer.io_operation = None
+            self.journal.record(buffer, 'completed')
+        if buffer is self.active_buffer:
+            self.active_buffer = None
+
+    def get_state(self) -> StateView:
+        # Strategy status for output: live view rendered when printed (console.StateView)
+        return StateView(self)
+
+    def get_state_string(self) -> str:
+        # Returns strategy status
+        active_str = str(self.active_buffer) if self.active_buffer else None
+        read_str = ', '.join(str(b) for p in self.priorities
+                             for _, _, b in self.sort_lists[(p, 'READ')])
+        write_str = ', '.join(str(b) for p in self.priorities
+                              for _, _, b in self.sort_lists[(p, 'WRITE')])
+
+        return f"DRIVER: Device strategy DEADLINE (read_expire {us(self.expire['READ'])} us, " + \
+            f"write_expire {us(self.expire['WRITE'])} us):\n" + \
+            f"    Active buffer {active_str}\n" + \
+            f"    Read queue [{read_str}]\n" + \
+            f"    Write queue [{write_str}]"
+
+    def has_pending_requests(self) -> bool:
+        return len(self.pending) > 0 or self.active_buffer is not None
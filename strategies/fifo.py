@@ -1,5 +1,6 @@
 from typing import List, Optional
 from models.buffer import Buffer
+from console import ChangeJournal, StateView
 
 
 # FIFO (First In First Out)
@@ -11,13 +12,18 @@ class FIFOStrategy:
         self.queue: List[Buffer] = []  # Queue of requests
         self.active_buffer: Optional[Buffer] = None  # Current buffer in processing
 
+        # Changes for the console output
+        self.journal = ChangeJournal(disk.config)
+        self.state_title = "DRIVER: Device strategy FIFO"
+
     def add_request(self, buffer: Buffer, operation: str):
         # Adds a request to the queue
         # operation: 'READ' or 'WRITE'
         buffer.io_operation = operation
+        self.journal.record(buffer, 'queued')
         self.queue.append(buffer)
 
-    def get_next_buffer(self) -> Optional[Buffer]:
+    def get_next_buffer(self, current_time: int = 0) -> Optional[Buffer]:
         # Returns the next buffer to process
         if not self.queue:
             return None
@@ -25,13 +31,22 @@ class FIFOStrategy:
         # Take the first request
         next_buffer = self.queue.pop(0)
         self.active_buffer = next_buffer
+        self.journal.record(next_buffer, 'active')
         return next_buffer
 
-    def complete_io(self):
-        # Marks the current operation as completed
-        if self.active_buffer:
-            self.active_buffer.io_operation = None
-        self.active_buffer = None
+    def complete_io(self, buffer: Optional[Buffer] = None):
+        # Marks the current operation as completed (the active one by default)
+        if buffer is None:
+            buffer = self.active_buffer
+        if buffer:
+            buffer.io_operation = None
+            self.journal.record(buffer, 'completed')
+        if buffer is self.active_buffer:
+            self.active_buffer = None
+
+    def get_state(self) -> StateView:
+        # Strategy status for output: live view rendered when printed (console.StateView)
+        return StateView(self)
 
     def get_state_string(self) -> str:
         # Returns a string with the strategy status for output
@@ -1,6 +1,7 @@
 from distutils.dep_util import newer
 from typing import List, Optional
 from models.buffer import Buffer
+from console import ChangeJournal, StateView
 
 
 # LOOK
@@ -15,6 +16,10 @@ class LOOKStrategy:
         self.queue: List[Buffer] = []
         self.active_buffer: Optional[Buffer] = None
 
+        # Changes for the console output
+        self.journal = ChangeJournal(config)
+        self.state_title = "DRIVER: Device strategy LOOK"
+
         # Direction of movement: 'OUT' (towards larger numbers) or 'IN' (towards smaller numbers)
         self.direction = 'OUT'
 
@@ -28,12 +33,13 @@ class LOOKStrategy:
     def add_request(self, buffer: Buffer, operation: str):
         # Adds request and sorts queue
         buffer.io_operation = operation
+        self.journal.record(buffer, 'queued')
         self.queue.append(buffer)
 
         # Sort queue by number of a sector
         self.queue.sort(key=lambda b: b.sector_num)
 
-    def get_next_buffer(self) -> Optional[Buffer]:
+    def get_next_buffer(self, current_time: int = 0) -> Optional[Buffer]:
         # Chooses next buffer according to LOOK algorithm
         if not self.queue:
             return None
@@ -46,6 +52,7 @@ class LOOKStrategy:
         if next_buffer:
             self.queue.remove(next_buffer)
             self.active_buffer = next_buffer
+            self.journal.record(next_buffer, 'active')
 
             # Update track counter
             buffer_track = self.disk.get_track_for_sector(next_buffer.sector_num)
@@ -101,6 +108,7 @@ class LOOKStrategy:
 
         self.queue.remove(next_buffer)
         self.active_buffer = next_buffer
+        self.journal.record(next_buffer, 'active')
 
         # Update counter
         buffer_track = self.disk.get_track_for_sector(next_buffer.sector_num)
@@ -109,11 +117,19 @@ class LOOKStrategy:
 
         return next_buffer
 
-    def complete_io(self):
-        # Marks the current operation as completed
-        if self.active_buffer:
-            self.active_buffer.io_operation = None
-        self.active_buffer = None
+    def complete_io(self, buffer: Optional[Buffer] = None):
+        # Marks the current operation as completed (the active one by default)
+        if buffer is None:
+            buffer = self.active_buffer
+        if buffer:
+            buffer.io_operation = None
+            self.journal.record(buffer, 'completed')
+        if buffer is self.active_buffer:
+            self.active_buffer = None
+
+    def get_state(self) -> StateView:
+        # Strategy status for output: live view rendered when printed (console.StateView)
+        return StateView(self)
 
     def get_state_string(self) -> str:
         # Returns strategy status
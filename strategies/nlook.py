@@ -1,5 +1,6 @@
 from typing import List, Optional
 from models.buffer import Buffer
+from console import ChangeJournal, StateView
 
 
 # NLOOK strategy
@@ -16,6 +17,10 @@ class NLOOKStrategy:
         self.queues: List[List[Buffer]] = [[]]  # Start with one queue
         self.active_buffer: Optional[Buffer] = None
 
+        # Changes for the console output
+        self.journal = ChangeJournal(config)
+        self.state_title = "DRIVER: Device strategy NLOOK"
+
         # Max length of one queue
         self.queue_max_length = config.NLOOK_QUEUE_MAX_LENGTH
 
@@ -23,6 +28,7 @@ class NLOOKStrategy:
         # Adds request to the queue
         # If the last one is full creates new
         buffer.io_operation = operation
+        self.journal.record(buffer, 'queued')
 
         # If no queues exist, creates one
         if not self.queues:
@@ -39,7 +45,7 @@ class NLOOKStrategy:
             # Sorts by sector number
             last_queue.sort(key=lambda b: b.sector_num)
 
-    def get_next_buffer(self) -> Optional[Buffer]:
+    def get_next_buffer(self, current_time: int = 0) -> Optional[Buffer]:
         # Gets next buffer from the oldest queue
 
         self.queues = [q for q in self.queues if len(q) > 0]
@@ -57,12 +63,14 @@ class NLOOKStrategy:
         if next_buffer:
             oldest_queue.remove(next_buffer)
             self.active_buffer = next_buffer
+            self.journal.record(next_buffer, 'active')
             return next_buffer
         else:
             # No buffers >= current track, start from beginning of queue
             if oldest_queue:
                 next_buffer = oldest_queue.pop(0)
                 self.active_buffer = next_buffer
+                self.journal.record(next_buffer, 'active')
                 return next_buffer
             else:
                 # Queue is empty, move to next queue
@@ -77,11 +85,19 @@ class NLOOKStrategy:
                 return buffer
         return None
 
-    def complete_io(self):
-        # Completes current operation
-        if self.active_buffer:
-            self.active_buffer.io_operation = None
-        self.active_buffer = None
+    def complete_io(self, buffer: Optional[Buffer] = None):
+        # Completes current operation (the active one by default)
+        if buffer is None:
+            buffer = self.active_buffer
+        if buffer:
+            buffer.io_operation = None
+            self.journal.record(buffer, 'completed')
+        if buffer is self.active_buffer:
+            self.active_buffer = None
+
+    def get_state(self) -> StateView:
+        # Strategy status for output: live view rendered when printed (console.StateView)
+        return StateView(self)
 
     def get_state_string(self) -> str:
         # Gets strategy state
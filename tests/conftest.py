@@ -0,0 +1,44 @@
+import pytest
+
+from config import SystemConfig
+from simulation.simulator import Simulator
+from strategies.look import LOOKStrategy
+from workload.generators import make_pattern, generate_processes
+
+
+# Shared fixtures: quiet configs and small generated workloads
+
+
+@pytest.fixture
+def make_config():
+    # SystemConfig without console output
+    def make(**parameters) -> SystemConfig:
+        return SystemConfig(**dict({'TRACE': False}, **parameters))
+    return make
+
+
+@pytest.fixture
+def make_simulator(make_config):
+    # Simulator with generated processes, runs to completion (no iteration limit)
+    # processes: number of generated processes or a list of Process
+    def make(strategy_class=LOOKStrategy, config=None, processes=4, operations: int = 40,
+             pattern: str = 'uniform', read_ratio: float = 0.5, seed: int = 0, layout=None,
+             **parameters) -> Simulator:
+        config = config or make_config(**parameters)
+        simulator = Simulator(config, strategy_class, layout=layout)
+        simulator.max_iterations = float('inf')
+        if isinstance(processes, int):
+            processes = generate_processes(config, make_pattern(config, pattern),
+                                           processes, operations, read_ratio, seed)
+        for process in processes:
+            simulator.add_process(process)
+        return simulator
+    return make
+
+
+@pytest.fixture
+def track_sectors():
+    # First sectors of the tracks
+    def sectors(config, *tracks) -> list:
+        return [track_num * config.SECTORS_PER_TRACK for track_num in tracks]
+    return sectors
@@ -0,0 +1,68 @@
+from models.process import Process
+
+
+def test_submits_keep_the_process_running(make_config, make_simulator, track_sectors):
+    config = make_config()
+    a, b = track_sectors(config, 100, 200)
+    process = Process('p', [('ar', a), ('ar', b), ('wait', None)])
+    simulator = make_simulator(config=config, processes=[process])
+
+    in_flight = []
+    submit = simulator._submit_async_io
+
+    def watched_submit(*args):
+        submit(*args)
+        in_flight.append(process.aio_in_flight)
+
+    simulator._submit_async_io = watched_submit
+    assert simulator.run() is True
+
+    # The second read is submitted while the first one is in flight
+    assert in_flight == [1, 2]
+    assert process.aio_in_flight == 0
+    assert len(simulator.driver.drivers[0].io_latencies['READ']) == 2
+
+
+def test_overlaps_io_with_the_process(make_config, make_simulator, track_sectors):
+    config = make_config()
+    sectors = track_sectors(config, 100, 4000, 8000)
+    blocking = make_simulator(config=config, processes=[Process('p', [('r', s) for s in sectors])])
+    blocking.run()
+    asynchronous = make_simulator(
+        config=config, processes=[Process('p', [('ar', s) for s in sectors] + [('wait', None)])])
+    asynchronous.run()
+
+    assert asynchronous.current_time < blocking.current_time
+
+
+def test_async_write_modifies_the_buffer(make_config, make_simulator, track_sectors):
+    config = make_config()
+    [a] = track_sectors(config, 300)
+    simulator = make_simulator(config=config, processes=[Process('p', [('aw', a), ('wait', None)])])
+
+    flushed = []
+    schedule_io = simulator.driver.schedule_io
+
+    def watched_schedule_io(buffer, operation, *args):
+        if operation == 'WRITE':
+            flushed.append(buffer.sector_num)
+        return schedule_io(buffer, operation, *args)
+
+    simulator.driver.schedule_io = watched_schedule_io
+    assert simulator.run() is True
+    # The read completed, the buffer was marked modified and written at the flush
+    assert flushed == [a]
+
+
+def test_wait_without_io_continues(make_simulator):
+    simulator = make_simulator(processes=[Process('p', [('wait', None), ('wait', None)])])
+    assert simulator.run() is True
+
+
+def test_blocking_reader_and_async_reader_share_a_read(make_config, make_simulator, track_sectors):
+    config = make_config()
+    [a] = track_sectors(config, 500)
+    processes = [Process('async', [('ar', a), ('wait', None)]), Process('sync', [('r', a)])]
+    simulator = make_simulator(config=config, processes=processes)
+    assert simulator.run() is True
+    assert len(simulator.driver.drivers[0].io_latencies['READ']) == 1
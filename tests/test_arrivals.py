@@ -0,0 +1,94 @@
+import json
+import random
+
+import pytest
+
+import cli
+from models.process import Process
+from workload.arrivals import (BurstyArrivals, FixedArrivals, PoissonArrivals, RequestSource,
+                               TraceSource, make_arrivals)
+from workload.generators import make_pattern
+from workload.importers import PackedOperations
+
+
+def arrival_times(arrivals, count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    times = [0.0]
+    for _ in range(count):
+        times.append(arrivals.next_time(rng, times[-1]))
+    return times[1:]
+
+
+@pytest.mark.parametrize('burst_factor', [2, 5, 10, 50])
+def test_bursty_keeps_the_mean_rate(burst_factor):
+    arrivals = make_arrivals('bursty', 200, burst_factor=burst_factor)
+    assert arrivals.mean_rate == pytest.approx(200)
+    assert min(arrivals.rates) >= 100
+
+
+def test_poisson_rate():
+    times = arrival_times(PoissonArrivals(500), 20000)
+    assert len(times) / times[-1] * 1_000_000 == pytest.approx(500, rel=0.05)
+
+
+def test_bursty_has_bursts():
+    arrivals = BurstyArrivals(50, 5000, burst_time=10_000, idle_time=90_000)
+    times = arrival_times(arrivals, 5000)
+    gaps = sorted(b - a for a, b in zip(times, times[1:]))
+    # Most requests arrive in bursts, closer than the mean gap
+    assert gaps[len(gaps) // 2] < 1_000_000 / arrivals.mean_rate
+
+
+@pytest.mark.parametrize('name, rate, burst_factor', [
+    ('poisson', 0, 10), ('bursty', 100, 0), ('bursty', 100, -1), ('uniform', 100, 10),
+])
+def test_invalid_arrivals(name, rate, burst_factor):
+    with pytest.raises(ValueError):
+        make_arrivals(name, rate, burst_factor=burst_factor)
+
+
+def test_same_seed_same_requests(make_config):
+    pattern = make_pattern(make_config(), 'uniform')
+
+    def requests(seed):
+        source = RequestSource('s', make_arrivals('poisson', 100), pattern, count=50, seed=seed)
+        return [source.next_request() for _ in range(51)]
+
+    first = requests(3)
+    assert first == requests(3)
+    assert first != requests(4)
+    assert first[-1] is None
+    assert [r[0] for r in first[:-1]] == sorted(r[0] for r in first[:-1])
+
+
+def test_trace_source_merges_streams_by_time():
+    streams = []
+    for times in ((0.0, 30.0), (10.0, 20.0)):
+        operations = PackedOperations()
+        for time in times:
+            operations.append('r', int(time), time)
+        streams.append(Process(f"p{len(streams)}", operations))
+    source = TraceSource('trace', streams)
+    assert [source.next_request()[0] for _ in range(4)] == [0.0, 10.0, 20.0, 30.0]
+    assert source.next_request() is None
+
+
+def test_open_loop_run(make_simulator, make_config):
+    config = make_config()
+    simulator = make_simulator(config=config, processes=0)
+    simulator.add_source(RequestSource('s', make_arrivals('poisson', 20), make_pattern(config, 'uniform'),
+                                       count=30))
+    simulator.add_source(RequestSource('fixed', FixedArrivals([5.0, 6.0]), make_pattern(config, 'uniform')))
+    assert simulator.run() is True
+
+    stats = simulator.get_stats()
+    assert stats['requests'] == 32
+    assert 0 < stats['response_time_p50'] <= stats['response_time_p99']
+    assert stats['throughput'] > 0
+
+
+def test_closed_loop_run_has_no_arrivals(capsys):
+    argv = ['run', '--format', 'json', '--generate', 'uniform', '--processes', '2', '--operations', '10']
+    assert cli.main(argv) == 0
+    row = json.loads(capsys.readouterr().out)[0]
+    assert 'requests' not in row
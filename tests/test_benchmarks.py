@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from benchmarks import runner, suite
+
+
+def test_collect_names_every_benchmark():
+    names = set(suite.collect(depths=(10,)))
+    assert {'cache.hit[10]', 'cache.evict[1000]'} <= names
+    for strategy_name in suite.STRATEGIES:
+        assert f'strategy.{strategy_name}[10]' in names
+        assert f'simulator.{strategy_name}' in names
+
+
+@pytest.mark.parametrize('strategy_name', sorted(suite.STRATEGIES))
+def test_strategy_benchmark_counts_adds_and_dispatches(strategy_name):
+    elapsed_ns, operations = suite.bench_strategy(strategy_name, 50)
+    assert elapsed_ns > 0
+    assert operations == 100
+
+
+def test_save_updates_only_the_run_benchmarks(tmp_path, monkeypatch):
+    monkeypatch.setattr(suite, 'CACHE_OPERATIONS', 100)
+    path = tmp_path / 'baseline.json'
+    path.write_text(json.dumps({'other': 1.0}))
+
+    assert runner.main(['-k', 'cache.hit[[]10[]]', '--repeat', '1', '--baseline', str(path), '--save']) == 0
+    baseline = json.loads(path.read_text())
+    assert set(baseline) == {'other', 'cache.hit[10]'}
+    assert baseline['other'] == 1.0
+
+
+def test_slowdown_over_tolerance_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(suite, 'CACHE_OPERATIONS', 100)
+    path = tmp_path / 'baseline.json'
+    path.write_text(json.dumps({'cache.hit[10]': 1e-6}))
+
+    assert runner.main(['-k', 'cache.hit[[]10[]]', '--repeat', '1', '--baseline', str(path)]) == 1
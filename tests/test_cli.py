@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+
+import pytest
+
+import cli
+
+
+WORKLOAD = ['--generate', 'uniform', '--processes', '2', '--operations', '20']
+
+
+def run_cli(capsys, *argv) -> str:
+    assert cli.main(list(argv)) == 0
+    return capsys.readouterr().out
+
+
+def test_run_json(capsys):
+    rows = json.loads(run_cli(capsys, 'run', '--strategy', 'look', '--format', 'json', *WORKLOAD))
+    assert len(rows) == 1
+    assert rows[0]['strategy'] == 'look'
+    assert rows[0]['completed'] is True
+    assert rows[0]['total_time'] > 0
+
+
+def test_compare_one_row_per_strategy(capsys):
+    output = run_cli(capsys, 'compare', '--strategies', 'fifo,look,clook', '--format', 'csv', *WORKLOAD)
+    rows = list(csv.DictReader(io.StringIO(output)))
+    assert [row['strategy'] for row in rows] == ['fifo', 'look', 'clook']
+
+
+def test_sweep_every_combination(capsys):
+    output = run_cli(capsys, 'sweep', '--grid', 'BUFFERS_NUM=10,20', '--grid', 'LOOK_TRACK_READ_MAX=1,2',
+                     '--strategies', 'look', '--format', 'json', *WORKLOAD)
+    rows = json.loads(output)
+    assert sorted((row['BUFFERS_NUM'], row['LOOK_TRACK_READ_MAX']) for row in rows) == \
+        [(10, 1), (10, 2), (20, 1), (20, 2)]
+
+
+def test_same_options_same_result(capsys):
+    first = run_cli(capsys, 'run', '--format', 'json', *WORKLOAD)
+    second = run_cli(capsys, 'run', '--format', 'json', *WORKLOAD)
+    assert first == second
+
+
+def test_config_file_env_and_set(capsys, tmp_path, monkeypatch):
+    config_path = tmp_path / 'disk.json'
+    config_path.write_text(json.dumps({'BUFFERS_NUM': 20, 'QUANTUM_TIME': 10000}))
+    monkeypatch.setenv('HDSIM_QUANTUM_TIME', '30000')
+
+    # Defaults, then the file, then the environment, then --set
+    args = cli.build_parser().parse_args(['run', '--config', str(config_path)])
+    config = cli._make_config(args, {'LOOK_TRACK_READ_MAX': 3})
+    assert config.BUFFERS_NUM == 20
+    assert config.QUANTUM_TIME == 30000
+    assert config.LOOK_TRACK_READ_MAX == 3
+    assert config.TRACE is False
+
+
+def test_invalid_config_is_an_error():
+    with pytest.raises(SystemExit, match='BUFFERS_NUM'):
+        cli.main(['run', '--set', 'BUFFERS_NUM=0', *WORKLOAD])
+
+
+def test_workload_is_required():
+    with pytest.raises(SystemExit, match='workload is required'):
+        cli.main(['run'])
+
+
+def test_output_file(capsys, tmp_path):
+    path = tmp_path / 'out.json'
+    assert run_cli(capsys, 'run', '--format', 'json', '--output', str(path), *WORKLOAD) == ''
+    assert json.loads(path.read_text())[0]['completed'] is True
@@ -0,0 +1,55 @@
+import pytest
+
+from models.disk import HardDisk
+from simulation.clock import ms_to_ns, ns_to_us, us, us_to_ns
+
+
+def test_conversions():
+    assert us_to_ns(150) == 150_000
+    assert ms_to_ns(0.5) == 500_000
+    assert ns_to_us(1500) == 1.5
+    assert us(1999) == 1
+    assert isinstance(us_to_ns(1.5), int) and isinstance(ms_to_ns(2.5), int)
+
+
+@pytest.mark.parametrize('model', ['average', 'position'])
+def test_simulated_time_is_integer(make_simulator, model):
+    simulator = make_simulator(DISK_TIME_MODEL=model)
+    assert simulator.run() is True
+    assert isinstance(simulator.current_time, int)
+    assert all(isinstance(t, int) for latencies in simulator.driver.drivers[0].io_latencies.values()
+               for t in latencies)
+
+    # Statistics stay in us
+    stats = simulator.get_stats()
+    assert stats['total_time'] == ns_to_us(simulator.current_time)
+
+
+def test_run_until_time_in_ns(make_simulator):
+    simulator = make_simulator()
+    until_time = us_to_ns(50_000)
+    assert simulator.run(until_time) is False
+    assert until_time <= simulator.current_time
+
+    assert simulator.run() is True
+    resumed = simulator.get_stats()
+    plain = make_simulator()
+    plain.run()
+    assert resumed['total_time'] == plain.get_stats()['total_time']
+
+
+def test_position_model_waits_for_the_sector(make_config):
+    config = make_config(DISK_TIME_MODEL='position')
+    disk = HardDisk(config)
+    revolution = ms_to_ns(60 * 1000 / config.ROTATION_SPEED)
+    transfer = ms_to_ns(config.SECTOR_ACCESS_TIME)
+
+    # Sector 0 of track 0 is under the head at time 0 and again after every revolution
+    assert disk.access_sector(0, 'READ', 0) == transfer
+    assert disk.access_sector(0, 'READ', revolution) == transfer
+    half = config.SECTORS_PER_TRACK // 2
+    assert disk.access_sector(half, 'READ', 0) == revolution // 2 + transfer
+
+    average = HardDisk(make_config())
+    assert average.access_sector(half, 'READ', 0) == \
+        ms_to_ns(config.ROTATION_DELAY_TIME) + transfer
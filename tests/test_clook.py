@@ -0,0 +1,112 @@
+import pytest
+
+from driver.disk_driver import DiskDriver
+from models.buffer import Buffer
+from models.disk import HardDisk
+from simulation.clock import us_to_ns
+from strategies.clook import CLOOKStrategy
+
+
+def make_strategy(config, head_track: int = 0) -> CLOOKStrategy:
+    disk = HardDisk(config)
+    disk.current_track = head_track
+    return CLOOKStrategy(disk, config)
+
+
+def add(strategy, track_num: int, offset: int = 0):
+    sector_num = track_num * strategy.config.SECTORS_PER_TRACK + offset
+    buffer = Buffer(sector_num)
+    buffer.load_sector(sector_num, track_num)
+    strategy.add_request(buffer, 'READ')
+
+
+def dispatch(strategy, current_us: int = 0) -> int:
+    # Next request, the head moves to its track
+    buffer = strategy.get_next_buffer(us_to_ns(current_us))
+    strategy.disk.current_track = buffer.track_num
+    strategy.complete_io()
+    return buffer.track_num
+
+
+def dispatch_all(strategy) -> list:
+    tracks = []
+    while strategy.has_pending_requests():
+        tracks.append(dispatch(strategy))
+    return tracks
+
+
+def test_sweeps_out_in_track_order(make_config):
+    strategy = make_strategy(make_config())
+    for track_num in (30, 10, 20):
+        add(strategy, track_num)
+    assert dispatch_all(strategy) == [10, 20, 30]
+    assert strategy.get_next_buffer() is None
+
+
+def test_wraps_to_the_lowest_track(make_config):
+    strategy = make_strategy(make_config(), head_track=25)
+    for track_num in (10, 30, 20, 40):
+        add(strategy, track_num)
+    assert dispatch_all(strategy) == [30, 40, 10, 20]
+
+
+def test_sector_order_on_a_track(make_config):
+    config = make_config()
+    strategy = make_strategy(config)
+    for offset in (7, 2, 5):
+        add(strategy, 3, offset)
+    sectors = [strategy.get_next_buffer().sector_num % config.SECTORS_PER_TRACK for _ in range(3)]
+    assert sectors == [2, 5, 7]
+
+
+def test_batch_is_frozen_at_its_start(make_config):
+    strategy = make_strategy(make_config(), head_track=5)
+    for offset in range(3):
+        add(strategy, 5, offset)
+    add(strategy, 7)
+
+    assert dispatch(strategy) == 5
+    # Arrived during the batch: served on the next sweep
+    add(strategy, 5, 10)
+    assert dispatch_all(strategy) == [5, 5, 7, 5]
+
+
+@pytest.mark.parametrize('budget_us, expected', [(0, [5, 7, 5, 5]), (10**9, [5, 5, 5, 7])])
+def test_track_time_budget(make_config, budget_us, expected):
+    strategy = make_strategy(make_config(CLOOK_TRACK_TIME_BUDGET=budget_us), head_track=5)
+    for offset in range(3):
+        add(strategy, 5, offset)
+    add(strategy, 7)
+    assert dispatch_all(strategy) == expected
+
+
+def test_budget_spent_moves_on(make_config):
+    strategy = make_strategy(make_config(CLOOK_TRACK_TIME_BUDGET=1000), head_track=5)
+    for offset in range(3):
+        add(strategy, 5, offset)
+    add(strategy, 7)
+    assert [dispatch(strategy, current_us) for current_us in (0, 500, 1500, 2000)] == [5, 5, 7, 5]
+
+
+def test_requests_on_track_from_the_driver(make_config):
+    config = make_config()
+    disk = HardDisk(config)
+    strategy = CLOOKStrategy(disk, config)
+    driver = DiskDriver(disk, strategy)
+    assert strategy.driver is driver
+
+    for offset in range(2):
+        buffer = Buffer(offset)
+        buffer.load_sector(2 * config.SECTORS_PER_TRACK + offset, 2)
+        driver.schedule_io(buffer, 'READ')
+    assert strategy.requests_on_track(2) == 2
+    driver.start_next_io(0)
+    assert strategy.requests_on_track(2) == 1
+
+
+@pytest.mark.parametrize('depth', [1, 4])
+def test_simulation_completes(make_simulator, depth):
+    simulator = make_simulator(CLOOKStrategy, processes=6, DEVICE_QUEUE_DEPTH=depth)
+    assert simulator.run() is True
+    strategy = simulator.driver.drivers[0].strategy
+    assert strategy.queued == 0 and not strategy.tracks and not strategy.track_list
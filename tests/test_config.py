@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from config import CHOICES, SystemConfig
+
+
+def test_defaults():
+    config = SystemConfig()
+    assert config.BUFFERS_NUM == 10
+    assert config.ROTATION_DELAY_TIME == 60 * 1000 / config.ROTATION_SPEED / 2
+    assert repr(config) == "SystemConfig()"
+
+
+def test_immutable():
+    config = SystemConfig()
+    with pytest.raises(AttributeError):
+        config.BUFFERS_NUM = 20
+
+
+def test_replace_recomputes_derived_timings():
+    config = SystemConfig()
+    faster = config.replace(ROTATION_SPEED=15000)
+    assert faster.ROTATION_SPEED == 15000
+    assert faster.ROTATION_DELAY_TIME == config.ROTATION_DELAY_TIME / 2
+    assert config.ROTATION_SPEED == 7500
+    assert repr(faster) == "SystemConfig(ROTATION_SPEED=15000)"
+
+
+def test_equal_configs_are_one_key():
+    assert SystemConfig(BUFFERS_NUM=20) == SystemConfig().replace(BUFFERS_NUM='20')
+    assert hash(SystemConfig(BUFFERS_NUM=20)) == hash(SystemConfig(BUFFERS_NUM=20))
+    assert SystemConfig(BUFFERS_NUM=20) != SystemConfig()
+    assert len({SystemConfig(), SystemConfig(), SystemConfig(TRACE=False)}) == 2
+
+
+def test_values_converted_to_the_default_type():
+    config = SystemConfig(BUFFERS_NUM='20', TRACK_SEEK_TIME='1', TRACE='false', WRITE_FULL_SECTOR='1')
+    assert config.BUFFERS_NUM == 20 and isinstance(config.BUFFERS_NUM, int)
+    assert config.TRACK_SEEK_TIME == 1.0 and isinstance(config.TRACK_SEEK_TIME, float)
+    assert config.TRACE is False
+    assert config.WRITE_FULL_SECTOR is True
+
+
+@pytest.mark.parametrize('parameters, message', [
+    ({'BUFFERS_NUM': 0}, 'BUFFERS_NUM must be positive'),
+    ({'BUFFERS_NUM': 2.5}, 'BUFFERS_NUM must be an integer'),
+    ({'BUFFERS_NUM': 'many'}, 'BUFFERS_NUM must be an integer'),
+    ({'TRACK_SEEK_TIME': -1}, 'TRACK_SEEK_TIME must not be negative'),
+    ({'TRACE': 'yes'}, 'TRACE must be true or false'),
+    ({'BUFFERS_NUM': 5}, 'must be less than BUFFERS_NUM'),
+    ({'DISK_CACHE_SIZE': 1}, 'too small'),
+    ({'NO_SUCH_PARAMETER': 1}, 'Unknown config parameter'),
+    ({'ROTATION_DELAY_TIME': 1}, 'Unknown config parameter'),
+])
+def test_invalid_parameters(parameters, message):
+    with pytest.raises(ValueError, match=message):
+        SystemConfig(**parameters)
+
+
+@pytest.mark.parametrize('name', sorted(CHOICES))
+def test_choices(name):
+    for value in CHOICES[name]:
+        assert getattr(SystemConfig(**{name: value}), name) == value
+    with pytest.raises(ValueError, match=name):
+        SystemConfig(**{name: 'bogus'})
+
+
+def test_load_order(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({'BUFFERS_NUM': 20, 'QUANTUM_TIME': 10000, 'TRACKS_NUM': 500}))
+    env = {'HDSIM_QUANTUM_TIME': '30000', 'HDSIM_TRACKS_NUM': '600', 'OTHER': 'x'}
+
+    # Defaults, then the file, then the environment, then the overrides
+    config = SystemConfig.load(str(path), env=env, overrides={'TRACKS_NUM': 700})
+    assert (config.BUFFERS_NUM, config.QUANTUM_TIME, config.TRACKS_NUM) == (20, 30000, 700)
+
+    assert SystemConfig.load(env={}) == SystemConfig()
+    with pytest.raises(ValueError, match='BUFFERS_NUM'):
+        SystemConfig.load(env={'HDSIM_BUFFERS_NUM': 'ten'})
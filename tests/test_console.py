@@ -0,0 +1,64 @@
+from cache.lfu_cache import LFUCache
+from console import ChangeJournal, StateView
+
+
+class Component:
+    # Component with a state string that counts its renders
+    def __init__(self, config):
+        self.journal = ChangeJournal(config)
+        self.state_title = "TEST: Component"
+        self.state = 'first'
+        self.renders = 0
+
+    def get_state_string(self) -> str:
+        self.renders += 1
+        return f"TEST: Component {self.state}"
+
+
+def test_rendered_only_when_printed(make_config):
+    component = Component(make_config())
+    view = StateView(component)
+    assert component.renders == 0
+
+    # Live view: the state at the first print, kept afterwards
+    component.state = 'second'
+    assert str(view) == "TEST: Component second"
+    component.state = 'third'
+    assert str(view) == "TEST: Component second"
+    assert component.renders == 1
+
+
+def test_journal_is_kept_only_in_changes_mode(make_config):
+    assert not ChangeJournal(make_config(TRACE=True)).enabled
+    assert not ChangeJournal(make_config(TRACE_STATE='changes')).enabled
+
+    journal = ChangeJournal(make_config(TRACE=True, TRACE_STATE='changes'))
+    journal.record('b1', 'queued')
+    assert journal.take() == [('b1', 'queued')]
+    assert journal.take() == []
+
+
+def test_changes_mode_prints_changes_once(make_config):
+    cache = LFUCache(make_config(TRACE=True, TRACE_STATE='changes'))
+    cache.access_buffer(100, 0)
+    view = cache.get_state()
+    text = str(view)
+    assert text.startswith(cache.state_title + " changes:")
+    # Printing the same view again repeats it
+    assert str(view) == text
+    assert str(cache.get_state()) == f"{cache.state_title}: no changes"
+
+
+def test_full_mode_prints_the_state(make_config):
+    cache = LFUCache(make_config(TRACE=True))
+    cache.access_buffer(100, 0)
+    assert str(cache.get_state()) == cache.get_state_string()
+
+
+def test_changes_mode_prints_less(make_simulator, capsys):
+    sizes = {}
+    for mode in ('full', 'changes'):
+        simulator = make_simulator(processes=2, operations=10, TRACE=True, TRACE_STATE=mode)
+        assert simulator.run() is True
+        sizes[mode] = len(capsys.readouterr().out)
+    assert 0 < sizes['changes'] < sizes['full']
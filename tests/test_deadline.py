@@ -0,0 +1,82 @@
+from models.buffer import Buffer, IO_PRIORITY_BE, IO_PRIORITY_IDLE, IO_PRIORITY_RT
+from models.disk import HardDisk
+from simulation.clock import us_to_ns
+from strategies.deadline import DeadlineStrategy
+
+
+def make_strategy(config) -> DeadlineStrategy:
+    return DeadlineStrategy(HardDisk(config), config)
+
+
+def add(strategy, sector_num: int, operation: str = 'READ', priority: int = IO_PRIORITY_BE,
+        submit_us: int = 0):
+    buffer = Buffer(sector_num)
+    buffer.load_sector(sector_num, sector_num // strategy.config.SECTORS_PER_TRACK)
+    buffer.io_priority = priority
+    buffer.io_submit_time = us_to_ns(submit_us)
+    strategy.add_request(buffer, operation)
+
+
+def dispatch_all(strategy, current_us: int = 0) -> list:
+    order = []
+    while True:
+        buffer = strategy.get_next_buffer(us_to_ns(current_us))
+        if buffer is None:
+            return order
+        order.append((buffer.sector_num, buffer.io_operation))
+        strategy.complete_io()
+
+
+def test_batch_in_sector_order(make_config):
+    strategy = make_strategy(make_config())
+    for sector_num in (500, 100, 300):
+        add(strategy, sector_num)
+    assert [s for s, _ in dispatch_all(strategy)] == [100, 300, 500]
+    assert not strategy.has_pending_requests()
+
+
+def test_realtime_class_goes_first(make_config):
+    strategy = make_strategy(make_config())
+    add(strategy, 100)
+    add(strategy, 900, priority=IO_PRIORITY_RT)
+    add(strategy, 50, priority=IO_PRIORITY_IDLE)
+    assert [s for s, _ in dispatch_all(strategy)] == [900, 100, 50]
+
+
+def test_expired_request_starts_the_batch(make_config):
+    config = make_config(DEADLINE_READ_EXPIRE=1000, DEADLINE_FIFO_BATCH=1)
+    strategy = make_strategy(config)
+    add(strategy, 900, submit_us=0)
+    add(strategy, 100, submit_us=1500)
+    # Sector 900 has waited 2000 us, longer than read_expire
+    assert [s for s, _ in dispatch_all(strategy, current_us=2000)] == [900, 100]
+
+    strategy = make_strategy(config)
+    add(strategy, 900, submit_us=0)
+    add(strategy, 100, submit_us=0)
+    assert [s for s, _ in dispatch_all(strategy, current_us=500)] == [100, 900]
+
+
+def test_writes_are_not_starved(make_config):
+    strategy = make_strategy(make_config(DEADLINE_WRITES_STARVED=2, DEADLINE_FIFO_BATCH=1))
+    for sector_num in (100, 200, 300, 400):
+        add(strategy, sector_num)
+    add(strategy, 50, operation='WRITE')
+    assert [op for _, op in dispatch_all(strategy)] == ['READ', 'READ', 'WRITE', 'READ', 'READ']
+
+
+def test_aged_lower_class_jumps_ahead(make_config):
+    strategy = make_strategy(make_config(DEADLINE_PRIO_AGING_EXPIRE=1000))
+    add(strategy, 100, priority=IO_PRIORITY_RT, submit_us=1900)
+    add(strategy, 900, priority=IO_PRIORITY_IDLE, submit_us=0)
+    assert [s for s, _ in dispatch_all(strategy, current_us=2000)] == [900, 100]
+
+
+def test_simulation_reports_latencies(make_simulator):
+    simulator = make_simulator(DeadlineStrategy, processes=6)
+    assert simulator.run() is True
+
+    stats = simulator.get_stats()
+    assert 0 < stats['read_latency_p50'] <= stats['read_latency_p99'] <= stats['read_latency_max']
+    assert stats['write_latency_p99'] > 0
+    assert not simulator.driver.has_pending_requests()
@@ -0,0 +1,68 @@
+import pytest
+
+from driver.disk_driver import DiskDriver
+from models.buffer import Buffer
+from models.disk import HardDisk
+from strategies.fifo import FIFOStrategy
+
+
+def watch_driver(simulator) -> dict:
+    # Order requests leave the strategy and are served by the drive,
+    # largest number of commands in the drive at a start
+    driver = simulator.driver.drivers[0]
+    orders = {'dispatched': [], 'served': [], 'max_outstanding': 0}
+    get_next_buffer = driver.strategy.get_next_buffer
+    access_sector = driver.disk.access_sector
+
+    def watched_get_next_buffer(*args):
+        buffer = get_next_buffer(*args)
+        if buffer is not None:
+            orders['dispatched'].append(buffer.sector_num)
+        return buffer
+
+    def watched_access_sector(sector_num, *args):
+        orders['served'].append(sector_num)
+        orders['max_outstanding'] = max(orders['max_outstanding'], len(driver.device_queue) + 1)
+        return access_sector(sector_num, *args)
+
+    driver.strategy.get_next_buffer = watched_get_next_buffer
+    driver.disk.access_sector = watched_access_sector
+    return orders
+
+
+def test_depth_one_serves_in_strategy_order(make_simulator):
+    simulator = make_simulator(processes=6, DEVICE_QUEUE_DEPTH=1)
+    orders = watch_driver(simulator)
+    assert simulator.run() is True
+
+    assert orders['served'] == orders['dispatched']
+    assert orders['max_outstanding'] == 1
+
+
+@pytest.mark.parametrize('depth', [2, 4])
+def test_deeper_queue_reorders_within_depth(make_simulator, depth):
+    simulator = make_simulator(processes=8, read_ratio=0.2, DEVICE_QUEUE_DEPTH=depth)
+    orders = watch_driver(simulator)
+    assert simulator.run() is True
+
+    assert sorted(orders['served']) == sorted(orders['dispatched'])
+    assert 1 < orders['max_outstanding'] <= depth
+    assert not simulator.driver.has_active_io()
+
+
+def test_drive_starts_the_nearest_queued_command(make_config):
+    config = make_config(DEVICE_QUEUE_DEPTH=3)
+    disk = HardDisk(config)
+    driver = DiskDriver(disk, FIFOStrategy(disk, config))
+    for i, track_num in enumerate((900, 10, 500)):
+        buffer = Buffer(i)
+        buffer.load_sector(track_num * config.SECTORS_PER_TRACK, track_num)
+        driver.schedule_io(buffer, 'READ')
+
+    started = [driver.start_next_io(0)[0].track_num]
+    while driver.device_queue or driver.current_operation:
+        buffer, operation, completion_time = driver.current_operation
+        driver.complete_io(buffer, operation)
+        if driver.current_operation:
+            started.append(driver.current_operation[0].track_num)
+    assert started == [10, 500, 900]
@@ -0,0 +1,70 @@
+import pytest
+
+from models.disk_array import ConcatLayout, MirrorLayout, StripeLayout
+
+
+def test_single_disk_layout_is_the_plain_simulator(make_simulator, make_config):
+    config = make_config()
+    plain = make_simulator(config=config)
+    plain.run()
+    concat = make_simulator(config=config, layout=ConcatLayout(config, 1))
+    concat.run()
+    assert concat.get_stats() == plain.get_stats()
+
+
+def test_concat_layout(make_config):
+    config = make_config()
+    layout = ConcatLayout(config, 2)
+    sectors_per_disk = config.TRACKS_NUM * config.SECTORS_PER_TRACK
+    assert layout.disks_for_sector(5) == [0]
+    assert layout.disks_for_sector(sectors_per_disk + 5) == [1]
+    assert layout.physical_sector(1, sectors_per_disk + 5) == 5
+
+
+def test_stripe_layout(make_config):
+    layout = StripeLayout(make_config(), 3, stripe_sectors=4)
+    assert [layout.disks_for_sector(s)[0] for s in range(0, 28, 4)] == [0, 1, 2, 0, 1, 2, 0]
+    # Stripe 4 (sectors 16..19) is the second stripe of disk 1
+    assert layout.physical_sector(1, 17) == 5
+
+
+def test_mirror_layout(make_config):
+    layout = MirrorLayout(make_config(), 2)
+    assert layout.disks_for_sector(123) == [0, 1]
+    assert layout.physical_sector(1, 123) == 123
+
+
+def test_stripe_overlaps_io(make_simulator, make_config):
+    config = make_config()
+    single = make_simulator(config=config, processes=8, read_ratio=1.0)
+    single.run()
+    striped = make_simulator(config=config, processes=8, read_ratio=1.0, layout=StripeLayout(config, 4))
+    striped.run()
+
+    assert striped.get_stats()['completed'] is True
+    assert striped.get_stats()['total_time'] < single.get_stats()['total_time']
+    assert all(driver.io_latencies['READ'] for driver in striped.driver.drivers)
+
+
+def test_mirror_writes_every_copy_and_reads_one(make_simulator, make_config):
+    config = make_config()
+    simulator = make_simulator(config=config, layout=MirrorLayout(config, 2))
+    assert simulator.run() is True
+
+    first, second = simulator.driver.drivers
+    assert len(first.io_latencies['WRITE']) == len(second.io_latencies['WRITE']) > 0
+
+    plain = make_simulator(config=config)
+    plain.run()
+    reads = len(first.io_latencies['READ']) + len(second.io_latencies['READ'])
+    assert reads == len(plain.driver.drivers[0].io_latencies['READ'])
+    assert not simulator.driver.pending_copies
+
+
+@pytest.mark.parametrize('layout_class', [ConcatLayout, StripeLayout, MirrorLayout])
+def test_layouts_complete_and_leave_no_pending_io(make_simulator, make_config, layout_class):
+    config = make_config()
+    simulator = make_simulator(config=config, layout=layout_class(config, 2))
+    assert simulator.run() is True
+    assert not simulator.driver.has_active_io()
+    assert not simulator.driver.has_pending_requests()
@@ -0,0 +1,93 @@
+import csv
+import io
+
+import cli
+from models.disk import HardDisk
+from models.disk_cache import TrackBuffer
+from simulation.clock import ms_to_ns
+
+
+def test_read_ahead_fills_the_segment(make_config):
+    config = make_config(DISK_CACHE_SIZE=64, DISK_CACHE_SEGMENTS=16)
+    track_buffer = TrackBuffer(config)
+    assert track_buffer.segment_sectors == 8
+    transfer = track_buffer.sector_access_time
+
+    assert track_buffer.lookup(3, 10) is None
+    track_buffer.start_read_ahead(3, 10, 1000)
+    assert track_buffer.lookup(3, 10) == 1000
+    assert track_buffer.lookup(3, 15) == 1000 + 5 * transfer
+    assert track_buffer.lookup(3, 18) is None
+    assert track_buffer.lookup(3, 9) is None
+    assert (track_buffer.hits, track_buffer.misses) == (2, 3)
+
+
+def test_segment_ends_with_the_track(make_config):
+    config = make_config(DISK_CACHE_SIZE=64, DISK_CACHE_SEGMENTS=16)
+    track_buffer = TrackBuffer(config)
+    last = config.SECTORS_PER_TRACK - 2
+    track_buffer.start_read_ahead(3, last, 0)
+    assert track_buffer.segments[3][1] == config.SECTORS_PER_TRACK
+
+
+def test_stopped_read_ahead_keeps_the_sectors_read(make_config):
+    track_buffer = TrackBuffer(make_config(DISK_CACHE_SIZE=64, DISK_CACHE_SEGMENTS=16))
+    transfer = track_buffer.sector_access_time
+    track_buffer.start_read_ahead(3, 10, 1000)
+
+    track_buffer.stop_read_ahead(1000 + 2 * transfer)
+    assert track_buffer.lookup(3, 12) is not None
+    assert track_buffer.lookup(3, 13) is None
+    # Stopping again changes nothing
+    track_buffer.stop_read_ahead(1000 + 5 * transfer)
+    assert track_buffer.lookup(3, 12) is not None
+
+
+def test_least_recently_used_segment_is_replaced(make_config):
+    track_buffer = TrackBuffer(make_config(DISK_CACHE_SIZE=64, DISK_CACHE_SEGMENTS=2))
+    track_buffer.start_read_ahead(1, 0, 0)
+    track_buffer.start_read_ahead(2, 0, 0)
+    track_buffer.lookup(1, 0)
+    track_buffer.start_read_ahead(3, 0, 0)
+    assert list(track_buffer.segments) == [1, 3]
+
+
+def test_buffered_read_costs_only_the_transfer(make_config):
+    config = make_config(DISK_CACHE_SIZE=1024)
+    disk = HardDisk(config)
+    transfer = ms_to_ns(config.SECTOR_ACCESS_TIME)
+    sector_num = 100 * config.SECTORS_PER_TRACK
+
+    duration = disk.access_sector(sector_num, 'READ', 0)
+    assert duration > transfer
+    assert disk.access_sector(sector_num + 3, 'READ', duration + 10 * transfer) == transfer
+    # The read-ahead has not reached the sector yet: the drive waits for it
+    assert disk.access_sector(sector_num + 5, 'READ', duration) == 6 * transfer
+
+    # A write goes to the platter and stops the read-ahead after 21 sectors
+    assert disk.access_sector(sector_num + 1, 'WRITE', duration + 20 * transfer) > transfer
+    assert disk.track_buffer.lookup(100, 20) is not None
+    assert disk.track_buffer.lookup(100, 21) is None
+
+
+def test_sequential_workload_hits_the_drive_cache(make_simulator):
+    cached = make_simulator(pattern='sequential', read_ratio=1.0, DISK_CACHE_SIZE=256)
+    assert cached.run() is True
+    plain = make_simulator(pattern='sequential', read_ratio=1.0)
+    plain.run()
+
+    stats = cached.get_stats()
+    assert stats['disk_cache_hits'] > 0
+    assert stats['total_time'] < plain.get_stats()['total_time']
+    assert 'disk_cache_hits' not in plain.get_stats()
+
+
+def test_sweep_rows_with_different_columns(capsys):
+    argv = ['sweep', '--grid', 'DISK_CACHE_SIZE=0,256', '--strategies', 'look',
+            '--generate', 'uniform', '--processes', '2', '--operations', '20']
+    assert cli.main(argv + ['--format', 'csv']) == 0
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert [row['disk_cache_misses'] for row in rows] == ['', '40']
+
+    assert cli.main(argv) == 0
+    assert 'disk_cache_misses' in capsys.readouterr().out
@@ -0,0 +1,142 @@
+import pytest
+
+from driver.disk_array import DiskArray
+from driver.disk_driver import DiskDriver
+from models.buffer import Buffer
+from models.disk import HardDisk
+from models.process import Process
+from strategies.fifo import FIFOStrategy
+
+
+def make_driver(config) -> DiskDriver:
+    disk = HardDisk(config)
+    return DiskDriver(disk, FIFOStrategy(disk, config))
+
+
+def make_buffer(config, sector_num: int, index: int = 0) -> Buffer:
+    buffer = Buffer(index)
+    buffer.load_sector(sector_num, sector_num // config.SECTORS_PER_TRACK)
+    return buffer
+
+
+def complete(driver) -> list:
+    buffer, operation, _ = driver.current_operation
+    return driver.complete_io(buffer, operation)
+
+
+def test_same_request_is_not_repeated(make_config):
+    config = make_config()
+    driver = make_driver(config)
+    buffer = make_buffer(config, 1000)
+    request = driver.schedule_io(buffer, 'READ')
+    assert driver.schedule_io(buffer, 'READ') is request
+    assert len(driver.strategy.queue) == 1
+    assert driver.requests_on_track(2) == 1
+    assert driver.pending == {1000: [request]}
+
+    # The other operation is queued and indexed after the first request
+    write = driver.schedule_io(make_buffer(config, 1000, 1), 'WRITE')
+    assert driver.pending == {1000: [request, write]}
+    assert driver.requests_on_track(2) == 2
+
+
+def test_later_request_for_the_sector_keeps_its_waiters(make_config):
+    config = make_config()
+    driver = make_driver(config)
+    process = Process('p', [])
+    # Write-back of the old buffer, then the read of the sector into a new one
+    driver.schedule_io(make_buffer(config, 1000), 'WRITE')
+    read = driver.schedule_io(make_buffer(config, 1000, 1), 'READ')
+    assert driver.add_waiter(1000, process, None)
+
+    driver.start_next_io(0)
+    completion_time = driver.current_operation[2]
+    assert complete(driver) == []
+    assert driver.pending == {1000: [read]}
+
+    driver.start_next_io(completion_time)
+    assert complete(driver) == [(process, None)]
+    assert driver.pending == {}
+
+
+def test_track_requests_count_the_strategy_queue(make_config):
+    config = make_config()
+    driver = make_driver(config)
+    for i, sector_num in enumerate((1000, 1001, 5000)):
+        driver.schedule_io(make_buffer(config, sector_num, i), 'READ')
+    assert driver.track_requests == {2: 2, 10: 1}
+
+    driver.start_next_io(0)
+    assert driver.track_requests == {2: 1, 10: 1}
+    while driver.current_operation:
+        completion_time = driver.current_operation[2]
+        complete(driver)
+        driver.start_next_io(completion_time)
+    assert driver.track_requests == {} and driver.pending == {}
+
+
+def test_waiters_are_returned_on_completion(make_config):
+    config = make_config()
+    driver = make_driver(config)
+    first, second = Process('first', []), Process('second', [])
+    assert not driver.add_waiter(1000, first, None)
+
+    driver.schedule_io(make_buffer(config, 1000), 'READ')
+    assert driver.add_waiter(1000, first, None)
+    assert driver.add_waiter(1000, second, 'ar')
+    # A blocked process woken and blocked again waits after the others
+    assert driver.add_waiter(1000, first, None)
+
+    driver.start_next_io(0)
+    assert complete(driver) == [(second, 'ar'), (first, None)]
+    assert not driver.pending
+
+
+def test_write_has_no_waiters(make_config):
+    config = make_config()
+    driver = make_driver(config)
+    driver.schedule_io(make_buffer(config, 1000), 'WRITE')
+    assert not driver.add_waiter(1000, Process('p', []), None)
+
+
+def test_parked_waiters_move_to_the_read(make_config):
+    config = make_config()
+    array = DiskArray([make_driver(config)])
+    early, late = Process('early', []), Process('late', [])
+
+    # Nothing is being read yet: the process is parked
+    array.add_waiter(1000, early, None)
+    assert array.parked_waiters == {1000: [(early, None)]}
+
+    array.schedule_io(make_buffer(config, 1000), 'READ')
+    array.add_waiter(1000, late, None)
+    assert array.parked_waiters == {}
+    assert array.drivers[0].pending[1000][0].waiters == [(early, None), (late, None)]
+
+
+def test_discard_waiter(make_config):
+    config = make_config()
+    array = DiskArray([make_driver(config)])
+    first, second = Process('first', []), Process('second', [])
+    array.add_waiter(1000, first, None)
+    array.add_waiter(1000, second, 'ar')
+
+    array.discard_waiter(1000, first)
+    assert array.parked_waiters == {1000: [(second, 'ar')]}
+    # Asynchronous waiters are not blocked processes, they stay
+    array.discard_waiter(1000, second)
+    assert array.parked_waiters == {1000: [(second, 'ar')]}
+
+    array.add_waiter(2000, first, None)
+    array.discard_waiter(2000, first)
+    assert 2000 not in array.parked_waiters
+
+
+@pytest.mark.parametrize('parameters', [{}, {'DEVICE_QUEUE_DEPTH': 4}, {'WRITE_FULL_SECTOR': True}])
+def test_index_is_empty_after_a_run(make_simulator, parameters):
+    simulator = make_simulator(processes=6, **parameters)
+    assert simulator.run() is True
+    driver = simulator.driver.drivers[0]
+    assert driver.pending == {}
+    assert driver.track_requests == {}
+    assert simulator.driver.parked_waiters == {}
@@ -0,0 +1,75 @@
+import pytest
+
+from models.process import Process
+from simulation.simulator import Simulator
+from strategies.look import LOOKStrategy
+
+
+def test_consumes_operations_round_robin(make_simulator):
+    simulator = make_simulator(processes=4, operations=40)
+    assert simulator.fast_forward(30) == 30
+
+    cursors = [p.current_op_index for p in simulator.process_scheduler.ready_queue]
+    assert sum(cursors) == 30
+    assert max(cursors) - min(cursors) <= 1
+    assert simulator.warmup_operations == 30
+
+
+def test_stops_when_processes_end(make_simulator):
+    simulator = make_simulator(processes=2, operations=5)
+    assert simulator.fast_forward(100) == 10
+    assert simulator.run() is True
+
+
+def test_warms_the_cache(make_simulator):
+    simulator = make_simulator(processes=1, operations=3, read_ratio=1.0)
+    process = simulator.process_scheduler.ready_queue[0]
+    sectors = [process.operations[i][1] for i in range(3)]
+
+    simulator.fast_forward(3)
+    assert all(simulator.cache.lookup_buffer(sector) for sector in sectors)
+
+
+def test_counts_write_backs_of_modified_victims(make_simulator):
+    simulator = make_simulator(processes=2, operations=100, read_ratio=0.0)
+    simulator.fast_forward(100, through_strategy=True)
+
+    # Every write misses, every miss after the cache is full evicts a modified buffer
+    buffers_num = simulator.config.BUFFERS_NUM
+    assert simulator.warmup_write_backs == 100 - buffers_num
+    assert simulator.get_stats()['warmup_write_backs'] == simulator.warmup_write_backs
+
+
+def test_through_strategy_moves_the_head(make_config):
+    config = make_config()
+    sector = 1000 * config.SECTORS_PER_TRACK
+    simulator = Simulator(config, LOOKStrategy)
+    simulator.add_process(Process('p', [('r', sector)]))
+
+    simulator.fast_forward(1, through_strategy=True)
+    assert simulator.disk.current_track == 1000
+    assert not simulator.driver.has_pending_requests()
+    # The warm-up read is not part of the run statistics
+    driver = simulator.driver.drivers[0]
+    assert driver.pending == {} and driver.track_requests == {}
+    assert driver.io_latencies == {'READ': [], 'WRITE': []}
+    assert simulator.get_stats()['total_seeks'] == 0
+
+
+def test_refused_with_queued_io(make_config):
+    config = make_config()
+    simulator = Simulator(config, LOOKStrategy)
+    process = Process('p', [('r', 5000), ('r', 12000), ('r', 13000)])
+    simulator.add_process(process)
+    simulator.syscalls.request_buffer(process, 'r', 5000, 0)
+    assert simulator.driver.has_pending_requests()
+
+    with pytest.raises(ValueError):
+        simulator.fast_forward(2, through_strategy=True)
+    assert simulator.driver.drivers[0].pending[5000][0].operation == 'READ'
+
+
+def test_stats_without_warmup_have_no_write_backs(make_simulator):
+    simulator = make_simulator()
+    simulator.run()
+    assert 'warmup_write_backs' not in simulator.get_stats()
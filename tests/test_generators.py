@@ -0,0 +1,82 @@
+import pytest
+
+from workload.generators import (GeneratedOperations, derive_seed, generate_processes,
+                                 make_pattern)
+
+
+PATTERNS = ('uniform', 'zipf', 'sequential', 'hotspot')
+
+
+def test_derive_seed_separates_seed_and_index():
+    # seed + index arithmetic made (0, 1) and (1, 0) the same stream
+    assert derive_seed(0, 1) != derive_seed(1, 0)
+    assert derive_seed(1, 23) != derive_seed(12, 3)
+    assert derive_seed(5, 2) == derive_seed(5, 2)
+
+
+@pytest.mark.parametrize('name', PATTERNS)
+def test_patterns_stay_on_the_disk(make_config, name):
+    config = make_config()
+    operations = GeneratedOperations(make_pattern(config, name), 2000, seed=1)
+    total_sectors = config.TRACKS_NUM * config.SECTORS_PER_TRACK
+    assert all(0 <= sector < total_sectors for _, sector in operations)
+
+
+def test_same_seed_same_operations(make_config):
+    config = make_config()
+    pattern = make_pattern(config, 'zipf')
+    first = generate_processes(config, pattern, 3, 100, seed=7)
+    second = generate_processes(config, pattern, 3, 100, seed=7)
+    assert [list(p.operations) for p in first] == [list(p.operations) for p in second]
+
+
+def test_processes_and_seeds_have_different_streams(make_config):
+    config = make_config()
+    pattern = make_pattern(config, 'uniform')
+    streams = [list(p.operations) for p in generate_processes(config, pattern, 3, 50, seed=0)]
+    streams += [list(p.operations) for p in generate_processes(config, pattern, 3, 50, seed=1)]
+    assert len({tuple(stream) for stream in streams}) == len(streams)
+
+
+def test_random_access_matches_iteration(make_config):
+    config = make_config()
+    operations = GeneratedOperations(make_pattern(config, 'hotspot'), 250, seed=3, chunk_size=64)
+    expected = list(operations)
+    assert len(expected) == 250
+    assert [operations[i] for i in (249, 0, 130, 64, 63)] == [expected[i] for i in (249, 0, 130, 64, 63)]
+    assert operations[-1] == expected[-1]
+    assert operations[10:13] == expected[10:13]
+    with pytest.raises(IndexError):
+        operations[250]
+
+
+def test_read_ratio(make_config):
+    config = make_config()
+    pattern = make_pattern(config, 'uniform')
+    assert {op for op, _ in GeneratedOperations(pattern, 200, read_ratio=1.0)} == {'r'}
+    assert {op for op, _ in GeneratedOperations(pattern, 200, read_ratio=0.0)} == {'w'}
+    with pytest.raises(ValueError):
+        GeneratedOperations(pattern, 10, read_ratio=1.5)
+
+
+def test_sequential_runs(make_config):
+    config = make_config()
+    total_sectors = config.TRACKS_NUM * config.SECTORS_PER_TRACK
+    pattern = make_pattern(config, 'sequential', run_length=8)
+    sectors = [sector for _, sector in GeneratedOperations(pattern, 32)]
+    for start in range(0, 32, 8):
+        run = sectors[start:start + 8]
+        assert run == [(run[0] + offset) % total_sectors for offset in range(8)]
+
+
+def test_hotspot_concentrates_on_hot_tracks(make_config):
+    config = make_config()
+    pattern = make_pattern(config, 'hotspot', hot_tracks=10, hot_fraction=0.9, hot_start_track=100)
+    tracks = [sector // config.SECTORS_PER_TRACK for _, sector in GeneratedOperations(pattern, 2000)]
+    hot = sum(100 <= track < 110 for track in tracks)
+    assert hot / len(tracks) > 0.8
+
+
+def test_unknown_pattern(make_config):
+    with pytest.raises(ValueError):
+        make_pattern(make_config(), 'bogus')
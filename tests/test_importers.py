@@ -0,0 +1,87 @@
+import gzip
+
+import pytest
+
+from workload.importers import import_blkparse, import_msr, import_trace
+
+
+BLKPARSE = [
+    "  8,0    3        1     0.000000000   697  Q   W 1000 + 8 [kjournald]\n",
+    "  8,0    3        2     0.000000100   697  G   W 1000 + 8 [kjournald]\n",
+    "  8,0    1        3     0.000250000   812  Q  RA 40 + 2 [cat]\n",
+    "  8,0    1        4     0.000300000   812  Q  FN 0 + 0 [cat]\n",
+    "  8,0    3        5     1.000001500   697  Q  WS 2000 + 1 [kjournald]\n",
+    "CPU3 (8,0):\n",
+]
+
+MSR = [
+    "Timestamp,Hostname,DiskNumber,Type,Offset,Size,ResponseTime\n",
+    "128166372003061629,hm,0,Read,4096,1024,100\n",
+    "128166372003061639,hm,0,Write,0,512,100\n",
+    "128166372003062629,hm,1,Read,1024,100,100\n",
+]
+
+
+def streams(processes) -> dict:
+    return {process.name: process.operations for process in processes}
+
+
+def test_blkparse_queued_requests(make_config):
+    result = streams(import_blkparse(BLKPARSE, make_config()))
+    assert list(result) == ['kjournald-697', 'cat-812']
+
+    journal = result['kjournald-697']
+    # Only Q events, one operation per 512-byte sector, RWBS gives the operation
+    assert list(journal) == [('w', s) for s in range(1000, 1008)] + [('w', 2000)]
+    assert list(result['cat-812']) == [('r', 40), ('r', 41)]
+
+
+def test_blkparse_exact_times(make_config):
+    journal = streams(import_blkparse(BLKPARSE, make_config()))['kjournald-697']
+    assert journal.arrival_time(0) == 0.0
+    assert journal.arrival_time(8) == 1000001.5
+
+
+def test_blkparse_other_actions(make_config):
+    result = streams(import_blkparse(BLKPARSE, make_config(), actions='G'))
+    assert list(result) == ['kjournald-697']
+    assert len(result['kjournald-697']) == 8
+
+
+def test_msr_times_streams_and_sizes(make_config):
+    result = streams(import_msr(MSR, make_config()))
+    assert list(result) == ['hm-0', 'hm-1']
+
+    disk = result['hm-0']
+    assert list(disk) == [('r', 8), ('r', 9), ('w', 0)]
+    # 100 ns ticks: 10 ticks are 1 us, large timestamps keep their precision
+    assert [disk.arrival_time(i) for i in range(3)] == [0.0, 0.0, 1.0]
+    assert result['hm-1'].arrival_time(0) == 100.0
+    # A partial sector is one operation
+    assert list(result['hm-1']) == [('r', 2)]
+
+
+def test_max_sectors_and_requests(make_config):
+    config = make_config()
+    journal = streams(import_blkparse(BLKPARSE, config, max_sectors=3))['kjournald-697']
+    assert list(journal) == [('w', 1000), ('w', 1001), ('w', 1002), ('w', 2000)]
+
+    assert len(import_msr(MSR, config, max_requests=1)) == 1
+    with pytest.raises(ValueError):
+        import_msr(MSR, config, max_sectors=0)
+
+
+def test_sectors_fold_into_the_disk(make_config):
+    config = make_config(TRACKS_NUM=2, SECTORS_PER_TRACK=4)
+    line = "  8,0    0        1     0.0   1  Q   R 10 + 1 [dd]\n"
+    assert list(import_blkparse([line], config)[0].operations) == [('r', 2)]
+
+
+def test_gzip_file(make_config, tmp_path):
+    path = tmp_path / 'trace.csv.gz'
+    with gzip.open(path, 'wt') as f:
+        f.writelines(MSR)
+    assert streams(import_trace(str(path), make_config(), 'msr')).keys() == {'hm-0', 'hm-1'}
+
+    with pytest.raises(ValueError):
+        import_trace(str(path), make_config(), 'bogus')
@@ -0,0 +1,92 @@
+from cache.base_cache import HIT, IN_FLIGHT, MISS
+from cache.lfu_cache import LFUCache
+
+
+def make_cache(make_config, **parameters) -> LFUCache:
+    return LFUCache(make_config(**parameters))
+
+
+def load(cache, sector_num: int):
+    # Miss, then the read completes
+    state, buffer = cache.lookup_or_reserve(sector_num)
+    assert state == MISS
+    buffer.load_sector(sector_num, 0)
+    cache.add_buffer_to_cache(buffer)
+    return buffer
+
+
+def segments_match(cache) -> bool:
+    segments = {'Left': cache.left_segment, 'Middle': cache.middle_segment, 'Right': cache.right_segment}
+    return all(b.segment == name for name, segment in segments.items() for b in segment)
+
+
+def test_miss_reserves_a_buffer(make_config):
+    cache = make_cache(make_config)
+    state, buffer = cache.lookup_or_reserve(100)
+    assert state == MISS and buffer.segment is None
+    assert cache.find_buffer(100) is None
+
+    # The sector is being read into the reserved buffer
+    buffer.load_sector(100, 0)
+    assert cache.lookup_or_reserve(100) == (IN_FLIGHT, buffer)
+
+    cache.add_buffer_to_cache(buffer)
+    assert cache.lookup_or_reserve(100) == (HIT, buffer)
+
+
+def test_hit_moves_to_the_left_segment(make_config):
+    cache = make_cache(make_config)
+    first = load(cache, 0)
+    for sector_num in range(1, 6):
+        load(cache, sector_num)
+    assert first.segment != 'Left'
+
+    counter = first.access_counter
+    assert cache.lookup_or_reserve(0) == (HIT, first)
+    assert cache.left_segment[0] is first
+    assert first.access_counter == counter + 1
+    assert segments_match(cache)
+
+
+def test_segments_stay_within_their_sizes(make_config):
+    cache = make_cache(make_config)
+    for i in range(200):
+        sector_num = (i * 7) % 30
+        state, buffer = cache.lookup_or_reserve(sector_num)
+        if state == MISS:
+            buffer.load_sector(sector_num, 0)
+            cache.add_buffer_to_cache(buffer)
+
+        assert len(cache.left_segment) <= cache.left_max
+        assert len(cache.middle_segment) <= cache.middle_max
+        assert segments_match(cache)
+    cached = len(cache.left_segment) + len(cache.middle_segment) + len(cache.right_segment)
+    assert cached + len(cache.free_buffers) == cache.total_buffers
+
+
+def test_modified_victim_stays_in_flight(make_config):
+    cache = make_cache(make_config)
+    for sector_num in range(cache.total_buffers):
+        load(cache, sector_num).mark_modified()
+
+    state, victim = cache.lookup_or_reserve(500)
+    assert state == MISS and victim.modified
+    # Until it is written back the old sector is in flight, the new one is not reserved
+    assert cache.lookup_or_reserve(victim.sector_num) == (IN_FLIGHT, victim)
+    assert 500 not in cache.sector_to_buffer
+
+    old_sector = victim.sector_num
+    cache.release_buffer(victim)
+    assert old_sector not in cache.sector_to_buffer
+    assert cache.free_buffers == [victim]
+
+
+def test_every_buffer_in_io(make_config):
+    cache = make_cache(make_config)
+    for sector_num in range(cache.total_buffers):
+        state, buffer = cache.lookup_or_reserve(sector_num)
+        buffer.load_sector(sector_num, 0)
+        buffer.io_operation = 'READ'
+    assert cache.lookup_or_reserve(500) == (MISS, None)
+    assert not cache.can_get_free_buffer()
+    assert cache.get_free_buffer() is None
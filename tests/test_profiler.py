@@ -0,0 +1,71 @@
+import cli
+from simulation.profiler import Profiler
+
+
+def test_profiled_run_gives_the_same_result(make_simulator):
+    plain = make_simulator()
+    plain.run()
+
+    simulator = make_simulator()
+    profiler = Profiler()
+    profiler.attach(simulator)
+    assert simulator.run() is True
+    assert simulator.get_stats() == plain.get_stats()
+
+
+def test_summary_counts_calls(make_simulator):
+    simulator = make_simulator()
+    profiler = Profiler()
+    profiler.attach(simulator, label='look')
+    simulator.run()
+
+    rows = {row['method']: row for row in profiler.summary()}
+    assert rows['Simulator.run']['calls'] == 1
+    assert rows['LFUCache.lookup_or_reserve']['calls'] > 0
+    assert rows['HardDisk.access_sector']['calls'] == simulator.get_stats()['total_seeks']
+    for row in rows.values():
+        assert 0 <= row['self_ns'] <= row['total_ns']
+    # Self times add up to the time of the run
+    assert sum(row['self_ns'] for row in rows.values()) == rows['Simulator.run']['total_ns']
+
+    assert all(path[0] == 'look' for path in profiler.stacks)
+    assert ('look', 'Simulator.run', 'Simulator._execute_read',
+            'SystemCalls.sys_read', 'SystemCalls.request_buffer') in profiler.stacks
+
+
+def test_collapsed_stacks(make_simulator, tmp_path):
+    simulator = make_simulator()
+    profiler = Profiler()
+    profiler.attach(simulator)
+    simulator.run()
+
+    path = tmp_path / 'run.folded'
+    profiler.write_collapsed(str(path))
+    lines = path.read_text().splitlines()
+    assert lines == profiler.collapsed()
+    assert lines[0].startswith('Simulator.run')
+    for line in lines:
+        stack, self_time = line.rsplit(' ', 1)
+        assert stack.split(';')[0] == 'Simulator.run' and int(self_time) > 0
+
+
+def test_detach_removes_the_wrappers(make_simulator):
+    simulator = make_simulator()
+    profiler = Profiler()
+    profiler.attach(simulator)
+    assert 'run' in vars(simulator)
+
+    profiler.detach()
+    assert 'run' not in vars(simulator)
+    assert 'access_sector' not in vars(simulator.disks[0])
+    simulator.run()
+    assert profiler.stacks == {}
+
+
+def test_cli_profile(capsys, tmp_path):
+    path = tmp_path / 'sim.folded'
+    argv = ['compare', '--strategies', 'look,clook', '--profile', str(path),
+            '--generate', 'uniform', '--processes', '2', '--operations', '20']
+    assert cli.main(argv) == 0
+    assert 'Simulator.run' in capsys.readouterr().err
+    assert {line.split(';')[0] for line in path.read_text().splitlines()} == {'look', 'clook'}
@@ -0,0 +1,64 @@
+from models.process import Process
+
+
+def watch(simulator) -> dict:
+    # readv() system calls and the tracks served by the drive
+    watched = {'syscalls': 0, 'served': []}
+    log = simulator.log
+    access_sector = simulator.driver.drivers[0].disk.access_sector
+
+    def watched_log(*args):
+        if args and 'invoked readv()' in str(args[0]):
+            watched['syscalls'] += 1
+        log(*args)
+
+    def watched_access_sector(sector_num, *args):
+        watched['served'].append(sector_num // simulator.config.SECTORS_PER_TRACK)
+        return access_sector(sector_num, *args)
+
+    simulator.log = watched_log
+    simulator.driver.drivers[0].disk.access_sector = watched_access_sector
+    return watched
+
+
+def test_one_syscall_for_the_batch(make_config, make_simulator, track_sectors):
+    config = make_config()
+    process = Process('p', [('rv', track_sectors(config, 100, 200, 300))])
+    simulator = make_simulator(config=config, processes=[process])
+    watched = watch(simulator)
+    assert simulator.run() is True
+
+    assert watched['syscalls'] == 1
+    assert len(simulator.driver.drivers[0].io_latencies['READ']) == 3
+    assert process.readv_in_flight == 0
+
+
+def test_strategy_orders_the_batch(make_config, make_simulator, track_sectors):
+    config = make_config()
+    batch = track_sectors(config, 800, 100, 500)
+    simulator = make_simulator(config=config, processes=[Process('p', [('rv', batch)])])
+    watched = watch(simulator)
+    assert simulator.run() is True
+    assert watched['served'] == [100, 500, 800]
+
+
+def test_faster_than_separate_reads(make_config, make_simulator, track_sectors):
+    config = make_config()
+    batch = track_sectors(config, 800, 100, 500)
+    separate = make_simulator(config=config, processes=[Process('p', [('r', s) for s in batch])])
+    separate.run()
+    vectored = make_simulator(config=config, processes=[Process('p', [('rv', batch)])])
+    vectored.run()
+    assert vectored.current_time < separate.current_time
+
+
+def test_batch_larger_than_the_cache(make_config, make_simulator, track_sectors):
+    config = make_config()
+    batch = track_sectors(config, *range(100, 100 + config.BUFFERS_NUM + 2))
+    simulator = make_simulator(config=config, processes=[Process('p', [('rv', batch)])])
+    watched = watch(simulator)
+    assert simulator.run() is True
+
+    # The rest of the batch is submitted with another syscall after the reads
+    assert watched['syscalls'] == 2
+    assert sorted(watched['served']) == list(range(100, 100 + config.BUFFERS_NUM + 2))
@@ -0,0 +1,121 @@
+import pytest
+
+from simulation.recorder import (EVENT_DISPATCH, EVENT_EVICT, EVENT_EXIT, EVENT_RUN, EVENT_SCHEDULE,
+                                 TraceRecorder, first_difference, format_event, read_trace,
+                                 replay_metrics, split_runs)
+
+
+LATENCY_KEYS = ('read_latency_p50', 'read_latency_p99', 'read_latency_max', 'write_latency_p99')
+
+
+def record_run(simulator, path, **options):
+    with TraceRecorder(str(path), **options) as recorder:
+        simulator.attach_recorder(recorder)
+        assert simulator.run() is True
+    return simulator
+
+
+def test_replay_equals_live_stats(make_simulator, tmp_path):
+    path = tmp_path / 'run.trace'
+    simulator = record_run(make_simulator(processes=4), path)
+    stats = simulator.get_stats()
+    metrics = replay_metrics(str(path))
+
+    assert {key: metrics[key] for key in LATENCY_KEYS} == {key: stats[key] for key in LATENCY_KEYS}
+    latencies = simulator.driver.drivers[0].io_latencies
+    assert metrics['reads'] == len(latencies['READ'])
+    assert metrics['writes'] == len(latencies['WRITE'])
+    assert metrics['dispatched'] == stats['total_seeks']
+    assert metrics['processes_exited'] == 4
+
+
+def test_small_blocks_read_back_the_same_events(make_simulator, tmp_path):
+    record_run(make_simulator(), tmp_path / 'one.trace')
+    record_run(make_simulator(), tmp_path / 'many.trace', block_size=7)
+    assert first_difference(str(tmp_path / 'one.trace'), str(tmp_path / 'many.trace')) is None
+
+    events, names = read_trace(str(tmp_path / 'many.trace'))
+    assert events[0][0] == EVENT_RUN
+    assert {names[e[2]] for e in events if e[0] == EVENT_EXIT} == set(names)
+
+
+def test_refuses_a_non_empty_file(make_simulator, tmp_path):
+    path = tmp_path / 'run.trace'
+    record_run(make_simulator(), path)
+    size = path.stat().st_size
+    with pytest.raises(FileExistsError):
+        TraceRecorder(str(path))
+    assert path.stat().st_size == size
+
+
+def test_append_adds_a_run(make_simulator, tmp_path):
+    path = tmp_path / 'runs.trace'
+    first = record_run(make_simulator(processes=2), path)
+    last = record_run(make_simulator(processes=6, seed=1), path, append=True)
+
+    events, _ = read_trace(str(path))
+    assert len(split_runs(events)) == 2
+    assert replay_metrics(str(path), run=0)['processes_exited'] == 2
+    assert replay_metrics(str(path))['processes_exited'] == 6
+    assert replay_metrics(str(path))['read_latency_max'] == last.get_stats()['read_latency_max']
+    assert replay_metrics(str(path), run=0)['read_latency_max'] == first.get_stats()['read_latency_max']
+
+
+def test_fork_does_not_write_to_the_trace(make_simulator, tmp_path):
+    path = tmp_path / 'run.trace'
+    simulator = make_simulator()
+    recorder = TraceRecorder(str(path))
+    simulator.attach_recorder(recorder)
+    simulator.max_iterations = 200
+    simulator.run()
+    recorder.flush()
+    size = path.stat().st_size
+
+    fork = simulator.fork()
+    fork.max_iterations = float('inf')
+    assert fork.run() is True
+    assert path.stat().st_size == size
+    recorder.close()
+
+
+def test_checkpoint_detaches_the_recorder(make_simulator, tmp_path):
+    path = tmp_path / 'run.trace'
+    simulator = make_simulator()
+    recorder = TraceRecorder(str(path))
+    simulator.attach_recorder(recorder)
+    simulator.max_iterations = 200
+    simulator.run()
+    # An event not written yet
+    recorder.record(EVENT_EXIT, simulator.current_time, 0)
+    size = path.stat().st_size
+
+    # Saving has no side effect on the trace, the restored simulator does not record
+    checkpoint = tmp_path / 'sim.ckpt'
+    simulator.save_checkpoint(str(checkpoint))
+    assert path.stat().st_size == size and len(recorder.kinds) == 1
+    restored = type(simulator).load_checkpoint(str(checkpoint))
+    assert restored.recorder is None and restored.syscalls.recorder is None
+    assert all(driver.recorder is None for driver in restored.driver.drivers)
+    recorder.close()
+
+    restored.max_iterations = float('inf')
+    with TraceRecorder(str(path), append=True) as resumed:
+        restored.attach_recorder(resumed)
+        assert restored.run() is True
+    assert len(split_runs(read_trace(str(path))[0])) == 2
+
+
+def test_format_event():
+    names = ['p0']
+    assert format_event((EVENT_RUN, 0, -1, -1, -1), names) == "RUN start"
+    assert format_event((EVENT_EXIT, 3000, 0, -1, -1), names) == "3 us EXIT `p0`"
+    assert format_event((EVENT_EVICT, 2000, 42, 1, -1), names) == "2 us EVICT sector 42 (modified)"
+    assert format_event((EVENT_SCHEDULE, 0, 7, 1, 0), names) == "0 us SCHEDULE sector 7 (WRITE) disk 0"
+    assert 'DISPATCH sector 7 (READ)' in format_event((EVENT_DISPATCH, 0, 7, 0, 0), names)
+
+
+def test_not_a_trace(tmp_path):
+    path = tmp_path / 'bogus.trace'
+    path.write_bytes(b'nothing here')
+    with pytest.raises(ValueError):
+        read_trace(str(path))
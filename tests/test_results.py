@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+
+import cli
+from simulation.results import ResultCache, result_key
+from simulation.simulator import Simulator
+
+
+def test_key_depends_on_every_input(make_config, tmp_path):
+    workload = tmp_path / 'workload.json'
+    workload.write_text('[]')
+    config = make_config()
+    key = result_key(config, 'look', 'lfu', {'seed': 0}, (str(workload),))
+
+    assert key == result_key(make_config(), 'look', 'lfu', {'seed': 0}, (str(workload),))
+    assert key != result_key(config.replace(BUFFERS_NUM=20), 'look', 'lfu', {'seed': 0}, (str(workload),))
+    assert key != result_key(config, 'clook', 'lfu', {'seed': 0}, (str(workload),))
+    assert key != result_key(config, 'look', 'lfu', {'seed': 1}, (str(workload),))
+
+    workload.write_text('[["p", []]]')
+    assert key != result_key(config, 'look', 'lfu', {'seed': 0}, (str(workload),))
+
+
+def test_put_and_get(tmp_path):
+    results = ResultCache(str(tmp_path))
+    assert results.get('a') is None
+    results.put('a', {'total_time': 1.5, 'completed': True})
+    assert results.get('a') == {'total_time': 1.5, 'completed': True}
+    assert (results.hits, results.misses) == (1, 1)
+    assert sorted(os.listdir(tmp_path)) == ['a.json']
+
+
+def test_damaged_entry_is_a_miss(tmp_path):
+    results = ResultCache(str(tmp_path))
+    (tmp_path / 'a.json').write_text('{"total_')
+    assert results.get('a') is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    entry_size = len(json.dumps({'value': 0}))
+    results = ResultCache(str(tmp_path), max_bytes=3 * entry_size)
+    for i, key in enumerate('abc'):
+        results.put(key, {'value': i})
+        os.utime(tmp_path / f'{key}.json', ns=(i * 10**9, i * 10**9))
+
+    # A hit makes `a` the most recently used one, `b` is evicted
+    assert results.get('a') == {'value': 0}
+    results.put('d', {'value': 3})
+    assert sorted(os.listdir(tmp_path)) == ['a.json', 'c.json', 'd.json']
+
+    with pytest.raises(ValueError):
+        ResultCache(str(tmp_path), max_bytes=0)
+
+
+def test_cli_reuses_results(capsys, tmp_path, monkeypatch):
+    argv = ['run', '--format', 'json', '--result-cache', str(tmp_path),
+            '--generate', 'uniform', '--processes', '2', '--operations', '20']
+    assert cli.main(argv) == 0
+    first = capsys.readouterr().out
+    assert len(os.listdir(tmp_path)) == 1
+
+    # The stored result is printed without simulating
+    def no_run(*args):
+        raise AssertionError("simulated again")
+
+    monkeypatch.setattr(Simulator, 'run', no_run)
+    assert cli.main(argv) == 0
+    assert capsys.readouterr().out == first
+    monkeypatch.undo()
+    assert len(os.listdir(tmp_path)) == 1
+
+    assert cli.main(argv + ['--set', 'BUFFERS_NUM=20']) == 0
+    assert len(os.listdir(tmp_path)) == 2
@@ -0,0 +1,119 @@
+import pytest
+
+from models.process import Process
+from scheduler.policies import POLICIES, CFSPolicy, EDFPolicy, MLFQPolicy
+from scheduler.process_scheduler import ProcessScheduler
+
+
+def pop_all(policy) -> list:
+    names = []
+    while len(policy):
+        names.append(policy.pop().name)
+    return names
+
+
+@pytest.mark.parametrize('name', sorted(POLICIES))
+def test_policies_complete_every_process(make_simulator, name):
+    simulator = make_simulator(processes=6, SCHEDULER_POLICY=name, QUANTUM_TIME=5000)
+    scheduler = simulator.process_scheduler
+
+    # A process is only blocked while it is running
+    blocked_without_process = []
+    block_current_process = scheduler.block_current_process
+
+    def watched_block_current_process(*args):
+        if scheduler.current_process is None:
+            blocked_without_process.append(simulator.current_time)
+        block_current_process(*args)
+
+    scheduler.block_current_process = watched_block_current_process
+    assert simulator.run() is True
+
+    assert not blocked_without_process
+    assert len(scheduler.terminated_processes) == 6
+    assert all(process.state == 'TERMINATED' for process in scheduler.terminated_processes)
+
+
+def test_preemption_waits_for_a_safe_point(make_config):
+    scheduler = ProcessScheduler(make_config(QUANTUM_TIME=100))
+    first, second = Process('first', []), Process('second', [])
+    scheduler.add_process(first)
+    scheduler.add_process(second)
+    assert scheduler.schedule_next() is first
+
+    # Quantum is up inside a system call: the process keeps running until the step ends
+    scheduler.consume_time(200_000)
+    assert scheduler.preempt_requested
+    assert scheduler.current_process is first
+
+    scheduler.preempt_if_requested()
+    assert scheduler.current_process is None
+    assert scheduler.ready_queue == [second, first]
+
+
+def test_edf_runs_the_earliest_deadline(make_config):
+    policy = EDFPolicy(make_config())
+    for name, deadline in (('none', None), ('late', 900.0), ('early', 100.0), ('middle', 500.0)):
+        policy.push(Process(name, [], deadline=deadline))
+    assert pop_all(policy) == ['early', 'middle', 'late', 'none']
+
+
+def test_edf_woken_process_goes_first_among_equal_deadlines(make_config):
+    policy = EDFPolicy(make_config())
+    policy.push(Process('ready', [], deadline=100.0))
+    policy.push(Process('woken', [], deadline=100.0), woken=True)
+    assert pop_all(policy) == ['woken', 'ready']
+
+    running = Process('running', [], deadline=500.0)
+    policy.push(Process('urgent', [], deadline=100.0))
+    assert policy.should_preempt(running)
+
+
+def test_mlfq_levels(make_config):
+    config = make_config(MLFQ_LEVELS=3)
+    policy = MLFQPolicy(config)
+    process = Process('p', [])
+    quantum = policy.quantum(process)
+
+    policy.expired(process)
+    assert process.sched_level == 1
+    assert policy.quantum(process) == 2 * quantum
+    policy.expired(process)
+    policy.expired(process)
+    assert process.sched_level == 2
+
+    # Woken after I/O: one level up, ahead of processes on lower levels
+    policy = MLFQPolicy(config)
+    cpu_bound = Process('cpu', [])
+    cpu_bound.sched_level = 2
+    policy.push(cpu_bound)
+    policy.push(process, woken=True)
+    assert process.sched_level == 1
+    policy.push(Process('top', []))
+    assert pop_all(policy) == ['top', 'p', 'cpu']
+
+
+def test_cfs_weights_by_priority(make_config):
+    policy = CFSPolicy(make_config())
+    high, low = Process('high', [], priority=-5), Process('low', [], priority=5)
+    policy.push(high)
+    policy.push(low)
+    assert policy.quantum(high) > policy.quantum(low)
+
+    policy.account(high, 1_000_000)
+    policy.account(low, 1_000_000)
+    assert high.vruntime < low.vruntime
+
+
+def test_cfs_runs_the_smallest_vruntime(make_config):
+    policy = CFSPolicy(make_config())
+    processes = [Process(name, []) for name in ('a', 'b', 'c')]
+    for process, vruntime in zip(processes, (300.0, 100.0, 200.0)):
+        process.vruntime = vruntime
+        policy.push(process)
+    assert pop_all(policy) == ['b', 'c', 'a']
+
+
+def test_unknown_policy_is_rejected(make_config):
+    with pytest.raises(ValueError):
+        make_config(SCHEDULER_POLICY='lottery')
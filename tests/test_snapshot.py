@@ -0,0 +1,59 @@
+import pytest
+
+from simulation import snapshot
+
+
+def test_checkpoint_resumes_to_the_same_result(make_simulator, tmp_path):
+    expected = make_simulator()
+    assert expected.run() is True
+
+    simulator = make_simulator()
+    assert simulator.run(until_time=expected.current_time // 2) is False
+    path = tmp_path / 'sim.snapshot'
+    simulator.save_checkpoint(str(path))
+
+    restored = type(simulator).load_checkpoint(str(path))
+    assert restored.current_time == simulator.current_time
+    assert restored.run() is True
+    assert restored.get_stats() == expected.get_stats()
+
+
+def test_paused_run_resumes_in_place(make_simulator):
+    expected = make_simulator()
+    expected.run()
+
+    simulator = make_simulator()
+    step = expected.current_time // 5
+    while not simulator.run(until_time=simulator.current_time + step):
+        pass
+    assert simulator.get_stats() == expected.get_stats()
+
+
+def test_run_returns_false_at_iteration_limit(make_simulator):
+    simulator = make_simulator()
+    simulator.max_iterations = 50
+    assert simulator.run() is False
+    assert simulator.get_stats()['completed'] is False
+
+    # The limit counts over all run() calls, a larger one lets the run finish
+    simulator.max_iterations = float('inf')
+    assert simulator.run() is True
+    assert simulator.get_stats()['completed'] is True
+
+
+def test_fork_is_independent(make_simulator):
+    simulator = make_simulator()
+    simulator.run(until_time=100_000_000)
+    paused_at = simulator.current_time
+
+    copy = simulator.fork()
+    assert copy.run() is True
+    assert simulator.current_time == paused_at
+
+    assert simulator.run() is True
+    assert simulator.get_stats() == copy.get_stats()
+
+
+def test_loads_rejects_other_data():
+    with pytest.raises(ValueError):
+        snapshot.loads(b'not a snapshot')
@@ -0,0 +1,67 @@
+import pytest
+
+from kernel.syscalls import (CLAIMED, DEFERRED, HIT, IN_IO_READ, IN_IO_WRITE, NO_BUFFER,
+                             SCHEDULED)
+from models.process import Process
+
+
+@pytest.fixture
+def kernel(make_simulator):
+    # System calls of a simulator without processes
+    def make(**parameters):
+        return make_simulator(processes=0, **parameters).syscalls
+    return make
+
+
+PROCESS = Process('p', [])
+
+
+def test_hit(kernel):
+    syscalls = kernel()
+    syscalls.cache.access_buffer(100, 0)
+    assert syscalls.request_buffer(PROCESS, 'r', 100, 0) == HIT
+
+    assert syscalls.request_buffer(PROCESS, 'w', 100, 0) == HIT
+    assert syscalls.cache.find_buffer(100).modified
+    assert not syscalls.driver.has_pending_requests()
+
+
+def test_read_miss_is_scheduled_once(kernel):
+    syscalls = kernel()
+    assert syscalls.request_buffer(PROCESS, 'r', 100, 0) == SCHEDULED
+    assert syscalls.driver.has_pending_requests()
+    # The sector is being read: the next request waits for the same read
+    for op_type in ('r', 'ar', 'rv', 'w'):
+        assert syscalls.request_buffer(PROCESS, op_type, 100, 0) == IN_IO_READ
+
+
+def test_no_buffer_and_deferred(kernel):
+    syscalls = kernel()
+    for sector_num in range(syscalls.config.BUFFERS_NUM):
+        assert syscalls.request_buffer(PROCESS, 'r', sector_num, 0) == SCHEDULED
+
+    # Every buffer is being read
+    assert syscalls.request_buffer(PROCESS, 'rv', 500, 0, batch_started=True) == DEFERRED
+    assert not syscalls.buffer_shortage
+    assert syscalls.request_buffer(PROCESS, 'r', 500, 0) == NO_BUFFER
+    assert syscalls.buffer_shortage
+
+
+def test_modified_victim_is_written_back(kernel):
+    syscalls = kernel(WRITE_FULL_SECTOR=True)
+    written = list(range(syscalls.config.BUFFERS_NUM))
+    for sector_num in written:
+        assert syscalls.request_buffer(PROCESS, 'w', sector_num, 0) == CLAIMED
+
+    # The victim is modified: it is written back, the request waits for a buffer
+    assert syscalls.request_buffer(PROCESS, 'r', 500, 0) == NO_BUFFER
+    evicted = [s for s in written if syscalls.cache.find_buffer(s) is None]
+    assert len(evicted) == 1
+    assert syscalls.request_buffer(PROCESS, 'r', evicted[0], 0) == IN_IO_WRITE
+
+
+def test_blocking_calls(kernel):
+    syscalls = kernel()
+    syscalls.cache.access_buffer(100, 0)
+    assert syscalls.sys_read(PROCESS, 100, 0) == (True, syscalls.syscall_read_time, False)
+    assert syscalls.sys_write(PROCESS, 200, 0) == (False, syscalls.syscall_write_time, True)
@@ -0,0 +1,40 @@
+from kernel.syscalls import CLAIMED, SCHEDULED
+from models.process import Process
+
+
+def test_write_miss_claims_the_buffer(make_simulator):
+    simulator = make_simulator(processes=0, WRITE_FULL_SECTOR=True)
+    process = Process('p', [('w', 100)])
+    assert simulator.syscalls.request_buffer(process, 'w', 100, 0) == CLAIMED
+
+    buffer = simulator.cache.find_buffer(100)
+    assert buffer is not None and buffer.modified
+    assert not simulator.driver.has_pending_requests()
+
+
+def test_write_miss_reads_by_default(make_simulator):
+    simulator = make_simulator(processes=0)
+    process = Process('p', [('w', 100)])
+    assert simulator.syscalls.request_buffer(process, 'w', 100, 0) == SCHEDULED
+    assert simulator.driver.has_pending_requests()
+
+
+def test_write_only_workload_reads_nothing(make_simulator):
+    simulator = make_simulator(processes=4, read_ratio=0.0, WRITE_FULL_SECTOR=True)
+    assert simulator.run() is True
+
+    latencies = simulator.driver.drivers[0].io_latencies
+    assert not latencies['READ']
+    assert latencies['WRITE']
+
+    plain = make_simulator(processes=4, read_ratio=0.0)
+    plain.run()
+    assert plain.driver.drivers[0].io_latencies['READ']
+    assert simulator.current_time < plain.current_time
+
+
+def test_small_cache_with_writes_in_flight(make_simulator):
+    # Every evictable buffer may be written back: processes wait instead of crashing
+    simulator = make_simulator(processes=8, read_ratio=0.2, BUFFERS_NUM=6, WRITE_FULL_SECTOR=True)
+    assert simulator.run() is True
+    assert not simulator.driver.has_active_io()
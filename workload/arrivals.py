@@ -0,0 +1,156 @@
+import heapq
+import random
+from typing import List, Optional, Sequence
+
+from models.process import Process
+
+
+# Open-loop request sources
+# A source produces requests (arrival_time_us, op_type, sector) on its own schedule,
+# independent of how fast the system serves them. The simulator injects every request
+# at its arrival time as a one-operation process, so requests of one source can be in
+# flight at the same time and the response time is measured from the arrival
+#
+# Arrival processes return the next arrival time after `now` (us) or None when exhausted
+
+SAMPLE_BATCH = 1024
+
+
+class PoissonArrivals:
+    # Exponential inter-arrival times, rate in requests per second
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("Arrival rate must be positive")
+        self.rate = rate
+
+    def next_time(self, rng: random.Random, now: float) -> Optional[float]:
+        return now + rng.expovariate(self.rate) * 1_000_000
+
+
+class BurstyArrivals:
+    # On-off (two-state Markov modulated) Poisson process
+    # Bursts with burst_rate alternate with quiet periods with rate, durations are
+    # exponential with means burst_time and idle_time (us)
+    def __init__(self, rate: float, burst_rate: float, burst_time: float = 100_000,
+                 idle_time: float = 900_000):
+        if rate < 0 or burst_rate <= 0:
+            raise ValueError("Arrival rates must be positive")
+        self.rates = (rate, burst_rate)
+        self.mean_times = (idle_time, burst_time)
+
+        self.bursting = False
+        self.state_end = None
+
+    def next_time(self, rng: random.Random, now: float) -> Optional[float]:
+        if self.state_end is None:
+            self.state_end = now + rng.expovariate(1 / self.mean_times[0])
+
+        while True:
+            rate = self.rates[self.bursting]
+            if rate > 0:
+                arrival = now + rng.expovariate(rate) * 1_000_000
+                if arrival < self.state_end:
+                    return arrival
+
+            # No arrival in this state: the process is memoryless, continue from the state end
+            now = self.state_end
+            self.bursting = not self.bursting
+            self.state_end = now + rng.expovariate(1 / self.mean_times[self.bursting])
+
+    @property
+    def mean_rate(self) -> float:
+        idle_time, burst_time = self.mean_times
+        return (self.rates[0] * idle_time + self.rates[1] * burst_time) / (idle_time + burst_time)
+
+
+class FixedArrivals:
+    # Given arrival times (us)
+    def __init__(self, times: Sequence[float]):
+        self.times = times
+        self.index = 0
+
+    def next_time(self, rng: random.Random, now: float) -> Optional[float]:
+        if self.index >= len(self.times):
+            return None
+        self.index += 1
+        return self.times[self.index - 1]
+
+
+class RequestSource:
+    # Requests at arrival times, sectors from a workload pattern (workload.generators)
+    def __init__(self, name: str, arrivals, pattern, read_ratio: float = 0.5,
+                 count: Optional[int] = None, seed: int = 0):
+        self.name = name
+        self.arrivals = arrivals
+        self.pattern = pattern
+        self.read_ratio = read_ratio
+        self.count = count
+
+        self.rng = random.Random(seed)
+        self.time = 0.0
+        self.produced = 0
+        self.sectors: List[int] = []
+
+    def next_request(self) -> Optional[tuple]:
+        # (arrival_time, op_type, sector) or None when the source is exhausted
+        if self.count is not None and self.produced >= self.count:
+            return None
+
+        time = self.arrivals.next_time(self.rng, self.time)
+        if time is None:
+            return None
+        self.time = time
+
+        if not self.sectors:
+            self.sectors = self.pattern.sample(self.rng, SAMPLE_BATCH)
+            self.sectors.reverse()
+
+        self.produced += 1
+        op_type = 'r' if self.rng.random() < self.read_ratio else 'w'
+        return time, op_type, self.sectors.pop()
+
+
+class TraceSource:
+    # Requests of imported trace processes (workload.importers) at their recorded times
+    def __init__(self, name: str, processes: List[Process]):
+        self.name = name
+        self.streams = [p.operations for p in processes]
+
+        # (arrival_time, stream index, operation index)
+        self.heap = [(ops.arrival_time(0), i, 0) for i, ops in enumerate(self.streams) if len(ops)]
+        heapq.heapify(self.heap)
+
+    def next_request(self) -> Optional[tuple]:
+        if not self.heap:
+            return None
+
+        time, stream, index = self.heap[0]
+        operations = self.streams[stream]
+        if index + 1 < len(operations):
+            heapq.heapreplace(self.heap, (operations.arrival_time(index + 1), stream, index + 1))
+        else:
+            heapq.heappop(self.heap)
+
+        op_type, sector = operations[index]
+        return time, op_type, sector
+
+
+BURST_TIME = 100_000  # us
+
+
+def make_arrivals(name: str, rate: float, burst_factor: float = 10.0):
+    # Arrival process by name: poisson or bursty (bursts of burst_factor * rate,
+    # quiet periods keep the mean rate)
+    # Bursts take 10% of the time, less for burst_factor > 5, so quiet periods
+    # always carry at least half of the mean rate and the offered load is rate
+    if name == 'poisson':
+        return PoissonArrivals(rate)
+    if name == 'bursty':
+        if burst_factor <= 0:
+            raise ValueError("Burst factor must be positive")
+        burst_share = min(0.1, 0.5 / burst_factor)
+        burst_rate = rate * burst_factor
+        idle_rate = (rate - burst_rate * burst_share) / (1 - burst_share)
+        return BurstyArrivals(idle_rate, burst_rate, burst_time=BURST_TIME,
+                              idle_time=BURST_TIME * (1 - burst_share) / burst_share)
+    raise ValueError(f"Unknown arrival process `{name}`")
@@ -0,0 +1,67 @@
+import json
+from typing import List
+
+from models.buffer import IO_PRIORITY_CLASSES
+from models.process import Process
+
+
+# Workload files (JSON)
+#
+# Explicit processes:
+#   {"processes": [{"name": "yyy", "operations": [["r", 100], ["w", 1000]]}]}
+#   optional "priority" (nice value) and "deadline" (us) per process for the scheduling policies,
+#   "io_priority" ("rt", "be", "idle") for the deadline strategy
+#
+# Generated processes (see workload.generators):
+#   {"generator": {"pattern": "zipf", "params": {"exponent": 1.1},
+#                  "processes": 8, "operations": 100000, "read_ratio": 0.7, "seed": 1}}
+#
+# Imported block device trace (see workload.importers):
+#   {"trace": {"path": "trace.blk.gz", "format": "blkparse", "max_requests": 1000000}}
+
+
+def load_workload(path: str, config) -> List[Process]:
+    # Reads workload file and creates processes
+    with open(path) as f:
+        spec = json.load(f)
+    return build_workload(spec, config)
+
+
+def build_workload(spec: dict, config) -> List[Process]:
+    # Creates processes from workload description
+    processes = []
+
+    for i, process_spec in enumerate(spec.get('processes', [])):
+        name = process_spec.get('name', f'p{i}')
+        operations = [(op_type, int(sector)) for op_type, sector in process_spec['operations']]
+        processes.append(Process(name, operations,
+                                 priority=process_spec.get('priority', 0),
+                                 deadline=process_spec.get('deadline'),
+                                 io_priority=IO_PRIORITY_CLASSES[process_spec.get('io_priority', 'be')]))
+
+    if 'generator' in spec:
+        processes.extend(generate_workload(spec['generator'], config))
+
+    if 'trace' in spec:
+        from workload.importers import import_trace
+
+        options = dict(spec['trace'])
+        processes.extend(import_trace(options.pop('path'), config, options.pop('format'), **options))
+
+    if not processes:
+        raise ValueError("Workload has no processes")
+
+    return processes
+
+
+def generate_workload(generator_spec: dict, config) -> List[Process]:
+    # Creates generated processes from generator description
+    from workload.generators import make_pattern, generate_processes
+
+    pattern = make_pattern(config, generator_spec.get('pattern', 'uniform'),
+                           **generator_spec.get('params', {}))
+    return generate_processes(config, pattern,
+                              generator_spec.get('processes', 1),
+                              generator_spec.get('operations', 1000),
+                              read_ratio=generator_spec.get('read_ratio', 0.5),
+                              seed=generator_spec.get('seed', 0))
@@ -0,0 +1,199 @@
+import hashlib
+import math
+import random
+from collections.abc import Sequence
+from typing import List
+
+from models.process import Process
+
+
+# Synthetic workload generators
+# Operations are produced lazily in chunks, each chunk is generated in one batch
+# from its own seeded RNG, so any index is reproducible without generating the prefix
+
+CHUNK_SIZE = 65536
+
+
+def derive_seed(*parts: int) -> int:
+    # Independent seed for a (seed, index, ...) tuple, stable between runs and platforms
+    digest = hashlib.sha256(repr(parts).encode()).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+
+def _total_sectors(config) -> int:
+    return config.TRACKS_NUM * config.SECTORS_PER_TRACK
+
+
+class UniformPattern:
+    # Every sector has the same probability
+    def __init__(self, config):
+        self.total_sectors = _total_sectors(config)
+
+    def sample(self, rng: random.Random, count: int) -> List[int]:
+        total = self.total_sectors
+        rand = rng.random
+        return [int(rand() * total) for _ in range(count)]
+
+
+class ZipfPattern:
+    # Zipfian sector popularity: rank k is chosen with probability ~ 1 / k^exponent
+    # Ranks are scattered over the disk with a multiplicative permutation
+    def __init__(self, config, exponent: float = 1.0):
+        if exponent <= 0:
+            raise ValueError("Zipf exponent must be positive")
+
+        self.total_sectors = _total_sectors(config)
+        self.exponent = exponent
+
+        # Stride coprime with the number of sectors gives a bijection rank -> sector
+        stride = 2654435761 % self.total_sectors
+        while math.gcd(stride, self.total_sectors) != 1:
+            stride += 1
+        self.stride = stride
+
+    def sample(self, rng: random.Random, count: int) -> List[int]:
+        # Inverse CDF of the bounded continuous power law on [1, total + 1)
+        total = self.total_sectors
+        stride = self.stride
+        rand = rng.random
+        upper = total + 1
+
+        if self.exponent == 1.0:
+            ranks = [int(upper ** rand()) - 1 for _ in range(count)]
+        else:
+            power = 1 - self.exponent
+            scale = upper ** power - 1
+            inverse = 1 / power
+            ranks = [int((scale * rand() + 1) ** inverse) - 1 for _ in range(count)]
+
+        return [(min(rank, total - 1) * stride) % total for rank in ranks]
+
+
+class SequentialPattern:
+    # Sequential runs of run_length sectors starting at random positions
+    def __init__(self, config, run_length: int = 64):
+        if run_length < 1:
+            raise ValueError("Run length must be at least 1")
+
+        self.total_sectors = _total_sectors(config)
+        self.run_length = run_length
+
+    def sample(self, rng: random.Random, count: int) -> List[int]:
+        total = self.total_sectors
+        run_length = self.run_length
+        runs = -(-count // run_length)
+        starts = [rng.randrange(total) for _ in range(runs)]
+        sectors = [(start + offset) % total for start in starts for offset in range(run_length)]
+        return sectors[:count]
+
+
+class HotspotPattern:
+    # hot_fraction of requests go to hot_tracks consecutive tracks, others are uniform
+    def __init__(self, config, hot_tracks: int = 10, hot_fraction: float = 0.9, hot_start_track: int = None):
+        if not 0 <= hot_fraction <= 1:
+            raise ValueError("Hot fraction must be between 0 and 1")
+
+        self.total_sectors = _total_sectors(config)
+        self.hot_tracks = min(hot_tracks, config.TRACKS_NUM)
+        self.hot_fraction = hot_fraction
+
+        if hot_start_track is None:
+            hot_start_track = (config.TRACKS_NUM - self.hot_tracks) // 2
+        self.hot_first_sector = hot_start_track * config.SECTORS_PER_TRACK
+        self.hot_sectors = self.hot_tracks * config.SECTORS_PER_TRACK
+
+    def sample(self, rng: random.Random, count: int) -> List[int]:
+        total = self.total_sectors
+        hot_first = self.hot_first_sector
+        hot_sectors = self.hot_sectors
+        hot_fraction = self.hot_fraction
+        rand = rng.random
+        return [
+            (hot_first + int(rand() * hot_sectors)) % total if rand() < hot_fraction
+            else int(rand() * total)
+            for _ in range(count)
+        ]
+
+
+class GeneratedOperations(Sequence):
+    # Lazy list of ('r'|'w', sector) operations, used as Process.operations
+    def __init__(self, pattern, length: int, read_ratio: float = 0.5, seed: int = 0,
+                 chunk_size: int = CHUNK_SIZE):
+        if not 0 <= read_ratio <= 1:
+            raise ValueError("Read ratio must be between 0 and 1")
+
+        self.pattern = pattern
+        self.length = length
+        self.read_ratio = read_ratio
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+        # Last generated chunk (processes read operations sequentially)
+        self._chunk_index = None
+        self._chunk = None
+
+    def _generate_chunk(self, chunk_index: int) -> list:
+        start = chunk_index * self.chunk_size
+        count = min(self.chunk_size, self.length - start)
+
+        rng = random.Random(derive_seed(self.seed, chunk_index))
+        sectors = self.pattern.sample(rng, count)
+
+        read_ratio = self.read_ratio
+        rand = rng.random
+        return [('r' if rand() < read_ratio else 'w', sector) for sector in sectors]
+
+    def _get_chunk(self, chunk_index: int) -> list:
+        if chunk_index != self._chunk_index:
+            self._chunk = self._generate_chunk(chunk_index)
+            self._chunk_index = chunk_index
+        return self._chunk
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("operation index out of range")
+
+        chunk_index, offset = divmod(index, self.chunk_size)
+        return self._get_chunk(chunk_index)[offset]
+
+    def __iter__(self):
+        for chunk_index in range(-(-self.length // self.chunk_size)):
+            yield from self._generate_chunk(chunk_index)
+
+    def __getstate__(self):
+        # Snapshots keep only the parameters, chunks are regenerated
+        state = self.__dict__.copy()
+        state['_chunk_index'] = None
+        state['_chunk'] = None
+        return state
+
+
+def make_pattern(config, name: str, **params):
+    # Creates sector pattern by name: uniform, zipf, sequential, hotspot
+    patterns = {
+        'uniform': UniformPattern,
+        'zipf': ZipfPattern,
+        'sequential': SequentialPattern,
+        'hotspot': HotspotPattern,
+    }
+    if name not in patterns:
+        raise ValueError(f"Unknown workload pattern `{name}`")
+    return patterns[name](config, **params)
+
+
+def generate_processes(config, pattern, processes_num: int, operations_num: int,
+                       read_ratio: float = 0.5, seed: int = 0, name_prefix: str = 'p') -> List[Process]:
+    # Processes with independent, reproducible operation streams
+    return [
+        Process(f'{name_prefix}{i}',
+                GeneratedOperations(pattern, operations_num, read_ratio, derive_seed(seed, i)))
+        for i in range(processes_num)
+    ]
@@ -0,0 +1,208 @@
+import gzip
+from array import array
+from collections.abc import Sequence
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from models.process import Process
+
+
+# Importers of real block device traces
+#
+#   blkparse text output:
+#     8,0    3        1     0.000000000   697  Q   W 223490 + 8 [kjournald]
+#     (device, cpu, sequence, seconds, pid, action, RWBS, 512-byte sector + count, [command])
+#   MSR Cambridge / SNIA CSV:
+#     Timestamp,Hostname,DiskNumber,Type,Offset,Size,ResponseTime
+#     (timestamp in 100 ns Windows ticks, offset and size in bytes)
+#
+# Requests are grouped into one process per PID (per host and disk for MSR),
+# byte offsets are mapped to simulator sectors of config.SECTOR_SIZE bytes and folded into
+# TRACKS_NUM * SECTORS_PER_TRACK, a request becomes one operation per sector (at most
+# max_sectors, None - all). Arrival times (us from the first request) are kept, they are
+# computed from integer trace ticks relative to the first request, so large absolute
+# timestamps lose no precision
+# The file is read line by line in chunks, operations are stored in packed arrays
+
+BLKPARSE_SECTOR_SIZE = 512
+
+# Trace ticks per us: blkparse times are parsed to ns, MSR times are 100 ns ticks
+BLKPARSE_TICKS_PER_US = 1000
+MSR_TICKS_PER_US = 10
+
+
+class PackedOperations(Sequence):
+    # Operations of one imported process: ('r' | 'w', sector) with arrival times
+    # Stored in arrays, about 13 bytes per operation
+    def __init__(self):
+        self.is_write = array('B')
+        self.sectors = array('I')
+        self.times = array('d')  # us
+
+    def append(self, op_type: str, sector_num: int, time_us: float):
+        self.is_write.append(op_type == 'w')
+        self.sectors.append(sector_num)
+        self.times.append(time_us)
+
+    def arrival_time(self, index: int) -> float:
+        return self.times[index]
+
+    def __len__(self) -> int:
+        return len(self.sectors)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return ('w' if self.is_write[index] else 'r', self.sectors[index])
+
+
+class _Streams:
+    # Per-stream operations being imported
+    def __init__(self, config, max_sectors: Optional[int], ticks_per_us: int):
+        if max_sectors is not None and max_sectors < 1:
+            raise ValueError("max_sectors must be at least 1 (None - whole requests)")
+        self.sector_size = config.SECTOR_SIZE
+        self.total_sectors = config.TRACKS_NUM * config.SECTORS_PER_TRACK
+        self.max_sectors = max_sectors
+        self.ticks_per_us = ticks_per_us
+        self.operations = {}  # stream name -> PackedOperations
+        self.start_ticks = None
+        self.requests = 0
+
+    def add(self, name: str, op_type: str, offset: int, size: int, ticks: int):
+        # Adds request of size bytes at byte offset, one operation per sector
+        # ticks: integer arrival time of the trace
+        if self.start_ticks is None:
+            self.start_ticks = ticks
+        time_us = (ticks - self.start_ticks) / self.ticks_per_us
+
+        operations = self.operations.get(name)
+        if operations is None:
+            operations = self.operations[name] = PackedOperations()
+
+        first = offset // self.sector_size
+        count = max(1, -(-size // self.sector_size))
+        if self.max_sectors is not None:
+            count = min(count, self.max_sectors)
+        for sector in range(first, first + count):
+            operations.append(op_type, sector % self.total_sectors, time_us)
+
+        self.requests += 1
+
+    def processes(self) -> List[Process]:
+        # Processes ordered by their first arrival
+        streams = sorted(self.operations.items(), key=lambda item: item[1].arrival_time(0))
+        return [Process(name, operations) for name, operations in streams]
+
+
+def _open_lines(source) -> Iterator[str]:
+    # Path (plain or .gz) or iterable of lines
+    if not isinstance(source, str):
+        yield from source
+        return
+
+    opener = gzip.open if source.endswith('.gz') else open
+    with opener(source, 'rt', errors='replace') as f:
+        yield from f
+
+
+def _chunks(lines: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _parse_seconds(text: str) -> int:
+    # Decimal seconds to integer ns without going through float
+    seconds, _, fraction = text.partition('.')
+    if fraction and not fraction.isdigit():
+        raise ValueError(f"Invalid time `{text}`")
+    return int(seconds) * 1_000_000_000 + int(fraction[:9].ljust(9, '0'))
+
+
+def _parse_blkparse_line(line: str) -> Optional[Tuple[str, str, str, int, int, int]]:
+    # Returns (action, stream, op_type, byte offset, byte size, time_ns) or None
+    parts = line.split()
+    if len(parts) < 10 or ',' not in parts[0] or parts[8] != '+':
+        return None
+
+    rwbs = parts[6]
+    if 'R' in rwbs:
+        op_type = 'r'
+    elif 'W' in rwbs:
+        op_type = 'w'
+    else:
+        return None  # Discard, flush, barrier without data
+
+    try:
+        time_ns = _parse_seconds(parts[3])
+        sector = int(parts[7])
+        count = int(parts[9])
+    except ValueError:
+        return None
+
+    pid = parts[4]
+    command = parts[10].strip('[]') if len(parts) > 10 else ''
+    stream = f"{command}-{pid}" if command else pid
+
+    return (parts[5], stream, op_type,
+            sector * BLKPARSE_SECTOR_SIZE, count * BLKPARSE_SECTOR_SIZE, time_ns)
+
+
+def import_blkparse(source, config, actions: str = 'Q', max_sectors: Optional[int] = None,
+                    max_requests: Optional[int] = None, chunk_size: int = 65536) -> List[Process]:
+    # Imports blkparse text output, only events with the given actions (Q - queued by default)
+    streams = _Streams(config, max_sectors, BLKPARSE_TICKS_PER_US)
+
+    for chunk in _chunks(_open_lines(source), chunk_size):
+        for line in chunk:
+            parsed = _parse_blkparse_line(line)
+            if parsed is None or parsed[0] not in actions:
+                continue
+
+            streams.add(*parsed[1:])
+            if max_requests is not None and streams.requests >= max_requests:
+                return streams.processes()
+
+    return streams.processes()
+
+
+def import_msr(source, config, max_sectors: Optional[int] = None,
+               max_requests: Optional[int] = None, chunk_size: int = 65536) -> List[Process]:
+    # Imports MSR Cambridge / SNIA CSV trace
+    streams = _Streams(config, max_sectors, MSR_TICKS_PER_US)
+
+    for chunk in _chunks(_open_lines(source), chunk_size):
+        for line in chunk:
+            fields = line.strip().split(',')
+            if len(fields) < 6:
+                continue
+            try:
+                ticks = int(fields[0])
+                offset = int(fields[4])
+                size = int(fields[5])
+            except ValueError:
+                continue  # Header
+
+            op_type = 'r' if fields[3].lower().startswith('r') else 'w'
+            streams.add(f"{fields[1]}-{fields[2]}", op_type, offset, size, ticks)
+            if max_requests is not None and streams.requests >= max_requests:
+                return streams.processes()
+
+    return streams.processes()
+
+
+IMPORTERS = {
+    'blkparse': import_blkparse,
+    'msr': import_msr,
+}
+
+
+def import_trace(path: str, config, trace_format: str, **options) -> List[Process]:
+    # Imports trace file of the given format
+    if trace_format not in IMPORTERS:
+        raise ValueError(f"Unknown trace format `{trace_format}`")
+    return IMPORTERS[trace_format](path, config, **options)